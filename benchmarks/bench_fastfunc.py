@@ -0,0 +1,66 @@
+import ctypes
+
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from conftest import ET0, ET1, TARGET
+from spicetools import cshim
+from spicetools.fastfunc import spkcvo, spkcvo_batch, spkgps, spkgps_batch
+
+ETS = np.linspace(ET0, ET1, 350)
+ETS_C = [ctypes.c_double(et) for et in ETS]
+
+
+@pytest.mark.parametrize("obs", [10, 399])
+def bench_spkgps_per_call(benchmark, kernels, obs):
+    fast_spkgps = spkgps(ref="ECLIPJ2000", obs=obs)
+    _targ = ctypes.c_int(TARGET)
+
+    def run():
+        return [fast_spkgps(_targ, _et) for _et in ETS_C]
+
+    res = benchmark(run)
+    assert np.all(np.isfinite(res))
+
+
+@pytest.mark.parametrize("n_targ", [1, 100])
+def bench_spkgps_batch(benchmark, kernels, track_memory, n_targ):
+    targs = np.full(n_targ, TARGET)
+    res = benchmark(spkgps_batch, targs, ETS, "ECLIPJ2000", 399)
+    track_memory(spkgps_batch, targs, ETS, "ECLIPJ2000", 399)
+    assert np.all(np.isfinite(res))
+
+
+@pytest.mark.parametrize("abcorr", ["NONE", "LT+S"])
+def bench_spkcvo_per_call(benchmark, kernels, abcorr):
+    fast_spkcvo = spkcvo("ECLIPJ2000", "OBSERVER", abcorr, "399", "J2000")
+    _targ = sp.stypes.string_to_char_p(str(TARGET))
+    _obssta = sp.stypes.to_double_vector(np.zeros(6))
+
+    def run():
+        return [fast_spkcvo(_targ, _obssta, _et) for _et in ETS_C]
+
+    res = benchmark(run)
+    assert np.all(np.isfinite(res))
+
+
+@pytest.mark.parametrize("abcorr", ["NONE", "LT+S"])
+def bench_spkcvo_batch(benchmark, kernels, track_memory, abcorr):
+    targs = np.full(100, TARGET)
+    args = (targs, ETS, np.zeros(6), "ECLIPJ2000", "OBSERVER", abcorr, "399", "J2000")
+    res = benchmark(spkcvo_batch, *args)
+    track_memory(spkcvo_batch, *args)
+    assert np.all(np.isfinite(res))
+
+
+@pytest.mark.skipif(not cshim.shim_available(), reason="C shim unavailable (no C compiler?)")
+@pytest.mark.parametrize("func", ["spkgps", "spkcvo"])
+def bench_cshim_batch(benchmark, kernels, func):
+    targs = np.full(100, TARGET)
+    if func == "spkgps":
+        res = benchmark(cshim.spkgps_batch, targs, ETS, "ECLIPJ2000", 399)
+    else:
+        res = benchmark(cshim.spkcvo_batch, targs, ETS, np.zeros(6), "ECLIPJ2000", "OBSERVER",
+                        "LT+S", "399", "J2000")
+    assert np.all(np.isfinite(res))
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+
+@pytest.mark.parametrize("stmt", ["import spicetools", "import spicetools.fastfunc"])
+def bench_import_time(benchmark, stmt):
+    """Wall time of a fresh interpreter importing the package (incl. numpy
+    and spiceypy); regressions here multiply by the number of workers."""
+    benchmark.pedantic(subprocess.run, args=([sys.executable, "-c", stmt],),
+                       kwargs=dict(check=True), rounds=5, iterations=1)
+
+
+def _best_of(stmt, n=3):
+    times = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", stmt], check=True)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def bench_import_time_regression():
+    """`import spicetools` must be much cheaper than importing the heavy
+    dependencies it used to pull in eagerly (wall-clock, so not in the unit
+    tests)."""
+    t_base = _best_of("import numpy, spiceypy")
+    t_pkg = _best_of("import numpy, spiceypy, spicetools")
+    t_heavy = _best_of("import numpy, spiceypy, astropy.time, pandas")
+    assert (t_pkg - t_base) < 0.5*(t_heavy - t_base)
@@ -0,0 +1,12 @@
+import numpy as np
+import pytest
+
+from spicetools.phase import iau_hg_model
+
+
+@pytest.mark.parametrize("n", [1_000, 1_000_000])
+def bench_iau_hg_model(benchmark, track_memory, n):
+    alpha = np.linspace(0, 150, n)
+    res = benchmark(iau_hg_model, alpha, 0.15)
+    track_memory(iau_hg_model, alpha, 0.15)
+    assert res.shape == (n,)
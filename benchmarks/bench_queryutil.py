@@ -0,0 +1,34 @@
+import base64
+
+import numpy as np
+
+from spicetools.kernelutil import DEFAULT_KERNELS
+from spicetools.queryutil import decode_spk, sbdb_json2df
+
+BSP = DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp"
+
+
+def _fake_sbdb_json(n=100_000):
+    """SBDB Query API-like JSON (all values are str or None as in the API)."""
+    rng = np.random.default_rng(0)
+    fields = ["spkid", "pdes", "H", "G", "e", "q", "i", "om", "w", "tp", "class", "condition_code"]
+    data = [
+        [str(20000001 + k), str(k + 1), f"{h:.2f}", None, f"{e:.6f}", "2.5", "10.1", "80.3", "73.6",
+         "2460000.5", "MBA", str(k % 10)]
+        for k, h, e in zip(range(n), rng.uniform(3, 22, n), rng.uniform(0, 0.3, n))
+    ]
+    return {"signature": {"version": "1.0"}, "fields": fields, "data": data}
+
+
+def bench_sbdb_json2df(benchmark, track_memory):
+    data = _fake_sbdb_json()
+    df = benchmark(sbdb_json2df, data)
+    track_memory(sbdb_json2df, data)
+    assert len(df) == 100_000
+
+
+def bench_decode_spk(benchmark):
+    # Horizons text-format response: header + base64-encoded SPK
+    text = "API VERSION: 1.2\nAPI SOURCE: NASA/JPL Horizons API\n\n" + base64.b64encode(BSP.read_bytes()).decode()
+    res = benchmark(decode_spk, text)
+    assert res.startswith(b"DAF/SPK")
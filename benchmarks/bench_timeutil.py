@@ -0,0 +1,13 @@
+import numpy as np
+import pytest
+from astropy import units as u
+from astropy.time import Time
+
+from spicetools.timeutil import times2et
+
+
+@pytest.mark.parametrize("return_c", [False, True])
+def bench_times2et(benchmark, kernels, return_c):
+    times = Time("2000-02-01") + np.arange(350)*u.day
+    res = benchmark(times2et, times, return_c=return_c)
+    assert len(res[1]) == 350
@@ -0,0 +1,77 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+import spiceypy as sp
+from numpy.polynomial import chebyshev
+
+from spicetools.constants import AU2KM
+from spicetools.kernelutil import make_meta
+
+# Coverage of the bundled kernels/tests/spk3200_*.bsp (20003200 w.r.t. the Sun)
+ET0, ET1 = -2.7e6, 3.15e7
+TARGET = 20003200
+
+
+def _circular(et, radius, period, phase=0.0):
+    omega = 2*np.pi/period
+    arg = omega*et + phase
+    return np.stack([radius*np.cos(arg), radius*np.sin(arg), 0.0*arg], axis=-1)
+
+
+def write_de_like_kernel(path, et0=ET0 - 86400*16, et1=ET1 + 86400*16, intlen=86400*8.0, polydg=11):
+    """Write a type 2 (Chebyshev, as in JPL DE) SPK with the DE-like chain of
+    Sun (10) -> SSB (0), EMB (3) -> SSB (0), Earth (399) -> EMB (3), on
+    analytic circular orbits.
+    """
+    bodies = [
+        (10, 0, dict(radius=7.e5, period=11.86*365.25*86400)),
+        (3, 0, dict(radius=AU2KM, period=365.25*86400)),
+        (399, 3, dict(radius=4671.0, period=27.32*86400)),
+    ]
+    n = int(np.ceil((et1 - et0)/intlen))
+    handle = sp.spkopn(str(path), "DE-LIKE", 0)
+    for body, center, orbit in bodies:
+        cdata = []
+        for i in range(n):
+            mid = et0 + (i + 0.5)*intlen
+            x = np.cos(np.pi*(np.arange(2*polydg) + 0.5)/(2*polydg))  # Chebyshev nodes
+            pos = _circular(mid + x*intlen/2, **orbit)
+            for k in range(3):
+                cdata.append(chebyshev.chebfit(x, pos[:, k], polydg))
+        sp.spkw02(handle, body, center, "J2000", et0, et0 + n*intlen, "DE-LIKE", intlen, n, polydg,
+                  np.concatenate(cdata), et0)
+    sp.spkcls(handle)
+
+
+@pytest.fixture(scope="session")
+def kernels(tmp_path_factory):
+    """Furnish the LSK, the bundled small-body SPK, and a DE-like SPK."""
+    tmpdir = tmp_path_factory.mktemp("bench_kernels")
+    write_de_like_kernel(tmpdir / "de_like.bsp")
+    outmk = tmpdir / "bench.mk"
+    make_meta(
+        "$KERNELS/lsk/naif0012.tls",
+        "$KERNELS/tests/spk3200_19991201-20010101_retrieved20240916.bsp",
+        str(tmpdir / "de_like.bsp"),
+        output=outmk
+    )
+    sp.furnsh(str(outmk))
+    yield str(outmk)
+    sp.unload(str(outmk))
+
+
+@pytest.fixture
+def track_memory(benchmark):
+    """Run the function once under tracemalloc and save the peak memory (kB)
+    into the benchmark's ``extra_info`` (saved with the baselines)."""
+    def _track(func, *args, **kwargs):
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["peak_memory_kB"] = peak/1024
+        return peak
+    return _track
@@ -1,7 +1,59 @@
-from .constants import *
-from .timeutil import *
-from .kernelutil import *
-from .typeutil import *
-from .fastfunc import *
-from .phase import *
-from .queryutil import *
\ No newline at end of file
+import importlib
+
+# Submodules are imported lazily (PEP 562) at the first access of any of their
+# public names, so that, e.g., ``from spicetools.fastfunc import spkgps`` in a
+# worker process does not import astropy, pandas, requests, etc.
+_SUBMODULE_ATTRS = {
+    "constants": ["AU2KM", "KM2AU", "D2R", "R2D"],
+    "timeutil": ["times2et"],
+    "kernelutil": ["make_meta", "make_meta_shards", "read_meta_shards", "iter_shards"],
+    "typeutil": ["empty_double_vector", "str2char_p", "intern_char_p", "box_doubles", "box_ints",
+                 "as_c_array"],
+    "fastfunc": ["spkgps", "spkcvo", "spkgps_batch", "spkcvo_batch"],
+    "phase": ["iau_hg_model"],
+    "queryutil": ["SBDBQuery", "drop_impacted", "HorizonsSPKQuery", "download_jpl_de", "sanitize_comets",
+                  "sbdb_json2df", "decode_spk"],
+    "geometry": ["OBSERVABLE_FIELDS", "observable_dtype", "observables"],
+    "observer": ["ObserverTrajectory"],
+    "frames": ["is_inertial", "frame_rotation", "frame_transform", "rotate", "clear_frame_cache"],
+    "clut": ["compute_clut", "write_clut", "read_clut", "interp_clut"],
+    "clutdataset": ["sky_cells", "write_clut_dataset", "CLUTDataset"],
+    "clutcodec": ["CompactCLUT"],
+    "clutepoch": ["transpose_clut", "EpochCLUT"],
+    "dispatch": ["TIERS", "clut_error_bound", "positions"],
+    "uncertainty": ["ELEMENT_FIELDS", "SIGMA_FIELDS", "twobody_positions", "condition_code_sigma",
+                    "sky_uncertainty"],
+    "sharedarr": ["SharedArrays", "share_clut", "share_catalog"],
+    "jobs": ["atomic_path", "ShardRunner", "clut_shard", "decode_shard"],
+    "catalog": ["SBDB_DICTIONARY_FIELDS", "write_catalog", "SBDBCatalog"],
+    "workers": ["loaded_kernels", "warm_pool", "check_pool"],
+    "spkconvert": ["find_spk_texts", "convert_spk_texts"],
+    "trails": ["TRAIL_FIELDS", "trail_dtype", "predict_trails"],
+    "events": ["EVENT_DTYPE", "bracket_minima", "bracket_crossings", "refine_minima",
+               "refine_crossings", "distance_func", "elongation_func", "find_minima", "find_crossings"],
+    "plut": ["screen_pointings", "build_plut", "read_plut"],
+    "instrument": ["Instrumentation", "INSTRUMENT"],
+    "bspstore": ["BSPStore", "check_daf"],
+    "spkfile": ["spk_segments", "spkgps_file"],
+    "cshim": ["build_shim", "load_shim", "shim_available"],
+    "coverage": ["spk_coverage", "build_coverage", "coverage_mask", "uncovered"],
+}
+_ATTR2SUBMODULE = {attr: mod for mod, attrs in _SUBMODULE_ATTRS.items() for attr in attrs}
+
+__all__ = list(_ATTR2SUBMODULE)
+
+
+def __getattr__(name):
+    if name in _SUBMODULE_ATTRS:
+        return importlib.import_module(f".{name}", __name__)
+    try:
+        mod = _ATTR2SUBMODULE[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{mod}", __name__), name)
+    globals()[name] = value  # cache: __getattr__ is not called next time
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULE_ATTRS))
@@ -0,0 +1,15 @@
+# Imported by the forkserver process of `spicetools.workers.warm_pool` (as its
+# preload module): furnish the common kernels once, so that the workers forked
+# from the forkserver inherit them.
+import os
+
+import spiceypy as sp
+
+from .workers import PRELOAD_ENV, loaded_kernels
+
+__all__ = []
+
+_loaded = set(loaded_kernels())
+for _kernel in filter(None, os.environ.get(PRELOAD_ENV, "").split(os.pathsep)):
+    if _kernel not in _loaded:
+        sp.furnsh(_kernel)
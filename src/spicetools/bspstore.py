@@ -0,0 +1,317 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import spiceypy as sp
+
+from .coverage import spk_coverage
+
+
+__all__ = ["BSPStore", "check_daf"]
+
+
+# The first 8 bytes (ID word) of a DAF/SPK file (``REFGL1NQ`` in base64):
+DAF_SPK_IDWORD = b"DAF/SPK "
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    spkid     INTEGER NOT NULL,
+    soln_date TEXT,
+    hash      TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    valid     INTEGER NOT NULL,
+    et_start  REAL,
+    et_stop   REAL,
+    added     TEXT NOT NULL,
+    PRIMARY KEY (spkid, hash)
+);
+CREATE INDEX IF NOT EXISTS entries_hash ON entries (hash);
+"""
+
+
+def _sha256(path, blocksize=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(blocksize):
+            h.update(block)
+    return h.hexdigest()
+
+
+def check_daf(path):
+    """Check if a file is a valid SPK (DAF) file & get its objects' coverage.
+
+    Parameters
+    ----------
+    path : str, path-like
+        Path to the file.
+
+    Returns
+    -------
+    coverage : dict or None
+        ``{spkid: (et_start, et_stop)}`` of all the objects in the SPK file
+        (the first and last epochs of the coverage window). `None` if the file
+        is not a valid SPK file (e.g., an error message from Horizons saved as
+        ``.bsp``, or a truncated download).
+    """
+    path = str(path)
+    try:
+        with open(path, "rb") as f:
+            if f.read(8) != DAF_SPK_IDWORD:
+                return None
+    except OSError:
+        return None
+    try:
+        return {spkid: (windows[0, 0], windows[-1, 1])
+                for spkid, windows in spk_coverage(path).items() if len(windows)}
+    except sp.exceptions.SpiceyError:
+        sp.reset()
+        return None
+
+
+class BSPStore:
+    """Content-addressed repository of (small body) SPK files.
+
+    Each file is stored only once (read-only) as
+    ``objects/<hash[:2]>/<hash>.bsp`` (SHA-256 of the content), so
+    re-downloading unchanged orbits costs no disk space.
+    The SQLite index ``index.sqlite`` records, for each (spkid, hash), the
+    solution date, size, DAF validity, and coverage window. The latest entry of
+    each spkid is its current version.
+
+    Parameters
+    ----------
+    root : str, path-like
+        The root directory of the repository (created if not exists).
+
+    Examples
+    --------
+    >>> store = BSPStore("spkstore")
+    >>> todo = store.stale(df_sbdb["spkid"], df_sbdb["soln_date"])
+    >>> # ... download `todo` (e.g., `HorizonsSPKQuery`) and add:
+    >>> store.add_bytes(spk, spkid=spkid, soln_date=soln_date)
+    >>> store.export("spkbsp/a")  # -> spkbsp/a/spk<spkid>.bsp (hard links)
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.sqlite"
+        with self._connect() as con:
+            con.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        con = sqlite3.connect(self.index_path)
+        try:
+            with con:  # commit (or rollback on error)
+                yield con
+        finally:
+            con.close()
+
+    def object_path(self, sha256):
+        """Path to the stored file of the given hash."""
+        return self.root / "objects" / sha256[:2] / f"{sha256}.bsp"
+
+    def add(self, src, spkid=None, soln_date=None, move=False):
+        """Add an SPK file to the repository.
+
+        Parameters
+        ----------
+        src : str, path-like
+            Path to the SPK file.
+
+        spkid : int, optional
+            SPKID of the object. If `None`, it is read from the file, which
+            then must contain exactly one object.
+
+        soln_date : str, optional
+            Solution date of the orbit (e.g., the ``soln_date`` of SBDB).
+
+        move : bool, optional
+            If `True`, `src` is moved into the repository (removed if the same
+            content is already stored). Otherwise, it is copied. Invalid
+            files are never removed.
+
+        Returns
+        -------
+        entry : dict
+            The index entry with the additional key ``"new"`` (`False` if the
+            same content is already stored for `spkid`). Invalid files are
+            indexed with ``valid=False`` but not stored.
+        """
+        src = Path(src)
+        coverage = check_daf(src)
+        valid = coverage is not None
+        if spkid is None:
+            if not valid or len(coverage) != 1:
+                raise ValueError(f"Cannot determine the SPKID of {src}; give `spkid`.")
+            spkid = next(iter(coverage))
+        spkid = int(spkid)
+        et_start, et_stop = (coverage or {}).get(spkid, (None, None))
+        if valid and et_start is None:
+            valid = False  # the file does not contain `spkid`
+
+        sha256 = _sha256(src)
+        entry = dict(spkid=spkid, soln_date=soln_date, hash=sha256, size=src.stat().st_size,
+                     valid=valid, et_start=et_start, et_stop=et_stop,
+                     added=datetime.now(timezone.utc).isoformat())
+        if valid:
+            dst = self.object_path(sha256)
+            if not dst.exists():
+                dst.parent.mkdir(exist_ok=True)
+                if move:
+                    shutil.move(src, dst)
+                else:
+                    shutil.copy2(src, dst)
+                dst.chmod(0o444)  # protect from in-place overwrites via hard links
+            elif move:
+                src.unlink()
+
+        with self._connect() as con:
+            # Re-adding the same content only refreshes the entry (-> latest):
+            cur = con.execute("DELETE FROM entries WHERE spkid = ? AND hash = ?", (spkid, sha256))
+            con.execute(
+                "INSERT INTO entries VALUES (:spkid, :soln_date, :hash, :size, :valid, "
+                ":et_start, :et_stop, :added)", entry
+            )
+        entry["new"] = cur.rowcount == 0
+        return entry
+
+    def add_bytes(self, data, spkid=None, soln_date=None):
+        """Add an SPK from its content (e.g., ``HorizonsSPKQuery.spk``).
+
+        See `add` for the parameters and the return value.
+        """
+        fd, tmp = tempfile.mkstemp(suffix=".bsp", dir=self.root)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            return self.add(tmp, spkid=spkid, soln_date=soln_date, move=True)
+        finally:
+            Path(tmp).unlink(missing_ok=True)  # invalid, or failed
+
+    def index(self, latest=True):
+        """The index as a DataFrame.
+
+        Parameters
+        ----------
+        latest : bool, optional
+            If `True` (default), only the current (latest) entry of each spkid.
+        """
+        query = "SELECT * FROM entries"
+        if latest:
+            query += " WHERE rowid IN (SELECT MAX(rowid) FROM entries GROUP BY spkid)"
+        with self._connect() as con:
+            df = pd.read_sql_query(query + " ORDER BY spkid", con)
+        df["valid"] = df["valid"].astype(bool)
+        return df
+
+    def path(self, spkid):
+        """Path to the current file of `spkid` (`None` if not valid/stored)."""
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT hash, valid FROM entries WHERE spkid = ? ORDER BY rowid DESC LIMIT 1",
+                (int(spkid),)
+            ).fetchone()
+        if row is None or not row[1]:
+            return None
+        return self.object_path(row[0])
+
+    def stale(self, spkids, soln_dates=None):
+        """SPKIDs to be (re-)downloaded.
+
+        Parameters
+        ----------
+        spkids : array-like of int
+            SPKIDs of the objects (e.g., from an SBDB query).
+
+        soln_dates : array-like of str, optional
+            Current solution dates of the objects. If given, objects whose
+            stored solution date differs are also stale.
+
+        Returns
+        -------
+        spkids : np.ndarray
+            SPKIDs not stored, stored as invalid files, or with another
+            solution date.
+        """
+        df = pd.DataFrame({"spkid": np.asarray(spkids, dtype=np.int64)})
+        if soln_dates is not None:
+            df["soln_date"] = np.asarray(soln_dates, dtype=object)
+        idx = self.index()
+        df = df.merge(idx[idx["valid"]], on="spkid", how="left", suffixes=("", "_stored"))
+        stale = df["hash"].isna()
+        if soln_dates is not None:
+            stale |= df["soln_date"] != df["soln_date_stored"]
+        return df.loc[stale, "spkid"].to_numpy()
+
+    def export(self, output_dir, spkids=None, fmt="spk{spkid}.bsp", overwrite=True):
+        """Hard-link (copy if not possible) the current files to a directory.
+
+        The output can be used with, e.g., ``compute_clut(...,
+        bsp_fmt=f"{output_dir}/spk{{spkid}}.bsp")``.
+
+        Parameters
+        ----------
+        output_dir : str, path-like
+            Output directory (created if not exists).
+
+        spkids : array-like of int, optional
+            Objects to export. Default is all valid objects.
+
+        fmt : str, optional
+            File name format. Default is ``"spk{spkid}.bsp"``.
+
+        overwrite : bool, optional
+            If `True` (default), existing files are replaced.
+
+        Returns
+        -------
+        paths : list of Path
+            The exported files.
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        idx = self.index()
+        idx = idx[idx["valid"]]
+        if spkids is not None:
+            idx = idx[idx["spkid"].isin(np.asarray(spkids, dtype=np.int64))]
+        paths = []
+        for spkid, sha256 in zip(idx["spkid"], idx["hash"]):
+            dst = output_dir / fmt.format(spkid=spkid)
+            if dst.exists():
+                if not overwrite or os.path.samefile(dst, self.object_path(sha256)):
+                    paths.append(dst)
+                    continue
+                dst.unlink()
+            try:
+                os.link(self.object_path(sha256), dst)
+            except OSError:
+                shutil.copy2(self.object_path(sha256), dst)
+            paths.append(dst)
+        return paths
+
+    def verify(self):
+        """Re-hash the stored files.
+
+        Returns
+        -------
+        corrupted : list of str
+            Hashes of the stored files that are missing or whose content
+            does not match the hash.
+        """
+        with self._connect() as con:
+            hashes = [r[0] for r in con.execute("SELECT DISTINCT hash FROM entries WHERE valid")]
+        corrupted = []
+        for sha256 in hashes:
+            path = self.object_path(sha256)
+            if not path.exists() or _sha256(path) != sha256:
+                corrupted.append(sha256)
+        return corrupted
@@ -0,0 +1,160 @@
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+
+
+__all__ = ["SBDB_DICTIONARY_FIELDS", "write_catalog", "SBDBCatalog"]
+
+
+# Low-cardinality string fields of SBDB (see ``queryutil._SBDB_FIELDS_CSV``),
+# stored as dictionary (categorical) columns in the catalog file.
+SBDB_DICTIONARY_FIELDS = [
+    "kind", "prefix", "neo", "pha", "class", "condition_code", "two_body", "source", "producer",
+    "spec_B", "spec_T", "pe_used", "sb_used", "equinox",
+]
+
+# The magnitude fields of the comets (total and nuclear):
+_COMET_MAG_FIELDS = ["M1", "M2", "K1", "K2"]
+
+
+def write_catalog(df, path, dictionary=None, compression="uncompressed"):
+    """Write the SBDB catalog as a (memory-mappable) Feather (Arrow IPC) file.
+
+    Parameters
+    ----------
+    df : pd.DataFrame or pa.Table
+        The catalog, e.g., from `~spicetools.queryutil.SBDBQuery`.
+
+    path : str, path-like
+        Output file path (e.g., ``"sbdb_a.feather"``).
+
+    dictionary : list of str, optional
+        Columns to be dictionary-encoded. Default is the columns in
+        `SBDB_DICTIONARY_FIELDS`.
+
+    compression : {"uncompressed", "lz4", "zstd"}, optional
+        Compression of the file. Only the uncompressed file is read without
+        any copy (memory-mapped); LZ4 is a smaller file still fast to read.
+        Default is ``"uncompressed"``.
+    """
+    table = df if isinstance(df, pa.Table) else pa.Table.from_pandas(df, preserve_index=False)
+    if dictionary is None:
+        dictionary = [c for c in SBDB_DICTIONARY_FIELDS if c in table.column_names]
+    for col in dictionary:
+        i = table.column_names.index(col)
+        if not pa.types.is_dictionary(table.schema.field(i).type):
+            table = table.set_column(i, col, pc.dictionary_encode(table[col]))
+    feather.write_feather(table, str(path), compression=compression)
+
+
+class SBDBCatalog:
+    """Reader of the catalog file made by `write_catalog`.
+
+    The file is memory-mapped, so opening it costs (almost) nothing, and only
+    the pages of the columns actually used are read from the disk.
+
+    Parameters
+    ----------
+    path : str, path-like
+        Path to the catalog file.
+
+    Examples
+    --------
+    >>> cat = SBDBCatalog("sbdb_a.feather")
+    >>> # The filter of the asteroids in 02-CLUT:
+    >>> table = cat.select(["spkid", "pdes", "H", "G"], condition_codes="0123456789", h_max=100)
+    >>> spkids = table["spkid"].to_numpy()
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.table = feather.read_table(str(self.path), memory_map=True)
+
+    def __len__(self):
+        return self.table.num_rows
+
+    @property
+    def columns(self):
+        return self.table.column_names
+
+    def column(self, name):
+        """The column as a NumPy array (zero-copy if possible).
+
+        Dictionary columns are returned as their decoded values.
+        """
+        col = self.table[name]
+        if pa.types.is_dictionary(col.type):
+            col = col.cast(col.type.value_type)
+        return col.to_numpy()
+
+    def mask(self, condition_codes=None, h_max=None, data_arc_min=None, comet_mag_max=None):
+        """Boolean mask of the rows satisfying all the given conditions.
+
+        Parameters
+        ----------
+        condition_codes : iterable of str, optional
+            The accepted orbit condition codes (``"condition_code"``), e.g.,
+            ``"0123456789"`` to exclude the objects without a proper
+            uncertainty parameter.
+
+        h_max : float, optional
+            ``H < h_max`` (e.g., ``100`` to drop the objects without H).
+
+        data_arc_min : float, optional
+            ``data_arc > data_arc_min`` (days).
+
+        comet_mag_max : float, optional
+            Any of ``"M1"``, ``"M2"``, ``"K1"``, ``"K2"`` (those present) is
+            less than `comet_mag_max`.
+
+        Returns
+        -------
+        mask : pa.ChunkedArray
+            The boolean mask (`None` for a missing value counts as `False`).
+        """
+        conds = []
+        if condition_codes is not None:
+            conds.append(pc.is_in(self.table["condition_code"],
+                                  value_set=pa.array(list(condition_codes), type=pa.string())))
+        if h_max is not None:
+            conds.append(pc.less(self.table["H"], h_max))
+        if data_arc_min is not None:
+            conds.append(pc.greater(self.table["data_arc"], data_arc_min))
+        if comet_mag_max is not None:
+            cols = [c for c in _COMET_MAG_FIELDS if c in self.columns]
+            if not cols:
+                raise KeyError(f"None of {_COMET_MAG_FIELDS} in the catalog.")
+            cond = pc.less(self.table[cols[0]], comet_mag_max)
+            for c in cols[1:]:
+                cond = pc.or_kleene(cond, pc.less(self.table[c], comet_mag_max))
+            conds.append(cond)
+
+        mask = pa.chunked_array([np.ones(len(self), dtype=bool)])
+        for cond in conds:
+            mask = pc.and_kleene(mask, cond)
+        return pc.fill_null(mask, False)
+
+    def select(self, columns=None, **filters):
+        """Rows satisfying the conditions (see `mask`) as an Arrow table.
+
+        Parameters
+        ----------
+        columns : list of str, optional
+            Columns to return. Default is all.
+
+        **filters : dict, optional
+            The conditions (keyword arguments of `mask`).
+
+        Returns
+        -------
+        table : pa.Table
+            The selected rows (the dictionary columns stay encoded; they
+            become `pd.Categorical` by ``table.to_pandas()``).
+        """
+        table = self.table
+        if filters:
+            table = table.filter(self.mask(**filters))
+        return table if columns is None else table.select(list(columns))
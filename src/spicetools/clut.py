@@ -0,0 +1,188 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import spiceypy as sp
+
+from .coverage import coverage_mask
+from .cshim import spkgps_batch
+from .instrument import INSTRUMENT
+
+
+__all__ = ["compute_clut", "write_clut", "read_clut", "interp_clut"]
+
+
+# The crude look-up table (CLUT; see docs/02-CLUT.ipynb) is a parquet file with
+# the ``"spkid"`` column and the ``"0"`` ... ``"<3*N_et - 1>"`` columns, i.e.,
+# the float32 x (N_et columns), y (N_et columns), and z (N_et columns) of each
+# object (row) at the epochs (the epochs themselves are not saved).
+
+
+def compute_clut(spkids, ets, bsp_fmt="spk{spkid}.bsp", ref="ECLIPJ2000", obs=399, dtype=np.float32,
+                 coverage=None):
+    """Compute the CLUT positions of objects stored in separate BSP files.
+
+    The positions are computed by the C shim (`~spicetools.cshim`) if
+    available, otherwise by `~spicetools.fastfunc.spkgps_batch`.
+
+    Parameters
+    ----------
+    spkids : array-like of int
+        SPKIDs of the objects.
+
+    ets : array-like of float
+        Epochs in ET.
+
+    bsp_fmt : str, optional
+        Format of the path to the BSP file of each object, formatted with
+        ``bsp_fmt.format(spkid=spkid)``. Default is ``"spk{spkid}.bsp"``.
+
+    ref : str, optional
+        Reference frame. Default is ``"ECLIPJ2000"``.
+
+    obs : int, optional
+        Observer SPKID. Default is ``399`` (geocenter). The kernels needed to
+        connect the objects' centers to `obs` (e.g., DE) must be loaded.
+
+    dtype : dtype-like, optional
+        Float type of the output positions. Default is ``np.float32``.
+
+    coverage : pd.DataFrame, optional
+        The coverage index of the objects (see
+        `~spicetools.coverage.build_coverage`). If given, only the covered
+        epochs are computed (others are `np.nan`), objects partially covered
+        are kept, and the files of the objects without any covered epoch are
+        not even loaded (they are in `error_file`). Otherwise, an object is
+        dropped if any epoch is out of its coverage.
+
+    Returns
+    -------
+    spkids_used : np.ndarray
+        SPKIDs of the objects successfully calculated.
+
+    pos : np.ndarray
+        Positions (km) of the objects of shape ``(N_obj, N_et, 3)``.
+
+    no_spk_file, error_file : list of int
+        SPKIDs without a BSP file and with any SPICE error, respectively.
+    """
+    ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+    spkids_used, pos = [], []
+    no_spk_file, error_file = [], []
+    _buf = np.empty((1, len(ets), 3))
+    if coverage is not None:
+        masks = coverage_mask(coverage, spkids, ets)
+    for k, spkid in enumerate(spkids):
+        fpath = Path(bsp_fmt.format(spkid=spkid))
+        if not fpath.exists():
+            no_spk_file.append(spkid)
+            continue
+        covered = None if coverage is None else masks[k:k + 1]
+        if covered is not None and not covered.any():
+            error_file.append(spkid)
+            continue
+        try:
+            with INSTRUMENT.timer("kernel.load"):
+                handle = sp.spklef(str(fpath))
+        except sp.exceptions.SpiceyError:
+            error_file.append(spkid)
+            continue
+        spkgps_batch(spkid, ets, ref, obs, out=_buf, covered=covered)
+        with INSTRUMENT.timer("kernel.unload"):
+            sp.spkuef(handle)
+        if np.isnan(_buf[0, 0, 0]) if covered is None else np.all(np.isnan(_buf[0, :, 0])):
+            error_file.append(spkid)
+            continue
+        spkids_used.append(spkid)
+        pos.append(_buf[0].astype(dtype))
+
+    with INSTRUMENT.timer("clut.assemble"):
+        pos = np.array(pos, dtype=dtype).reshape(-1, len(ets), 3)
+    return np.array(spkids_used, dtype=np.int64), pos, no_spk_file, error_file
+
+
+def write_clut(output, spkids, pos, **kwargs):
+    """Write the CLUT parquet file.
+
+    Parameters
+    ----------
+    output : str, path-like
+        Output parquet file path.
+
+    spkids : array-like of int
+        SPKIDs of the objects.
+
+    pos : array-like
+        Positions of shape ``(N_obj, N_et, 3)``.
+
+    **kwargs : dict, optional
+        Additional keyword arguments to pass to `pd.DataFrame.to_parquet`.
+    """
+    with INSTRUMENT.timer("clut.assemble"):
+        pos = np.asarray(pos, dtype=np.float32)
+        n_obj, n_et, _ = pos.shape
+        xyz = pos.transpose(0, 2, 1).reshape(n_obj, 3*n_et)  # x..., y..., z...
+        df = pd.DataFrame(xyz, columns=[str(i) for i in range(3*n_et)])
+        df.insert(loc=0, value=np.asarray(spkids).astype(np.int32), column="spkid")
+    with INSTRUMENT.timer("clut.write"):
+        df.to_parquet(output, **kwargs)
+    if INSTRUMENT.enabled and isinstance(output, (str, Path)):
+        INSTRUMENT.add_bytes("clut.write", Path(output).stat().st_size)
+
+
+def read_clut(path, spkids=None):
+    """Read the CLUT parquet file.
+
+    Parameters
+    ----------
+    path : str, path-like
+        Path to the CLUT parquet file.
+
+    spkids : array-like of int, optional
+        If given, only these objects are returned (in the file order).
+
+    Returns
+    -------
+    spkids : np.ndarray
+        SPKIDs of the objects.
+
+    pos : np.ndarray
+        The float32 positions of shape ``(N_obj, N_et, 3)``.
+    """
+    df = pd.read_parquet(path, filters=None if spkids is None else [("spkid", "in", list(spkids))])
+    _spkids = df["spkid"].to_numpy()
+    xyz = df.drop(columns="spkid").to_numpy(dtype=np.float32)
+    n_et = xyz.shape[1]//3
+    pos = np.ascontiguousarray(xyz.reshape(len(df), 3, n_et).transpose(0, 2, 1))
+    return _spkids, pos
+
+
+def interp_clut(pos, ets, et):
+    """Linearly interpolate CLUT positions to the given epoch(s).
+
+    Parameters
+    ----------
+    pos : np.ndarray
+        Positions of shape ``(N_obj, N_et, 3)``.
+
+    ets : array-like of float
+        The (sorted) epochs of the CLUT in ET.
+
+    et : float or array-like of float
+        Epoch(s) to interpolate at, within ``[ets[0], ets[-1]]``.
+
+    Returns
+    -------
+    pos_interp : np.ndarray
+        Positions of shape ``(N_obj, 3)`` if `et` is scalar, otherwise
+        ``(N_obj, N, 3)``.
+    """
+    ets = np.asarray(ets, dtype=np.float64)
+    _et = np.atleast_1d(np.asarray(et, dtype=np.float64))
+    if np.any(_et < ets[0]) or np.any(_et > ets[-1]):
+        raise ValueError("`et` must be within the CLUT epochs.")
+    i1 = np.clip(np.searchsorted(ets, _et, side="right"), 1, len(ets) - 1)
+    i0 = i1 - 1
+    w = ((_et - ets[i0])/(ets[i1] - ets[i0]))[None, :, None]
+    res = (1 - w)*pos[:, i0] + w*pos[:, i1]
+    return res[:, 0] if np.ndim(et) == 0 else res
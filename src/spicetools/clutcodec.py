@@ -0,0 +1,244 @@
+import numpy as np
+
+from .constants import R2D
+
+
+__all__ = ["CompactCLUT"]
+
+
+class CompactCLUT:
+    """Compact encoding of the CLUT positions (~1.6x/~2.8x smaller than float32).
+
+    The epochs are split into blocks (default 64 epochs). In each block, the
+    positions of each object (and axis) are quantized on a grid of step
+    ``scale`` relative to the first position of the block, and the second
+    differences of the integer grid values are stored as int16 (or int8).
+    Since the differences are exact integers, the decoding (two cumulative
+    sums) is exact, i.e., the error of every decoded position is at most
+    ``scale/2`` per axis (no accumulation). ``scale`` is chosen per object,
+    block, and axis as the smallest step for which the second differences
+    fit the integer type.
+
+    Error budget: for a daily geocentric CLUT, the second differences are
+    dominated by the Earth's orbital acceleration (~6e-6 km/s^2 * (86400
+    s)^2 ~ 4.5e4 km), so ``scale`` is ~1.4 km for int16 (max error ~0.7 km
+    per axis) and ~360 km for int8 (~180 km, i.e., ~0.3 arcsec at 1 au).
+    Blocks with close approaches or perihelia near the Sun have much larger
+    accelerations, thus larger errors: for (3200) Phaethon (q ~ 0.14 au) in
+    2000 (daily, 64-epoch blocks), the maximum error is ~40 km (int16, 0.05
+    arcsec) and ~1e4 km (int8, ~12 arcsec), while the median over the
+    blocks is ~1 km and ~280 km. Use `max_error` (bound) or `error_budget` (measured) to check.
+
+    Parameters
+    ----------
+    spkids : np.ndarray
+        SPKIDs of the objects.
+
+    ref : np.ndarray
+        The float64 first positions of the blocks, ``(N_obj, N_block, 3)``.
+
+    first : np.ndarray
+        The int64 first differences of the grid values of the blocks,
+        ``(N_obj, N_block, 3)``.
+
+    ddiff : np.ndarray
+        The int16 (or int8) second differences, ``(N_obj, N_block,
+        block - 2, 3)``.
+
+    scale : np.ndarray
+        The float64 grid steps, ``(N_obj, N_block, 3)``.
+
+    n_et : int
+        Number of epochs.
+
+    nan_mask : np.ndarray, optional
+        Packed (``np.packbits``) boolean mask of the `np.nan` positions of
+        shape ``(N_obj, ceil(N_et/8))``. `None` if there is no `np.nan`.
+
+    Notes
+    -----
+    Use `encode` to make it from positions, and `decode` to restore them.
+    """
+
+    def __init__(self, spkids, ref, first, ddiff, scale, n_et, nan_mask=None):
+        self.spkids = np.asarray(spkids)
+        self.ref = ref
+        self.first = first
+        self.ddiff = ddiff
+        self.scale = scale
+        self.n_et = n_et
+        self.nan_mask = nan_mask
+
+    def __len__(self):
+        return len(self.spkids)
+
+    @property
+    def block(self):
+        """Number of epochs per block."""
+        return self.ddiff.shape[2] + 2
+
+    @classmethod
+    def encode(cls, spkids, pos, dtype=np.int16, block=64):
+        """Encode the positions.
+
+        Parameters
+        ----------
+        spkids : array-like of int
+            SPKIDs of the objects.
+
+        pos : array-like
+            Positions of shape ``(N_obj, N_et, 3)`` with ``N_et >= 2``.
+            `np.nan` positions (e.g., out of coverage) are restored as
+            `np.nan` (but they are interpolated when encoding, which may
+            increase ``scale`` of the object).
+
+        dtype : {np.int16, np.int8}, optional
+            Integer type of the second differences. Default is ``np.int16``.
+
+        block : int, optional
+            Number of epochs per block (at least 3). Smaller blocks isolate
+            large accelerations better but cost more per block and object
+            (``ref``, ``first``, and ``scale``: 72 bytes, minus the 2x3
+            second differences not stored: net 60 bytes for int16, 66 for
+            int8). Default is 64.
+
+        Returns
+        -------
+        compact : CompactCLUT
+            The encoded CLUT.
+        """
+        pos = np.array(pos, dtype=np.float64)
+        n_obj, n_et, _ = pos.shape
+        if n_et < 2:
+            raise ValueError("At least 2 epochs are needed.")
+        if block < 3:
+            raise ValueError("`block` must be at least 3.")
+        nan = np.isnan(pos).any(axis=-1)
+        nan_mask = None
+        if nan.any():
+            nan_mask = np.packbits(nan, axis=1)
+            _fill_nan(pos, nan)
+
+        block = min(block, n_et)
+        n_block = -(-n_et//block)
+        if n_block*block > n_et:  # pad by linear extrapolation (2nd diff = 0)
+            k = np.arange(1, n_block*block - n_et + 1)[None, :, None]
+            pad = pos[:, -1:] + k*(pos[:, -1:] - pos[:, -2:-1])
+            pos = np.concatenate([pos, pad], axis=1)
+        pos = pos.reshape(n_obj, n_block, block, 3)
+
+        ref = pos[:, :, 0].copy()
+        qmax = np.iinfo(dtype).max
+        # |2nd diff of rounded values| <= |2nd diff|/scale + 2 (rounding) <= qmax
+        dd_max = np.abs(np.diff(pos, n=2, axis=2)).max(axis=2, initial=0)
+        # The floor keeps the grid values well within int64 for (nearly)
+        # linear blocks, e.g., the padded last block:
+        span = np.abs(pos - ref[:, :, None]).max(axis=2)
+        scale = np.maximum(np.maximum(dd_max/(qmax - 2), span/2**40), np.finfo(np.float64).tiny)
+        grid = np.rint((pos - ref[:, :, None])/scale[:, :, None]).astype(np.int64)
+        first = grid[:, :, 1] - grid[:, :, 0]
+        ddiff = np.diff(grid, n=2, axis=2).astype(dtype)
+        return cls(spkids, ref, first, ddiff, scale, n_et, nan_mask=nan_mask)
+
+    def decode(self, dtype=np.float32, spkids=None):
+        """Decode the positions.
+
+        Parameters
+        ----------
+        dtype : dtype-like, optional
+            Float type of the output. Default is ``np.float32``.
+
+        spkids : array-like of int, optional
+            If given, only these objects are decoded (in the stored order).
+
+        Returns
+        -------
+        pos : np.ndarray
+            Positions of shape ``(N_obj, N_et, 3)``.
+        """
+        sel = slice(None) if spkids is None else np.isin(self.spkids, spkids)
+        n_obj = len(self.spkids[sel])
+        n_block, block = self.ref.shape[1], self.block
+        # velocity-like first differences, then the grid values (exact in int64):
+        vel = np.empty((n_obj, n_block, block - 1, 3), dtype=np.int64)
+        vel[:, :, 0] = self.first[sel]
+        np.cumsum(self.ddiff[sel], axis=2, out=vel[:, :, 1:])
+        vel[:, :, 1:] += vel[:, :, :1]
+        grid = np.zeros((n_obj, n_block, block, 3), dtype=np.int64)
+        np.cumsum(vel, axis=2, out=grid[:, :, 1:])
+        pos = self.ref[sel][:, :, None] + grid*self.scale[sel][:, :, None]
+        pos = pos.reshape(n_obj, n_block*block, 3)[:, :self.n_et].astype(dtype)
+        if self.nan_mask is not None:
+            pos[np.unpackbits(self.nan_mask[sel], axis=1, count=self.n_et).astype(bool)] = np.nan
+        return pos
+
+    @property
+    def max_error(self):
+        """Upper bound of the decoding error (km, Euclidean) of each object.
+
+        The float32 rounding of the decoded positions (if ``dtype=np.float32``
+        in `decode`) is not included.
+        """
+        return 0.5*np.linalg.norm(self.scale, axis=2).max(axis=1)
+
+    @property
+    def nbytes(self):
+        """Total bytes of the encoded arrays."""
+        arrs = [self.spkids, self.ref, self.first, self.ddiff, self.scale]
+        if self.nan_mask is not None:
+            arrs.append(self.nan_mask)
+        return sum(a.nbytes for a in arrs)
+
+    def error_budget(self, pos):
+        """Measure the decoding error against the original positions.
+
+        Parameters
+        ----------
+        pos : array-like
+            The original positions of shape ``(N_obj, N_et, 3)``.
+
+        Returns
+        -------
+        budget : dict
+            ``"max_km"``, ``"rms_km"`` (Euclidean position error, km) and
+            ``"max_arcsec"`` (angular error seen from the origin of the
+            positions, e.g., the geocenter) over all objects and epochs, and
+            ``"bytes_per_object"``.
+        """
+        pos = np.asarray(pos, dtype=np.float64)
+        dec = self.decode(dtype=np.float64)
+        err = np.linalg.norm(dec - pos, axis=-1)
+        ang = err/np.linalg.norm(pos, axis=-1)*R2D*3600
+        return {
+            "max_km": float(np.nanmax(err)),
+            "rms_km": float(np.sqrt(np.nanmean(err**2))),
+            "max_arcsec": float(np.nanmax(ang)),
+            "bytes_per_object": self.nbytes/len(self),
+        }
+
+    def save(self, path):
+        """Save to a ``.npz`` file."""
+        arrs = dict(spkids=self.spkids, ref=self.ref, first=self.first, ddiff=self.ddiff,
+                    scale=self.scale, n_et=self.n_et)
+        if self.nan_mask is not None:
+            arrs["nan_mask"] = self.nan_mask
+        np.savez(path, **arrs)
+
+    @classmethod
+    def load(cls, path):
+        """Load from a ``.npz`` file made by `save`."""
+        with np.load(path) as f:
+            return cls(f["spkids"], f["ref"], f["first"], f["ddiff"], f["scale"],
+                       int(f["n_et"]), nan_mask=f["nan_mask"] if "nan_mask" in f else None)
+
+
+def _fill_nan(pos, nan):
+    """Linearly interpolate (in place) the `np.nan` epochs of each object."""
+    idx = np.arange(pos.shape[1])
+    for i in np.flatnonzero(nan.any(axis=1)):
+        good = ~nan[i]
+        if not good.any():
+            pos[i] = 0.0
+            continue
+        for k in range(3):
+            pos[i, nan[i], k] = np.interp(idx[nan[i]], idx[good], pos[i, good, k])
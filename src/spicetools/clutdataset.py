@@ -0,0 +1,234 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .constants import D2R, R2D
+from .frames import rotate
+
+
+__all__ = ["sky_cells", "write_clut_dataset", "CLUTDataset"]
+
+
+# The CLUT dataset is the "long" layout of the CLUT (see clut.py): one row per
+# (object, epoch) with the columns ``spkid`` (int64), ``et`` (float64), ``x``,
+# ``y``, ``z`` (float32, km), hive-partitioned by the coarse sky ``cell`` of
+# the position, i.e., ``cell=<N>/part-<K>.parquet``. In each file, rows are
+# sorted by (et, spkid), so the row-group statistics prune epoch ranges, and
+# the partitions prune sky regions. ``_meta.json`` has the frame, cell size,
+# and the epochs.
+CLUT_META = "_meta.json"
+
+
+def _ncells(cell_size):
+    return int(round(360/cell_size)), int(round(180/cell_size))
+
+
+def sky_cells(xyz, cell_size=10.0):
+    """Coarse sky cell indices of positions (longitude-latitude grid).
+
+    Parameters
+    ----------
+    xyz : array-like
+        Positions of shape ``(..., 3)``.
+
+    cell_size : float, optional
+        Size of the cells in degrees (360 and 180 should be multiples of it).
+        Default is 10 degrees.
+
+    Returns
+    -------
+    cells : np.ndarray
+        The int32 cell indices, ``ilat*N_lon + ilon``, of shape
+        ``xyz.shape[:-1]``.
+    """
+    xyz = np.asarray(xyz, dtype=np.float64)
+    nlon, nlat = _ncells(cell_size)
+    with np.errstate(invalid="ignore", divide="ignore"):  # NaN positions -> arbitrary cells
+        lon = np.arctan2(xyz[..., 1], xyz[..., 0])*R2D % 360
+        lat = np.arcsin(np.clip(xyz[..., 2]/np.linalg.norm(xyz, axis=-1), -1, 1))*R2D
+        ilon = np.minimum((lon*nlon/360).astype(np.int32), nlon - 1)
+        ilat = np.clip(((lat + 90)*nlat/180).astype(np.int32), 0, nlat - 1)
+    return (ilat*nlon + ilon).astype(np.int32)
+
+
+def _region_cells(vec, radius, cell_size):
+    """Cells possibly overlapping the cap of `radius` (deg) around unit `vec`."""
+    nlon, nlat = _ncells(cell_size)
+    lon = (np.arange(nlon) + 0.5)*360/nlon*D2R
+    lat = ((np.arange(nlat) + 0.5)*180/nlat - 90)*D2R
+    lon, lat = np.meshgrid(lon, lat)  # (nlat, nlon), i.e., cell = ilat*nlon + ilon
+    centers = np.stack([np.cos(lat)*np.cos(lon), np.cos(lat)*np.sin(lon), np.sin(lat)], axis=-1)
+    # A cell is within its circumscribed circle of radius < cell_size:
+    cos_lim = np.cos(np.clip(radius + cell_size, 0, 180)*D2R)
+    return np.flatnonzero((centers.reshape(-1, 3) @ vec) >= cos_lim).astype(np.int32)
+
+
+def write_clut_dataset(output, spkids, pos, ets, ref="ECLIPJ2000", cell_size=10.0, part=0,
+                       row_group_size=65536):
+    """Write CLUT positions to the CLUT dataset (long layout).
+
+    Parameters
+    ----------
+    output : str, path-like
+        The dataset directory (created if not exists).
+
+    spkids : array-like of int
+        SPKIDs of the objects.
+
+    pos : array-like
+        Positions of shape ``(N_obj, N_et, 3)`` (see
+        `~spicetools.clut.compute_clut`, or `~spicetools.clut.read_clut` to
+        convert an existing CLUT file), saved as float32. Rows of `np.nan`
+        positions are not saved.
+
+    ets : array-like of float
+        The epochs of `pos` in ET.
+
+    ref : str, optional
+        Reference frame of `pos`. Default is ``"ECLIPJ2000"``.
+
+    cell_size : float, optional
+        Size of the sky cells in degrees. Default is 10 degrees.
+
+    part : int, optional
+        Index of this chunk of objects. Call this function once per chunk
+        (e.g., 100k objects) with different `part` to write a large CLUT.
+        All chunks must have the same `ets`, `ref`, and `cell_size`.
+
+    row_group_size : int, optional
+        Maximum number of rows per row group.
+    """
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    ets = np.asarray(ets, dtype=np.float64)
+    meta = {"ref": ref, "cell_size": cell_size, "ets": ets.tolist()}
+    if (output / CLUT_META).exists():
+        with open(output / CLUT_META) as f:
+            if json.load(f) != meta:
+                raise ValueError(f"`ets`, `ref`, or `cell_size` differs from {output / CLUT_META}.")
+    else:
+        with open(output / CLUT_META, "w") as f:
+            json.dump(meta, f)
+
+    pos = np.asarray(pos, dtype=np.float32)
+    n_obj, n_et, _ = pos.shape
+    xyz = pos.transpose(1, 0, 2).reshape(-1, 3)  # (et, spkid) order
+    cells = sky_cells(xyz, cell_size)
+    keep = np.all(np.isfinite(xyz), axis=1)
+    table = pa.table({
+        "spkid": np.tile(np.asarray(spkids, dtype=np.int64), n_et)[keep],
+        "et": np.repeat(ets, n_obj)[keep],
+        "x": xyz[keep, 0], "y": xyz[keep, 1], "z": xyz[keep, 2],
+    })
+    cells = cells[keep]
+    order = np.argsort(cells, kind="stable")  # (et, spkid) order kept in each cell
+    bounds = np.searchsorted(cells[order], np.unique(cells), side="left").tolist() + [len(order)]
+    for cell, i0, i1 in zip(np.unique(cells), bounds[:-1], bounds[1:]):
+        celldir = output / f"cell={cell}"
+        celldir.mkdir(exist_ok=True)
+        pq.write_table(table.take(order[i0:i1]), celldir / f"part-{part:05d}.parquet",
+                       row_group_size=row_group_size)
+
+
+class CLUTDataset:
+    """Reader of the CLUT dataset (see `write_clut_dataset`).
+
+    Parameters
+    ----------
+    path : str, path-like
+        The dataset directory.
+
+    Examples
+    --------
+    >>> clut = CLUTDataset("clut_dataset")
+    >>> table = clut.select(et_range=(et0, et0 + 86400), region=(ra, dec, 2.0),
+    ...                     region_frame="J2000")
+    >>> x = table["x"].to_numpy()  # zero-copy if the column is one chunk
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / CLUT_META) as f:
+            meta = json.load(f)
+        self.ref = meta["ref"]
+        self.cell_size = meta["cell_size"]
+        self.ets = np.array(meta["ets"], dtype=np.float64)
+        self.dataset = ds.dataset(self.path, format="parquet", partitioning="hive",
+                                  exclude_invalid_files=True)
+
+    def select(self, spkids=None, et_range=None, region=None, region_frame=None, columns=None,
+               exact=True):
+        """Read the rows matching all the given conditions.
+
+        Only the partitions (sky cells) and the row groups (by their
+        statistics of ``et`` and ``spkid``) that can match are read.
+
+        Parameters
+        ----------
+        spkids : array-like of int, optional
+            Objects to select.
+
+        et_range : tuple of float, optional
+            ``(et_min, et_max)`` (inclusive) to select.
+
+        region : tuple of float, optional
+            ``(lon, lat, radius)`` in degrees: the positions within `radius`
+            from the direction ``(lon, lat)`` (e.g., RA/Dec).
+
+        region_frame : str, optional
+            The frame of `region`. Default is the frame of the dataset.
+
+        columns : list of str, optional
+            Columns to return (among ``"spkid"``, ``"et"``, ``"x"``, ``"y"``,
+            ``"z"``, ``"cell"``). Default is all.
+
+        exact : bool, optional
+            If `True` (default), the rows selected by the cells are further
+            filtered by the exact angular distance from the `region` center.
+            Otherwise, all rows of the overlapping cells are returned.
+
+        Returns
+        -------
+        table : pa.Table
+            The selected rows (Arrow buffers, not copied to pandas/numpy).
+        """
+        filt = None
+
+        def _and(expr):
+            return expr if filt is None else filt & expr
+
+        if spkids is not None:
+            filt = _and(ds.field("spkid").isin(np.asarray(spkids, dtype=np.int64).tolist()))
+        if et_range is not None:
+            filt = _and((ds.field("et") >= float(et_range[0])) & (ds.field("et") <= float(et_range[1])))
+        vec = None
+        if region is not None:
+            lon, lat, radius = region
+            lon, lat = lon*D2R, lat*D2R
+            vec = np.array([np.cos(lat)*np.cos(lon), np.cos(lat)*np.sin(lon), np.sin(lat)])
+            if region_frame is not None:
+                vec = rotate(vec, region_frame, self.ref)
+            cells = _region_cells(vec, radius, self.cell_size)
+            filt = _and(ds.field("cell").isin(cells.tolist()))
+
+        read_cols = None
+        if columns is not None:
+            read_cols = list(columns)
+            if vec is not None and exact:
+                read_cols += [c for c in ("x", "y", "z") if c not in read_cols]
+        table = self.dataset.to_table(columns=read_cols, filter=filt)
+
+        if vec is not None and exact:
+            x, y, z = (pc.cast(table[c], pa.float64()) for c in ("x", "y", "z"))
+            r = pc.sqrt(pc.add(pc.add(pc.multiply(x, x), pc.multiply(y, y)), pc.multiply(z, z)))
+            cos_sep = pc.divide(pc.add(pc.add(pc.multiply(x, vec[0]), pc.multiply(y, vec[1])),
+                                       pc.multiply(z, vec[2])), r)
+            table = table.filter(pc.greater_equal(cos_sep, np.cos(region[2]*D2R)))
+            if columns is not None:
+                table = table.select(list(columns))
+        return table
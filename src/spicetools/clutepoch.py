@@ -0,0 +1,188 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from .jobs import atomic_path
+
+
+__all__ = ["transpose_clut", "EpochCLUT"]
+
+
+# The epoch-major CLUT is a directory of ``epoch_<NNNNN>.npy`` files (one per
+# epoch of the CLUT), each the float32 ``(N_obj, 3)`` positions of all objects
+# sorted by spkid, so loading all objects at one epoch is a single sequential
+# read (or a memory map). ``spkids.npy`` has the sorted SPKIDs (int64) and
+# ``_meta.json`` the number of epochs and the epochs (ET) if known.
+EPOCH_META = "_meta.json"
+
+
+def _epoch_path(output_dir, k):
+    return Path(output_dir) / f"epoch_{k:05d}.npy"
+
+
+def transpose_clut(paths, output_dir, ets=None, epochs_per_pass=32):
+    """Transpose object-major CLUT files into the epoch-major layout.
+
+    The transposition is out-of-core: only the columns of `epochs_per_pass`
+    epochs of one CLUT file are in memory at a time, and they are written to
+    the memory-mapped epoch files.
+
+    Parameters
+    ----------
+    paths : list of str, path-like
+        The CLUT parquet files (see `~spicetools.clut.write_clut`), e.g., the
+        chunks of 100k objects. All must have the same epochs, and each
+        spkid must be in only one file.
+
+    output_dir : str, path-like
+        The output directory (created if not exists).
+
+    ets : array-like of float, optional
+        The epochs (ET) of the CLUT, saved in the metadata (needed for
+        `EpochCLUT.interp`).
+
+    epochs_per_pass : int, optional
+        Number of epochs read from each file at a time. Larger is faster
+        but uses more memory (``N_obj_file*epochs_per_pass*12`` bytes).
+
+    Returns
+    -------
+    clut : EpochCLUT
+        The reader of the output.
+    """
+    paths = [str(p) for p in paths]
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Pass 0: spkids only -> the global (sorted) row of each object
+    file_spkids, n_ets = [], []
+    for path in paths:
+        pf = pq.ParquetFile(path)
+        n_ets.append((len(pf.schema_arrow.names) - 1)//3)
+        file_spkids.append(pf.read(columns=["spkid"])["spkid"].to_numpy().astype(np.int64))
+    if len(set(n_ets)) != 1:
+        raise ValueError(f"The CLUT files have different numbers of epochs: {sorted(set(n_ets))}.")
+    n_et = n_ets[0]
+    if ets is not None and len(ets) != n_et:
+        raise ValueError(f"`ets` has {len(ets)} epochs but the CLUT has {n_et}.")
+    spkids = np.concatenate(file_spkids)
+    order = np.argsort(spkids, kind="stable")
+    sorted_spkids = spkids[order]
+    if np.any(sorted_spkids[1:] == sorted_spkids[:-1]):
+        raise ValueError("Duplicated spkid in the CLUT files.")
+    rows = np.empty(len(spkids), dtype=np.int64)
+    rows[order] = np.arange(len(spkids))
+    file_rows = np.split(rows, np.cumsum([len(s) for s in file_spkids])[:-1])
+
+    for k0 in range(0, n_et, epochs_per_pass):
+        ks = range(k0, min(k0 + epochs_per_pass, n_et))
+        outs = [np.lib.format.open_memmap(_epoch_path(output_dir, k), mode="w+", dtype=np.float32,
+                                          shape=(len(spkids), 3)) for k in ks]
+        for path, frows in zip(paths, file_rows):
+            cols = [str(c*n_et + k) for k in ks for c in range(3)]
+            table = pq.read_table(path, columns=cols)
+            for i, k in enumerate(ks):
+                xyz = np.stack([table[str(c*n_et + k)].to_numpy() for c in range(3)], axis=1)
+                outs[i][frows] = xyz
+        for out in outs:
+            out.flush()
+        del outs
+
+    np.save(output_dir / "spkids.npy", sorted_spkids)
+    meta = {"n_et": n_et, "ets": None if ets is None else np.asarray(ets, dtype=np.float64).tolist()}
+    with atomic_path(output_dir / EPOCH_META) as tmp:
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+    return EpochCLUT(output_dir)
+
+
+class EpochCLUT:
+    """Reader of the epoch-major CLUT (see `transpose_clut`).
+
+    Parameters
+    ----------
+    path : str, path-like
+        The directory of the epoch-major CLUT.
+
+    mmap : bool, optional
+        If `True`, the epoch files are memory-mapped (only the pages used are
+        read). Otherwise (default), each epoch file is read at once.
+
+    Examples
+    --------
+    >>> clut = EpochCLUT("clut_epoch")
+    >>> pos = clut.interp(et)  # all objects, reading only 2 epoch files
+    """
+
+    def __init__(self, path, mmap=False):
+        self.path = Path(path)
+        self.mmap = mmap
+        with open(self.path / EPOCH_META) as f:
+            meta = json.load(f)
+        self.n_et = meta["n_et"]
+        self.ets = None if meta["ets"] is None else np.array(meta["ets"], dtype=np.float64)
+        self.spkids = np.load(self.path / "spkids.npy")
+
+    def __len__(self):
+        return len(self.spkids)
+
+    def _rows(self, spkids):
+        if spkids is None:
+            return None
+        spkids = np.asarray(spkids, dtype=np.int64)
+        rows = np.clip(np.searchsorted(self.spkids, spkids), 0, len(self.spkids) - 1)
+        if not np.all(self.spkids[rows] == spkids):
+            raise KeyError(f"Not in the CLUT: {spkids[self.spkids[rows] != spkids].tolist()}")
+        return rows
+
+    def at(self, k, spkids=None):
+        """Positions at the `k`-th epoch.
+
+        Parameters
+        ----------
+        k : int
+            Index of the epoch.
+
+        spkids : array-like of int, optional
+            If given, only these objects (in this order).
+
+        Returns
+        -------
+        pos : np.ndarray
+            The float32 positions of shape ``(N_obj, 3)`` (in the order of
+            `spkids`, sorted by spkid by default).
+        """
+        if not 0 <= k < self.n_et:
+            raise IndexError(f"Epoch index {k} out of range (0..{self.n_et - 1}).")
+        pos = np.load(_epoch_path(self.path, k), mmap_mode="r" if self.mmap else None)
+        rows = self._rows(spkids)
+        return pos if rows is None else pos[rows]
+
+    def interp(self, et, spkids=None):
+        """Linearly interpolated positions at an epoch.
+
+        Parameters
+        ----------
+        et : float
+            The epoch (ET) within the CLUT epochs.
+
+        spkids : array-like of int, optional
+            See `at`.
+
+        Returns
+        -------
+        pos : np.ndarray
+            The float32 positions of shape ``(N_obj, 3)``.
+        """
+        if self.ets is None:
+            raise ValueError("The epochs (ET) of the CLUT are unknown (see `ets` of `transpose_clut`).")
+        if not self.ets[0] <= et <= self.ets[-1]:
+            raise ValueError("`et` must be within the CLUT epochs.")
+        exact = np.flatnonzero(self.ets == et)  # incl. a CLUT of a single epoch
+        if len(exact):
+            return self.at(int(exact[0]), spkids)
+        i1 = int(np.clip(np.searchsorted(self.ets, et, side="right"), 1, self.n_et - 1))
+        w = np.float32((et - self.ets[i1 - 1])/(self.ets[i1] - self.ets[i1 - 1]))
+        return (1 - w)*self.at(i1 - 1, spkids) + w*self.at(i1, spkids)
@@ -1,6 +1,9 @@
 import spiceypy as sp
 
 
+__all__ = ['AU2KM', 'KM2AU', 'D2R', 'R2D']
+
+
 # Some constants that will be widely used.
 # Use SPICE's convert for exact compatibility.
 # For AU: sp.convrt(1.0, 'AU', 'KM') is  149597870.6136889
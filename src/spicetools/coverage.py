@@ -0,0 +1,156 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import spiceypy as sp
+
+
+__all__ = ["spk_coverage", "build_coverage", "coverage_mask", "uncovered"]
+
+
+# The coverage index is a DataFrame with one row per coverage window of each
+# object: ``"spkid"`` (int64), ``"et_start"`` and ``"et_stop"`` (float64, ET).
+# It is small (~ 24 bytes per object) and can be saved by ``df.to_parquet``.
+COVERAGE_COLUMNS = ["spkid", "et_start", "et_stop"]
+
+
+def spk_coverage(path, spkids=None):
+    """Coverage windows of the objects in an SPK file.
+
+    Only the DAF segment summaries are read (``spkobj``/``spkcov``); the file
+    is not loaded into the kernel pool.
+
+    Parameters
+    ----------
+    path : str, path-like
+        Path to the SPK file.
+
+    spkids : array-like of int, optional
+        Objects to check. Default is all objects in the file.
+
+    Returns
+    -------
+    coverage : dict
+        ``{spkid: windows}``, where ``windows`` is the ``(N_window, 2)``
+        array of the start and stop epochs (ET) of each window.
+
+    Raises
+    ------
+    spiceypy.exceptions.SpiceyError
+        If the file is not a valid SPK file.
+    """
+    path = str(path)
+    if spkids is None:
+        spkids = sp.spkobj(path)
+    coverage = {}
+    for spkid in spkids:
+        cover = sp.spkcov(path, int(spkid))
+        coverage[int(spkid)] = np.array(
+            [sp.wnfetd(cover, i) for i in range(sp.wncard(cover))], dtype=np.float64
+        ).reshape(-1, 2)
+    return coverage
+
+
+def build_coverage(spkids, bsp_fmt="spk{spkid}.bsp"):
+    """Build the coverage index of objects stored in separate BSP files.
+
+    Parameters
+    ----------
+    spkids : array-like of int
+        SPKIDs of the objects.
+
+    bsp_fmt : str, optional
+        Format of the path to the BSP file of each object (see
+        `~spicetools.clut.compute_clut`). Default is ``"spk{spkid}.bsp"``.
+
+    Returns
+    -------
+    coverage : pd.DataFrame
+        The coverage index with the columns ``"spkid"``, ``"et_start"``, and
+        ``"et_stop"`` (one row per window). Objects without a (valid) BSP
+        file or not found in their file have no rows.
+    """
+    rows = []
+    for spkid in spkids:
+        fpath = Path(bsp_fmt.format(spkid=spkid))
+        if not fpath.exists():
+            continue
+        try:
+            windows = spk_coverage(fpath, [spkid])[int(spkid)]
+        except sp.exceptions.SpiceyError:
+            sp.reset()
+            continue
+        rows.extend((int(spkid), t0, t1) for t0, t1 in windows)
+    return pd.DataFrame(rows, columns=COVERAGE_COLUMNS).astype(
+        {"spkid": np.int64, "et_start": np.float64, "et_stop": np.float64}
+    )
+
+
+def coverage_mask(coverage, spkids, ets):
+    """Boolean mask of the epochs covered for each object.
+
+    Parameters
+    ----------
+    coverage : pd.DataFrame
+        The coverage index (see `build_coverage`).
+
+    spkids : array-like of int
+        SPKIDs of the objects.
+
+    ets : array-like of float
+        Epochs in ET.
+
+    Returns
+    -------
+    mask : np.ndarray
+        Boolean array of shape ``(N_obj, N_et)``, `True` if the epoch is
+        within (including the boundaries of) any window of the object.
+        Objects not in `coverage` are never covered.
+    """
+    spkids = np.atleast_1d(np.asarray(spkids, dtype=np.int64))
+    ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+    order = np.argsort(ets, kind="stable")
+    sorted_ets = ets[order]
+
+    # Map each window to the row(s) of `spkids`:
+    uids, inverse = np.unique(spkids, return_inverse=True)
+    win_ids = coverage["spkid"].to_numpy(dtype=np.int64)
+    pos = np.clip(np.searchsorted(uids, win_ids), 0, max(len(uids) - 1, 0))
+    found = (uids[pos] == win_ids) if len(uids) else np.zeros(len(win_ids), dtype=bool)
+    i0 = np.searchsorted(sorted_ets, coverage["et_start"].to_numpy(np.float64)[found], side="left")
+    i1 = np.searchsorted(sorted_ets, coverage["et_stop"].to_numpy(np.float64)[found], side="right")
+
+    # +1 at the start and -1 at the end of each window, then cumsum:
+    delta = np.zeros((len(uids), len(ets) + 1), dtype=np.int32)
+    np.add.at(delta, (pos[found], i0), 1)
+    np.add.at(delta, (pos[found], i1), -1)
+    mask_sorted = np.cumsum(delta[:, :-1], axis=1) > 0
+    mask = np.empty_like(mask_sorted)
+    mask[:, order] = mask_sorted
+    return mask[inverse]
+
+
+def uncovered(coverage, spkids, et_start, et_stop):
+    """SPKIDs whose coverage does not include the whole time span.
+
+    Parameters
+    ----------
+    coverage : pd.DataFrame
+        The coverage index (see `build_coverage`).
+
+    spkids : array-like of int
+        SPKIDs of the objects.
+
+    et_start, et_stop : float
+        The time span in ET.
+
+    Returns
+    -------
+    spkids : np.ndarray
+        SPKIDs without a single window covering ``[et_start, et_stop]``
+        (including objects without a BSP file), i.e., those to be
+        (re-)downloaded.
+    """
+    spkids = np.atleast_1d(np.asarray(spkids, dtype=np.int64))
+    full = (coverage["et_start"] <= et_start) & (coverage["et_stop"] >= et_stop)
+    return spkids[~np.isin(spkids, coverage.loc[full, "spkid"].to_numpy(dtype=np.int64))]
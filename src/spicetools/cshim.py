@@ -0,0 +1,192 @@
+import ctypes
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import spiceypy as sp
+
+from . import fastfunc
+from .instrument import INSTRUMENT
+from .typeutil import intern_char_p
+
+
+# ``spkgps_batch`` and ``spkcvo_batch`` are also public, but not in __all__ so
+# that they do not shadow the `fastfunc` ones in ``spicetools``.
+__all__ = ["build_shim", "load_shim", "shim_available"]
+
+
+SHIM_SOURCE = Path(__file__).resolve().parent / "csrc" / "spkloop.c"
+
+# None: not tried yet, False: unavailable (build/load failed)
+_SHIM = None
+
+
+def _cache_dir():
+    return Path(os.environ.get("SPICETOOLS_CACHE", Path.home() / ".cache" / "spicetools"))
+
+
+def _shim_path():
+    """Path of the compiled shim, unique for the source and the CSPICE library."""
+    h = hashlib.sha256(SHIM_SOURCE.read_bytes())
+    h.update(str(sp.libspice._name).encode())
+    h.update(sys.platform.encode())
+    suffix = ".dylib" if sys.platform == "darwin" else ".so"
+    return _cache_dir() / f"spkloop_{h.hexdigest()[:16]}{suffix}"
+
+
+def build_shim(force=False, cc=None):
+    """Compile the C shim against the CSPICE library of spiceypy.
+
+    Parameters
+    ----------
+    force : bool, optional
+        If `True`, recompile even if the shim already exists.
+
+    cc : str, optional
+        The C compiler. Default is ``$CC`` or ``cc``.
+
+    Returns
+    -------
+    path : Path
+        Path to the compiled shared library (under ``$SPICETOOLS_CACHE``,
+        default ``~/.cache/spicetools``).
+
+    Raises
+    ------
+    RuntimeError
+        If no compiler is found or the compilation fails.
+    """
+    path = _shim_path()
+    if path.exists() and not force:
+        return path
+    cc = cc or os.environ.get("CC", "cc")
+    if shutil.which(cc) is None:
+        raise RuntimeError(f"C compiler {cc!r} not found.")
+    libspice = Path(sp.libspice._name).resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    cmd = [cc, "-O2", "-shared", "-fPIC", "-o", str(tmp), str(SHIM_SOURCE), str(libspice),
+           f"-Wl,-rpath,{libspice.parent}", "-lm"]
+    res = subprocess.run(cmd, capture_output=True, text=True)
+    if res.returncode != 0:
+        raise RuntimeError(f"Failed to compile the shim:\n{' '.join(cmd)}\n{res.stderr}")
+    os.replace(tmp, path)  # atomic, safe for concurrent builds
+    return path
+
+
+def load_shim(build=True):
+    """Load (and build if needed) the C shim.
+
+    Parameters
+    ----------
+    build : bool, optional
+        If `True` (default), compile the shim if it is not built yet.
+
+    Returns
+    -------
+    shim : ctypes.CDLL or None
+        The loaded shim, or `None` if it is unavailable (e.g., no C compiler).
+        The result is cached for the process.
+    """
+    global _SHIM
+    if _SHIM is None:
+        try:
+            path = build_shim() if build else _shim_path()
+            # ctypes.CDLL (not PyDLL) releases the GIL during the calls.
+            shim = ctypes.CDLL(str(path))
+        except (OSError, RuntimeError):
+            if not build:
+                return None  # may be built later
+            _SHIM = False
+        else:
+            shim.spkgps_loop.restype = ctypes.c_long
+            shim.spkcvo_loop.restype = ctypes.c_long
+            _SHIM = shim
+    return _SHIM or None
+
+
+def shim_available():
+    """`True` if the C shim can be used (building it if needed)."""
+    return load_shim() is not None
+
+
+def _ptr(arr, ctype=ctypes.c_double):
+    return arr.ctypes.data_as(ctypes.POINTER(ctype))
+
+
+def _prepare_out(out, n_targ, n_et, n):
+    if out is None:
+        return np.empty((n_targ, n_et, n))
+    if out.shape != (n_targ, n_et, n) or out.dtype != np.float64 or not out.flags.c_contiguous:
+        raise ValueError(f"`out` must be a C-contiguous float64 array of shape (N_targ, N_et, {n}).")
+    return out
+
+
+def _prepare_covered(covered, n_targ, n_et):
+    if covered is None:
+        return None
+    return np.ascontiguousarray(np.broadcast_to(covered, (n_targ, n_et)), dtype=np.uint8)
+
+
+def spkgps_batch(targs, ets, ref: str, obs: int, out=None, covered=None):
+    """`~spicetools.fastfunc.spkgps_batch` with the loops in C.
+
+    The parameters and returns are identical to
+    `~spicetools.fastfunc.spkgps_batch`, which is used if the C shim is
+    unavailable. The GIL is released during the loops, but note CSPICE is
+    not thread-safe: other threads must not call SPICE meanwhile.
+    """
+    shim = load_shim()
+    if shim is None:
+        return fastfunc.spkgps_batch(targs, ets, ref, obs, out=out, covered=covered)
+
+    targs = np.ascontiguousarray(np.atleast_1d(targs), dtype=np.int32)
+    ets = np.ascontiguousarray(np.atleast_1d(ets), dtype=np.float64)
+    n_targ, n_et = len(targs), len(ets)
+    out = _prepare_out(out, n_targ, n_et, 3)
+    covered = _prepare_covered(covered, n_targ, n_et)
+    failed = np.zeros(n_targ, dtype=np.uint8)
+    with INSTRUMENT.timer("cshim.spkgps_batch"):
+        n_call = shim.spkgps_loop(
+            n_targ, _ptr(targs, ctypes.c_int), n_et, _ptr(ets), intern_char_p(ref), int(obs),
+            None if covered is None else _ptr(covered, ctypes.c_ubyte), _ptr(out),
+            _ptr(failed, ctypes.c_ubyte)
+        )
+    INSTRUMENT.count("fastfunc.spkgps_c", n_call)
+    INSTRUMENT.count("fastfunc.failed_targets", int(failed.sum()))
+    return out
+
+
+def spkcvo_batch(targets, ets, obsstas, outref: str, refloc: str, abcorr: str,
+                 obsctr: str, obsref: str, out=None, covered=None):
+    """`~spicetools.fastfunc.spkcvo_batch` with the loops in C.
+
+    See `spkgps_batch` for the notes.
+    """
+    shim = load_shim()
+    if shim is None:
+        return fastfunc.spkcvo_batch(targets, ets, obsstas, outref, refloc, abcorr, obsctr,
+                                     obsref, out=out, covered=covered)
+
+    targets = np.atleast_1d(targets).tolist()
+    ets = np.ascontiguousarray(np.atleast_1d(ets), dtype=np.float64)
+    n_targ, n_et = len(targets), len(ets)
+    obsstas = np.ascontiguousarray(np.broadcast_to(obsstas, (n_et, 6)), dtype=np.float64)
+    out = _prepare_out(out, n_targ, n_et, 6)
+    covered = _prepare_covered(covered, n_targ, n_et)
+    failed = np.zeros(n_targ, dtype=np.uint8)
+    _targets = (ctypes.c_char_p*n_targ)(*[intern_char_p(t).value for t in targets])
+    with INSTRUMENT.timer("cshim.spkcvo_batch"):
+        n_call = shim.spkcvo_loop(
+            n_targ, _targets, n_et, _ptr(ets), _ptr(obsstas), intern_char_p(outref),
+            intern_char_p(refloc), intern_char_p(abcorr), intern_char_p(obsctr),
+            intern_char_p(obsref), None if covered is None else _ptr(covered, ctypes.c_ubyte),
+            _ptr(out), _ptr(failed, ctypes.c_ubyte)
+        )
+    INSTRUMENT.count("fastfunc.spkcvo_c", n_call)
+    INSTRUMENT.count("fastfunc.failed_targets", int(failed.sum()))
+    return out
@@ -0,0 +1,96 @@
+/*
+ * Loops of spkgps_c/spkcvo_c over many targets and epochs, compiled against
+ * the CSPICE shared library shipped with spiceypy (see spicetools/cshim.py).
+ *
+ * The prototypes are declared here (instead of including SpiceUsr.h, which
+ * spiceypy does not ship) with the types spiceypy uses for its ctypes calls.
+ * As in spicetools.fastfunc.spkgps_batch, a target with any SPICE error has
+ * NaN at all epochs, and epochs not `covered` (if given) are NaN.
+ */
+#include <math.h>
+#include <stddef.h>
+
+typedef int SpiceInt;
+typedef int SpiceBoolean;
+typedef double SpiceDouble;
+typedef char SpiceChar;
+
+extern void spkgps_c(SpiceInt targ, SpiceDouble et, const SpiceChar *ref, SpiceInt obs,
+                     SpiceDouble pos[3], SpiceDouble *lt);
+extern void spkcvo_c(const SpiceChar *target, SpiceDouble et, const SpiceChar *outref,
+                     const SpiceChar *refloc, const SpiceChar *abcorr,
+                     const SpiceDouble obssta[6], SpiceDouble obsepc,
+                     const SpiceChar *obsctr, const SpiceChar *obsref,
+                     SpiceDouble state[6], SpiceDouble *lt);
+extern SpiceBoolean failed_c(void);
+extern void reset_c(void);
+
+static void fill_nan(double *row, size_t n)
+{
+    for (size_t k = 0; k < n; k++) {
+        row[k] = NAN;
+    }
+}
+
+/* out: (ntarg, net, 3); covered: (ntarg, net) or NULL; failed: (ntarg,)
+ * Returns the number of spkgps_c calls. */
+long spkgps_loop(int ntarg, const int *targs, int net, const double *ets,
+                 const char *ref, int obs, const unsigned char *covered,
+                 double *out, unsigned char *failed)
+{
+    double lt;
+    long ncall = 0;
+    if (failed_c()) {
+        reset_c();
+    }
+    for (int i = 0; i < ntarg; i++) {
+        double *row = out + (size_t)i*net*3;
+        const unsigned char *cov = covered ? covered + (size_t)i*net : NULL;
+        for (int j = 0; j < net; j++) {
+            if (cov && !cov[j]) {
+                fill_nan(row + 3*j, 3);
+                continue;
+            }
+            spkgps_c(targs[i], ets[j], ref, obs, row + 3*j, &lt);
+            ncall++;
+        }
+        failed[i] = (unsigned char)failed_c();
+        if (failed[i]) {
+            reset_c();
+            fill_nan(row, (size_t)net*3);
+        }
+    }
+    return ncall;
+}
+
+/* targets: (ntarg,) names; obsstas: (net, 6); out: (ntarg, net, 6) */
+long spkcvo_loop(int ntarg, const char **targets, int net, const double *ets,
+                 const double *obsstas, const char *outref, const char *refloc,
+                 const char *abcorr, const char *obsctr, const char *obsref,
+                 const unsigned char *covered, double *out, unsigned char *failed)
+{
+    double lt;
+    long ncall = 0;
+    if (failed_c()) {
+        reset_c();
+    }
+    for (int i = 0; i < ntarg; i++) {
+        double *row = out + (size_t)i*net*6;
+        const unsigned char *cov = covered ? covered + (size_t)i*net : NULL;
+        for (int j = 0; j < net; j++) {
+            if (cov && !cov[j]) {
+                fill_nan(row + 6*j, 6);
+                continue;
+            }
+            spkcvo_c(targets[i], ets[j], outref, refloc, abcorr, obsstas + 6*j, ets[j],
+                     obsctr, obsref, row + 6*j, &lt);
+            ncall++;
+        }
+        failed[i] = (unsigned char)failed_c();
+        if (failed[i]) {
+            reset_c();
+            fill_nan(row, (size_t)net*6);
+        }
+    }
+    return ncall;
+}
@@ -0,0 +1,202 @@
+from pathlib import Path
+
+import numpy as np
+import spiceypy as sp
+
+from .cshim import spkgps_batch
+from .frames import rotate
+from .instrument import INSTRUMENT
+
+
+__all__ = ["TIERS", "clut_error_bound", "positions"]
+
+
+# Position backends from the cheapest: index = the tier code in `positions`
+# (-1: no backend could compute it).
+TIERS = ("clut", "spice")
+
+# Relative rounding error of the float32 CLUT positions (half ulp, 3 axes):
+_F32_REL_ERR = np.sqrt(3)*2.0**-24
+
+# Margin on the interpolation error estimated from the CLUT second differences:
+_SAFETY = 2.0
+
+
+def clut_error_bound(clut_pos, clut_ets, ets, clut_error=None):
+    """Estimated error (km) of the linear interpolation of CLUT positions.
+
+    For an epoch in ``[t_i, t_i+1]``, the interpolation error is at most
+    ``(t - t_i)(t_i+1 - t)/2 * max|x''|``, where ``x''`` is estimated from
+    the second differences of the CLUT samples at ``t_i`` and ``t_i+1``
+    (with a safety factor of 2). The float32 rounding of the positions is
+    added.
+
+    Parameters
+    ----------
+    clut_pos : np.ndarray
+        The ``(N_obj, N_clut, 3)`` CLUT positions (``N_clut >= 3``).
+
+    clut_ets : array-like of float
+        The (sorted) epochs of the CLUT in ET.
+
+    ets : array-like of float
+        The epochs to interpolate at.
+
+    clut_error : array-like of float, optional
+        Additional error of each object's CLUT positions (km), e.g.,
+        `~spicetools.clutcodec.CompactCLUT.max_error` for decoded positions.
+
+    Returns
+    -------
+    bound : np.ndarray
+        The ``(N_obj, N_et)`` error estimates. `np.inf` out of the CLUT
+        epochs or where the CLUT has `np.nan`.
+    """
+    clut_ets = np.asarray(clut_ets, dtype=np.float64)
+    ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+    pos = np.asarray(clut_pos, dtype=np.float64)
+    # |second difference| at each CLUT sample (edges: the nearest inner one)
+    dd = np.linalg.norm(pos[:, :-2] - 2*pos[:, 1:-1] + pos[:, 2:], axis=-1)
+    dd = np.concatenate([dd[:, :1], dd, dd[:, -1:]], axis=1)
+    h = np.diff(clut_ets)
+    h_mid = np.concatenate([h[:1], 0.5*(h[:-1] + h[1:]), h[-1:]])
+    acc = dd/h_mid**2  # ~ |x''| at each sample
+
+    i1 = np.clip(np.searchsorted(clut_ets, ets, side="right"), 1, len(clut_ets) - 1)
+    i0 = i1 - 1
+    span = (ets - clut_ets[i0])*(clut_ets[i1] - ets)/2  # >= 0 within the interval
+    bound = _SAFETY*span*np.maximum(acc[:, i0], acc[:, i1])
+    bound += _F32_REL_ERR*np.maximum(np.linalg.norm(pos[:, i0], axis=-1),
+                                     np.linalg.norm(pos[:, i1], axis=-1))
+    if clut_error is not None:
+        bound += np.asarray(clut_error, dtype=np.float64)[:, None]
+    outside = (ets < clut_ets[0]) | (ets > clut_ets[-1])
+    bound[:, outside] = np.inf
+    return np.where(np.isnan(bound), np.inf, bound)
+
+
+def positions(spkids, ets, obs=399, ref="ECLIPJ2000", tol_km=1000.0, clut_spkids=None, clut_pos=None,
+              clut_ets=None, clut_obs=399, clut_ref="ECLIPJ2000", clut_error=None, bsp_fmt=None):
+    """Positions from the cheapest backend meeting the tolerance.
+
+    For each object and epoch, the CLUT (linear interpolation) is used if
+    its estimated error (`clut_error_bound`) is within `tol_km`; the rest
+    is computed by SPICE (``spkgps``, only at those epochs).
+
+    Parameters
+    ----------
+    spkids : array-like of int
+        SPKIDs of the objects.
+
+    ets : array-like of float
+        Epochs in ET.
+
+    obs : int, optional
+        Observer SPKID. Default is ``399`` (geocenter).
+
+    ref : str, optional
+        Reference frame of the output. Default is ``"ECLIPJ2000"``.
+
+    tol_km : float, optional
+        Tolerance of the position error (km). Default is 1000 km.
+
+    clut_spkids, clut_pos, clut_ets, clut_ref :
+        The CLUT (see `~spicetools.plut.screen_pointings`). If not given, or
+        for the objects not in it, SPICE is used.
+
+    clut_obs : int, optional
+        The observer of the CLUT positions. The CLUT is used only if it is
+        the same as `obs`. Default is ``399``.
+
+    clut_error : array-like of float, optional
+        Additional error of the CLUT positions of each object (km) (see
+        `clut_error_bound`).
+
+    bsp_fmt : str, optional
+        If given, the BSP file of each object computed by SPICE is loaded
+        only when needed, from ``bsp_fmt.format(spkid=spkid)`` (see
+        `~spicetools.clut.compute_clut`). Otherwise, the kernels must be
+        loaded.
+
+    Returns
+    -------
+    pos : np.ndarray
+        Positions (km) of shape ``(N_obj, N_et, 3)``; `np.nan` where no
+        backend could compute it.
+
+    tiers : np.ndarray
+        The int8 ``(N_obj, N_et)`` index of the backend in `TIERS` used for
+        each position (``-1`` for `np.nan`).
+
+    stats : dict
+        The number of positions computed by each backend (`TIERS`) and
+        ``"failed"``. Also counted in `~spicetools.instrument.INSTRUMENT`
+        as ``"dispatch.<tier>"``.
+    """
+    spkids = np.atleast_1d(np.asarray(spkids, dtype=np.int64))
+    ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+    n_obj, n_et = len(spkids), len(ets)
+    pos = np.full((n_obj, n_et, 3), np.nan)
+    tiers = np.full((n_obj, n_et), -1, dtype=np.int8)
+
+    if clut_pos is not None and clut_obs == obs:
+        with INSTRUMENT.timer("dispatch.clut"):
+            _clut_tier(spkids, ets, ref, tol_km, np.asarray(clut_spkids), clut_pos, clut_ets, clut_ref,
+                       clut_error, pos, tiers)
+
+    with INSTRUMENT.timer("dispatch.spice"):
+        _spice_tier(spkids, ets, ref, obs, bsp_fmt, pos, tiers)
+
+    stats = {tier: int(np.count_nonzero(tiers == i)) for i, tier in enumerate(TIERS)}
+    stats["failed"] = int(np.count_nonzero(tiers < 0))
+    for key, n in stats.items():
+        INSTRUMENT.count(f"dispatch.{key}", n)
+    return pos, tiers, stats
+
+
+def _clut_tier(spkids, ets, ref, tol_km, clut_spkids, clut_pos, clut_ets, clut_ref, clut_error, pos,
+               tiers):
+    """Fill the positions whose CLUT interpolation error is within `tol_km`."""
+    idx = np.flatnonzero(np.isin(spkids, clut_spkids))
+    if not len(idx):
+        return
+    order = np.argsort(clut_spkids)
+    rows = order[np.searchsorted(clut_spkids, spkids[idx], sorter=order)]
+    sub = np.asarray(clut_pos)[rows]
+    clut_ets = np.asarray(clut_ets, dtype=np.float64)
+    err = None if clut_error is None else np.asarray(clut_error)[rows]
+    use = clut_error_bound(sub, clut_ets, ets, clut_error=err) <= tol_km
+    if not use.any():
+        return
+    i1 = np.clip(np.searchsorted(clut_ets, ets, side="right"), 1, len(clut_ets) - 1)
+    i0 = i1 - 1
+    w = ((ets - clut_ets[i0])/(clut_ets[i1] - clut_ets[i0]))[None, :, None]
+    interp = (1 - w)*sub[:, i0] + w*sub[:, i1]
+    if clut_ref.upper() != ref.upper():
+        interp = rotate(interp, clut_ref, ref, ets=ets[None, :])  # (non-)inertial frames
+    pos[idx[:, None], np.arange(len(ets))[None, :]] = np.where(use[..., None], interp, np.nan)
+    tiers[idx] = np.where(use, 0, -1)
+
+
+def _spice_tier(spkids, ets, ref, obs, bsp_fmt, pos, tiers):
+    """Compute the remaining positions by SPICE (only the epochs needed)."""
+    todo = tiers < 0
+    _buf = np.empty((1, len(ets), 3))
+    for i in np.flatnonzero(todo.any(axis=1)):
+        handle = None
+        if bsp_fmt is not None:
+            fpath = Path(bsp_fmt.format(spkid=spkids[i]))
+            if not fpath.exists():
+                continue
+            try:
+                with INSTRUMENT.timer("kernel.load"):
+                    handle = sp.spklef(str(fpath))
+            except sp.exceptions.SpiceyError:
+                continue
+        spkgps_batch(int(spkids[i]), ets, ref, obs, out=_buf, covered=todo[i:i + 1])
+        if handle is not None:
+            with INSTRUMENT.timer("kernel.unload"):
+                sp.spkuef(handle)
+        ok = todo[i] & ~np.isnan(_buf[0, :, 0])
+        pos[i, ok] = _buf[0, ok]
+        tiers[i, ok] = 1
@@ -0,0 +1,313 @@
+import numpy as np
+
+from .constants import R2D
+from .fastfunc import spkgps_batch
+
+
+__all__ = [
+    "EVENT_DTYPE", "bracket_minima", "bracket_crossings", "refine_minima", "refine_crossings",
+    "distance_func", "elongation_func", "find_minima", "find_crossings",
+]
+
+
+EVENT_DTYPE = np.dtype([("spkid", np.int64), ("et", np.float64), ("value", np.float64),
+                        ("direction", np.int8)])
+
+_GOLDEN = (np.sqrt(5) - 1)/2  # 0.618...
+
+
+def bracket_minima(values):
+    """Find the local minima of sampled tracks for all objects at once.
+
+    Parameters
+    ----------
+    values : array-like
+        Values (e.g., distances) of shape ``(N_obj, N_et)`` sampled at common
+        epochs. `np.nan` values never form a bracket.
+
+    Returns
+    -------
+    iobj, iet : np.ndarray
+        Indices of the objects and epochs, such that the true minimum is
+        bracketed by ``[ets[iet - 1], ets[iet + 1]]``. Minima at the first or
+        last epoch are not bracketed, thus not returned.
+    """
+    values = np.atleast_2d(values)
+    v0, v1, v2 = values[:, :-2], values[:, 1:-1], values[:, 2:]
+    iobj, iet = np.nonzero((v1 < v0) & (v1 <= v2))
+    return iobj, iet + 1
+
+
+def bracket_crossings(values, threshold):
+    """Find where sampled tracks cross a threshold for all objects at once.
+
+    Parameters
+    ----------
+    values : array-like
+        Values of shape ``(N_obj, N_et)`` sampled at common epochs.
+
+    threshold : float or array-like
+        The threshold, a scalar or broadcastable to ``(N_obj, 1)``.
+
+    Returns
+    -------
+    iobj, iet : np.ndarray
+        Indices of the objects and epochs, such that the crossing is
+        bracketed by ``[ets[iet], ets[iet + 1]]``.
+
+    direction : np.ndarray
+        ``+1`` if the value rises above `threshold`, ``-1`` if it falls below.
+    """
+    above = np.atleast_2d(values) > threshold
+    iobj, iet = np.nonzero(above[:, :-1] != above[:, 1:])
+    direction = np.where(above[iobj, iet + 1], 1, -1).astype(np.int8)
+    return iobj, iet, direction
+
+
+def refine_minima(func, iobj, lo, hi, tol=1.0, maxiter=100):
+    """Golden-section search of many bracketed minima simultaneously.
+
+    Parameters
+    ----------
+    func : callable
+        ``func(iobj, ets)`` returns the values of objects `iobj` at epochs
+        `ets` (both 1-D arrays of the same length), e.g., `distance_func`.
+        It is called once per iteration for all unconverged windows.
+
+    iobj : array-like of int
+        Object index of each window.
+
+    lo, hi : array-like of float
+        Lower and upper bounds (ET) of each window.
+
+    tol : float, optional
+        Tolerance in seconds. Default is 1 second.
+
+    maxiter : int, optional
+        Maximum number of iterations.
+
+    Returns
+    -------
+    et, value : np.ndarray
+        The epochs and values of the minima.
+    """
+    iobj = np.atleast_1d(iobj)
+    a = np.array(lo, dtype=np.float64, ndmin=1)
+    b = np.array(hi, dtype=np.float64, ndmin=1)
+    if len(a) == 0:
+        return a, a.copy()
+    c = b - _GOLDEN*(b - a)
+    d = a + _GOLDEN*(b - a)
+    fc = np.asarray(func(iobj, c), dtype=np.float64)
+    fd = np.asarray(func(iobj, d), dtype=np.float64)
+    for _ in range(maxiter):
+        todo = (b - a) > tol
+        if not np.any(todo):
+            break
+        left = todo & (fc < fd)  # minimum in [a, d]
+        right = todo & ~left     # minimum in [c, b]
+        b[left] = d[left]
+        a[right] = c[right]
+        d[left], fd[left] = c[left], fc[left]
+        c[right], fc[right] = d[right], fd[right]
+        c[left] = b[left] - _GOLDEN*(b[left] - a[left])
+        d[right] = a[right] + _GOLDEN*(b[right] - a[right])
+        # Only one new evaluation per window:
+        x = np.where(left, c, d)[todo]
+        fx = np.asarray(func(iobj[todo], x), dtype=np.float64)
+        _fc, _fd = fc[todo], fd[todo]
+        _left = left[todo]
+        _fc[_left] = fx[_left]
+        _fd[~_left] = fx[~_left]
+        fc[todo], fd[todo] = _fc, _fd
+
+    et = np.where(fc < fd, c, d)
+    return et, np.minimum(fc, fd)
+
+
+def refine_crossings(func, iobj, lo, hi, threshold, tol=1.0, maxiter=100):
+    """Bisection of many bracketed threshold crossings simultaneously.
+
+    Parameters
+    ----------
+    func, iobj, lo, hi, tol, maxiter :
+        See `refine_minima`.
+
+    threshold : float or array-like
+        The threshold (scalar or one per window).
+
+    Returns
+    -------
+    et, value : np.ndarray
+        The epochs and values at the crossings.
+    """
+    iobj = np.atleast_1d(iobj)
+    a = np.array(lo, dtype=np.float64, ndmin=1)
+    b = np.array(hi, dtype=np.float64, ndmin=1)
+    threshold = np.broadcast_to(threshold, a.shape)
+    if len(a) == 0:
+        return a, a.copy()
+    sa = np.asarray(func(iobj, a), dtype=np.float64) > threshold
+    for _ in range(maxiter):
+        todo = (b - a) > tol
+        if not np.any(todo):
+            break
+        m = 0.5*(a[todo] + b[todo])
+        sm = np.asarray(func(iobj[todo], m), dtype=np.float64) > threshold[todo]
+        same = sm == sa[todo]  # crossing is in [m, b]
+        _a, _b = a[todo], b[todo]
+        _a[same] = m[same]
+        _b[~same] = m[~same]
+        a[todo], b[todo] = _a, _b
+    et = 0.5*(a + b)
+    return et, np.asarray(func(iobj, et), dtype=np.float64)
+
+
+def _spkgps_pairs(targs, ets, ref, obs):
+    """Positions of ``(targs[i], ets[i])`` pairs (`np.nan` if SPICE fails).
+
+    Each target is computed by one `~spicetools.fastfunc.spkgps_batch` call,
+    which resets the CSPICE error status on failure. If it fails (e.g., some
+    epochs out of coverage), its epochs are computed one by one, so that
+    only the failed pairs are `np.nan`.
+    """
+    targs = np.asarray(targs, dtype=np.int64)
+    ets = np.asarray(ets, dtype=np.float64)
+    out = np.empty((len(targs), 3))
+    order = np.argsort(targs, kind="stable")
+    uniq, counts = np.unique(targs[order], return_counts=True)
+    for targ, sel in zip(uniq.tolist(), np.split(order, np.cumsum(counts)[:-1])):
+        pos = spkgps_batch([targ], ets[sel], ref, obs)[0]
+        if len(sel) > 1 and np.isnan(pos[0, 0]):
+            pos = np.concatenate([spkgps_batch([targ], ets[i:i + 1], ref, obs)[0] for i in sel])
+        out[sel] = pos
+    return out
+
+
+def distance_func(spkids, obs, ref="J2000"):
+    """Return ``func(iobj, ets)`` of the distances from `obs` [km].
+
+    The distance is `np.nan` where SPICE fails (e.g., out of the kernel
+    coverage), so that such events have `np.nan` values.
+
+    Parameters
+    ----------
+    spkids : array-like of int
+        SPKIDs of the objects (``iobj`` indexes this array).
+
+    obs : int
+        Observer SPKID (e.g., ``399`` for close approaches to the geocenter,
+        ``10`` for perihelion passages, or a spacecraft ID).
+
+    ref : str, optional
+        Reference frame (irrelevant for distance). Default is ``"J2000"``.
+    """
+    spkids = np.asarray(spkids)
+
+    def func(iobj, ets):
+        return np.linalg.norm(_spkgps_pairs(spkids[iobj], ets, ref, obs), axis=1)
+
+    return func
+
+
+def elongation_func(spkids, obs, ref="J2000"):
+    """Return ``func(iobj, ets)`` of the solar elongations seen from `obs` [deg].
+
+    Minima of the elongation are the (solar) conjunctions. The Sun position
+    is computed only once for each unique epoch.
+
+    Parameters
+    ----------
+    spkids, obs, ref :
+        See `distance_func`.
+    """
+    spkids = np.asarray(spkids)
+
+    def func(iobj, ets):
+        ets = np.asarray(ets, dtype=np.float64)
+        pos = _spkgps_pairs(spkids[iobj], ets, ref, obs)
+        uets, inverse = np.unique(ets, return_inverse=True)
+        sun = _spkgps_pairs(np.full(len(uets), 10), uets, ref, obs)[inverse]
+        cross = np.linalg.norm(np.cross(pos, sun), axis=1)
+        return np.arctan2(cross, np.sum(pos*sun, axis=1))*R2D
+
+    return func
+
+
+def _to_events(spkids, iobj, et, value, direction):
+    res = np.empty(len(et), dtype=EVENT_DTYPE)
+    res["spkid"] = np.asarray(spkids)[iobj]
+    res["et"] = et
+    res["value"] = value
+    res["direction"] = direction
+    return np.sort(res, order=["spkid", "et"])
+
+
+def find_minima(spkids, ets, values, func, max_value=None, tol=1.0):
+    """Find minima (close approaches, perihelia, conjunctions) of objects.
+
+    The coarse tracks (e.g., CLUT distances) are scanned for all objects at
+    once, and only the bracketed windows are refined by `func` (e.g.,
+    ``fastfunc`` calls).
+
+    Parameters
+    ----------
+    spkids : array-like of int
+        SPKIDs of the objects.
+
+    ets : array-like of float
+        The (sorted) coarse epochs in ET.
+
+    values : array-like
+        Coarse values of shape ``(N_obj, N_et)``, e.g.,
+        ``np.linalg.norm(pos, axis=-1)`` of CLUT positions.
+
+    func : callable
+        ``func(iobj, ets)`` for the refinement, e.g., `distance_func` or
+        `elongation_func`.
+
+    max_value : float, optional
+        If given, only minima whose coarse value is smaller than this are
+        refined. Note the true minimum can be slightly smaller than the coarse
+        one, so a small margin is recommended.
+
+    tol : float, optional
+        Tolerance of the epochs in seconds.
+
+    Returns
+    -------
+    events : np.ndarray
+        Structured array of `EVENT_DTYPE` (``direction`` is always 0), sorted
+        by spkid and epoch.
+    """
+    ets = np.asarray(ets, dtype=np.float64)
+    values = np.atleast_2d(values)
+    iobj, iet = bracket_minima(values)
+    if max_value is not None:
+        keep = values[iobj, iet] < max_value
+        iobj, iet = iobj[keep], iet[keep]
+    et, value = refine_minima(func, iobj, ets[iet - 1], ets[iet + 1], tol=tol)
+    return _to_events(spkids, iobj, et, value, 0)
+
+
+def find_crossings(spkids, ets, values, threshold, func, tol=1.0):
+    """Find where the values of objects cross the threshold.
+
+    Parameters
+    ----------
+    spkids, ets, values, func, tol :
+        See `find_minima`.
+
+    threshold : float
+        The threshold (e.g., distance of the Hill sphere for entry/exit).
+
+    Returns
+    -------
+    events : np.ndarray
+        Structured array of `EVENT_DTYPE` (``direction`` is ``+1`` when the
+        value rises above the threshold), sorted by spkid and epoch.
+    """
+    ets = np.asarray(ets, dtype=np.float64)
+    iobj, iet, direction = bracket_crossings(values, threshold)
+    et, value = refine_crossings(func, iobj, ets[iet], ets[iet + 1], threshold, tol=tol)
+    return _to_events(spkids, iobj, et, value, direction)
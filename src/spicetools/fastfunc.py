@@ -3,10 +3,11 @@ import ctypes
 import numpy as np
 import spiceypy as sp
 
-from .typeutil import empty_double_vector, str2char_p
+from .instrument import INSTRUMENT
+from .typeutil import box_doubles, box_ints, empty_double_vector, intern_char_p, str2char_p
 
 
-__all__ = ['spkgps', 'spkcvo']
+__all__ = ['spkgps', 'spkcvo', 'spkgps_batch', 'spkcvo_batch']
 
 
 def spkgps(ref: str, obs: int, dummy_lt: bool = True):
@@ -24,7 +25,8 @@ def spkgps(ref: str, obs: int, dummy_lt: bool = True):
     -------
     spkgps_boosted : function
         Boosted spkgps function. Input arguments are `targ` and `et` ::
-        - `targ` :  must be prepared by ``ctypes.c_int(int(spkid))``
+        - `targ` :  must be prepared by ``ctypes.c_int(int(spkid))`` (use
+            `typeutil.box_ints` for many targets).
         - `et` : must be prepared by ``ctypes.c_double(et)`` (use
             `timeutil.times2et` with ``return_c=True``).
     """
@@ -72,7 +74,8 @@ def spkcvo(outref: str, refloc: str, abcorr: str, obsctr: str, obsref: str, dumm
     spkcvo_boosted : function
         Boosted spkcvo function. Input arguments are `target`, `obssta`, and
         `et`::
-        - `target` must be prepared by ``str2char_p(str(spkid))``
+        - `target` must be prepared by ``str2char_p(str(spkid))`` (or the
+            cached `typeutil.intern_char_p`).
         - `obssta` must be prepared by ``sp.stypes.to_double_vector(state)``
         - `et` must be prepared by `ctypes.c_double(et)` (use
             `timeutil.times2et` with ``return_c=True``).
@@ -107,3 +110,176 @@ def spkcvo(outref: str, refloc: str, abcorr: str, obsctr: str, obsref: str, dumm
             return np.frombuffer(state).copy(), _lt.value
 
     return spkcvo_boosted
+
+
+def _check_failed():
+    """Return `True` and reset the error status if a CSPICE error was signaled.
+
+    Errors raised inside the raw ``sp.libspice`` calls are not converted to
+    Python exceptions: CSPICE just sets the ``failed`` flag and all the
+    following calls silently do nothing until ``reset_c`` is called.
+    """
+    if sp.libspice.failed_c():
+        sp.libspice.reset_c()
+        return True
+    return False
+
+
+def _covered_rows(covered, n_targ, n_et):
+    if covered is None:
+        return None
+    covered = np.broadcast_to(np.asarray(covered, dtype=bool), (n_targ, n_et))
+    return [np.flatnonzero(c).tolist() for c in covered]
+
+
+def spkgps_batch(targs, ets, ref: str, obs: int, out=None, covered=None):
+    """Positions of many targets at many epochs by the boosted spkgps.
+
+    Parameters
+    ----------
+    targs : int or array-like of int
+        Target SPKIDs.
+
+    ets : float or array-like of float
+        Epochs in ET.
+
+    ref : str
+        Reference frame.
+
+    obs : int
+        Observer SPKID.
+
+    out : np.ndarray, optional
+        The C-contiguous float64 array of shape ``(N_targ, N_et, 3)`` to write
+        the results into.
+
+    covered : array-like of bool, optional
+        The ``(N_targ, N_et)`` mask of the epochs covered by the kernels of
+        each target, e.g., `~spicetools.coverage.coverage_mask`. If given,
+        only the covered epochs are computed and the others are `np.nan`.
+
+    Returns
+    -------
+    pos : np.ndarray
+        The positions of shape ``(N_targ, N_et, 3)``. If any SPICE error
+        occurs for a target (e.g., no kernel loaded or epoch out of
+        coverage), the positions of the target at all epochs are `np.nan`.
+    """
+    targs = np.atleast_1d(targs)
+    ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+    n_et = len(ets)
+    if out is None:
+        out = np.empty((len(targs), n_et, 3))
+    elif out.shape != (len(targs), n_et, 3) or out.dtype != np.float64 or not out.flags.c_contiguous:
+        raise ValueError("`out` must be a C-contiguous float64 array of shape (N_targ, N_et, 3).")
+
+    _ref = intern_char_p(ref)
+    _obs = ctypes.c_int(obs)
+    _lt = ctypes.byref(ctypes.c_double())
+    _targs = box_ints(targs)
+    _ets = box_doubles(ets)  # box once for all targets
+    _row_type = ctypes.c_double*3*n_et
+    _rowsize = n_et*3*8
+    _spkgps_c = sp.libspice.spkgps_c
+    _covered = _covered_rows(covered, len(targs), n_et)
+    n_call = 0
+    _check_failed()
+    with INSTRUMENT.timer("fastfunc.spkgps_batch"):
+        for i, _targ in enumerate(_targs):
+            # Write directly into the memory of `out` (no copy)
+            _row = _row_type.from_buffer(out, i*_rowsize)
+            if _covered is None:
+                for _et, _pos in zip(_ets, _row):
+                    _spkgps_c(_targ, _et, _ref, _obs, _pos, _lt)
+                n_call += n_et
+            else:
+                out[i] = np.nan
+                for j in _covered[i]:
+                    _spkgps_c(_targ, _ets[j], _ref, _obs, _row[j], _lt)
+                n_call += len(_covered[i])
+            if _check_failed():
+                out[i] = np.nan
+                INSTRUMENT.count("fastfunc.failed_targets")
+    INSTRUMENT.count("fastfunc.spkgps_c", n_call)
+    return out
+
+
+def spkcvo_batch(targets, ets, obsstas, outref: str, refloc: str, abcorr: str,
+                 obsctr: str, obsref: str, out=None, covered=None):
+    """States of many targets at many epochs by the boosted spkcvo.
+
+    Parameters
+    ----------
+    targets : int, str, or array-like of those
+        Target SPKIDs or names.
+
+    ets : float or array-like of float
+        Epochs in ET (``obsepc`` is set to the same value).
+
+    obsstas : array-like
+        Observer states relative to `obsctr` in `obsref` frame. Either a
+        ``(6,)`` state used for all epochs or ``(N_et, 6)`` states, e.g.,
+        ``ObserverTrajectory.states``.
+
+    outref, refloc, abcorr, obsctr, obsref : str
+        See `spkcvo`.
+
+    out : np.ndarray, optional
+        The C-contiguous float64 array of shape ``(N_targ, N_et, 6)`` to write
+        the results into.
+
+    covered : array-like of bool, optional
+        See `spkgps_batch`. Note that with light time corrections, the target
+        is evaluated slightly before the epoch, so the epochs at the beginning
+        of a coverage window may still raise SPICE errors.
+
+    Returns
+    -------
+    sta : np.ndarray
+        The states of shape ``(N_targ, N_et, 6)``. If any SPICE error occurs
+        for a target, the states of the target at all epochs are `np.nan`.
+    """
+    targets = np.atleast_1d(targets)
+    ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+    n_et = len(ets)
+    # np.array makes a (writable) copy, required for ``from_buffer``:
+    obsstas = np.array(np.broadcast_to(obsstas, (n_et, 6)), dtype=np.float64, order="C")
+    if out is None:
+        out = np.empty((len(targets), n_et, 6))
+    elif out.shape != (len(targets), n_et, 6) or out.dtype != np.float64 or not out.flags.c_contiguous:
+        raise ValueError("`out` must be a C-contiguous float64 array of shape (N_targ, N_et, 6).")
+
+    _outref = intern_char_p(outref)
+    _refloc = intern_char_p(refloc)
+    _abcorr = intern_char_p(abcorr)
+    _obsctr = intern_char_p(obsctr)
+    _obsref = intern_char_p(obsref)
+    _lt = ctypes.byref(ctypes.c_double())
+    _ets = box_doubles(ets)
+    _row_type = ctypes.c_double*6*n_et
+    _rowsize = n_et*6*8
+    _obsstas = _row_type.from_buffer(obsstas)
+    _spkcvo_c = sp.libspice.spkcvo_c
+    _covered = _covered_rows(covered, len(targets), n_et)
+    n_call = 0
+    _check_failed()
+    with INSTRUMENT.timer("fastfunc.spkcvo_batch"):
+        for i, target in enumerate(targets.tolist()):
+            _target = intern_char_p(target)
+            _row = _row_type.from_buffer(out, i*_rowsize)
+            if _covered is None:
+                for _et, _obssta, _sta in zip(_ets, _obsstas, _row):
+                    _spkcvo_c(_target, _et, _outref, _refloc, _abcorr, _obssta, _et,
+                              _obsctr, _obsref, _sta, _lt)
+                n_call += n_et
+            else:
+                out[i] = np.nan
+                for j in _covered[i]:
+                    _spkcvo_c(_target, _ets[j], _outref, _refloc, _abcorr, _obsstas[j], _ets[j],
+                              _obsctr, _obsref, _row[j], _lt)
+                n_call += len(_covered[i])
+            if _check_failed():
+                out[i] = np.nan
+                INSTRUMENT.count("fastfunc.failed_targets")
+    INSTRUMENT.count("fastfunc.spkcvo_c", n_call)
+    return out
@@ -0,0 +1,156 @@
+import numpy as np
+import spiceypy as sp
+
+
+__all__ = ["is_inertial", "frame_rotation", "frame_transform", "rotate", "clear_frame_cache"]
+
+
+# Rotation matrices of the time-independent frame pairs, {(from, to): 3x3}
+_ROTATION_CACHE = {}
+
+
+def is_inertial(frame):
+    """Return `True` if `frame` is an inertial frame (e.g., J2000, ECLIPJ2000).
+
+    Parameters
+    ----------
+    frame : str
+        Name of the frame.
+    """
+    frcode = sp.namfrm(frame)
+    if frcode == 0:
+        raise ValueError(f"Unknown frame: {frame}")
+    _, frclss, _ = sp.frinfo(frcode)
+    return frclss == 1
+
+
+def clear_frame_cache():
+    """Clear the cached rotation matrices (e.g., after loading frame kernels)."""
+    _ROTATION_CACHE.clear()
+
+
+def _const_rotation(fromfr, tofr):
+    """Return the cached 3x3 matrix if the pair is time-independent, else `None`."""
+    key = (fromfr.upper(), tofr.upper())
+    try:
+        return _ROTATION_CACHE[key]
+    except KeyError:
+        pass
+    if key[0] == key[1]:
+        mat = np.eye(3)
+    elif is_inertial(fromfr) and is_inertial(tofr):
+        mat = np.array(sp.pxform(fromfr, tofr, 0.0))
+    else:
+        return None
+    mat.setflags(write=False)
+    _ROTATION_CACHE[key] = mat
+    return mat
+
+
+def frame_rotation(fromfr, tofr, ets=None):
+    """Position rotation matrix from `fromfr` to `tofr` (``pxform``).
+
+    Parameters
+    ----------
+    fromfr, tofr : str
+        Names of the frames.
+
+    ets : float or array-like of float, optional
+        Epochs in ET. Ignored (can be `None`) if both frames are inertial, as
+        the rotation is constant and cached. For time-dependent pairs,
+        ``pxform`` is called once for each unique epoch.
+
+    Returns
+    -------
+    mat : np.ndarray
+        The ``(3, 3)`` matrix if the rotation is constant, otherwise matrices
+        of shape ``ets.shape + (3, 3)``.
+    """
+    mat = _const_rotation(fromfr, tofr)
+    if mat is not None:
+        return mat
+    if ets is None:
+        raise ValueError(f"`ets` is required for the time-dependent rotation {fromfr} -> {tofr}.")
+    ets = np.asarray(ets, dtype=np.float64)
+    uets, inverse = np.unique(ets, return_inverse=True)
+    mats = np.array([sp.pxform(fromfr, tofr, et) for et in uets])
+    return mats[inverse.reshape(ets.shape)]
+
+
+def frame_transform(fromfr, tofr, ets=None):
+    """State transformation matrix from `fromfr` to `tofr` (``sxform``).
+
+    Parameters
+    ----------
+    fromfr, tofr, ets :
+        See `frame_rotation`.
+
+    Returns
+    -------
+    mat : np.ndarray
+        The ``(6, 6)`` matrix if the rotation is constant, otherwise matrices
+        of shape ``ets.shape + (6, 6)``.
+    """
+    rot = _const_rotation(fromfr, tofr)
+    if rot is not None:
+        mat = np.zeros((6, 6))
+        mat[:3, :3] = mat[3:, 3:] = rot
+        return mat
+    if ets is None:
+        raise ValueError(f"`ets` is required for the time-dependent transform {fromfr} -> {tofr}.")
+    ets = np.asarray(ets, dtype=np.float64)
+    uets, inverse = np.unique(ets, return_inverse=True)
+    mats = np.array([sp.sxform(fromfr, tofr, et) for et in uets])
+    return mats[inverse.reshape(ets.shape)]
+
+
+def rotate(vecs, fromfr, tofr, ets=None):
+    """Rotate positions or states from `fromfr` to `tofr` in bulk.
+
+    Parameters
+    ----------
+    vecs : array-like
+        Positions of shape ``(..., 3)`` or states of shape ``(..., 6)``, e.g.,
+        ``(N, 3)`` or the ``(N_targ, N_et, 6)`` output of
+        `fastfunc.spkcvo_batch`.
+
+    fromfr, tofr : str
+        Names of the frames.
+
+    ets : float or array-like of float, optional
+        Epochs in ET, broadcastable to ``vecs.shape[:-1]``. Ignored if both
+        frames are inertial.
+
+    Returns
+    -------
+    rotated : np.ndarray
+        Rotated vectors of the same shape as `vecs`.
+
+    Notes
+    -----
+    For inertial-to-inertial pairs (e.g., ``"J2000"`` and ``"ECLIPJ2000"``),
+    this is a single matrix multiplication with the cached matrix. Note
+    that the velocity part of states is then rotated just like the position,
+    which is exact only for such constant rotations. For time-dependent
+    pairs, ``sxform`` (states) or ``pxform`` (positions) is called once per
+    unique epoch.
+    """
+    vecs = np.asarray(vecs, dtype=np.float64)
+    ndim = vecs.shape[-1]
+    if ndim not in (3, 6):
+        raise ValueError(f"The last axis of `vecs` must be of length 3 or 6, got {vecs.shape}")
+
+    rot = _const_rotation(fromfr, tofr)
+    if rot is not None:
+        if ndim == 3:
+            return vecs @ rot.T
+        return (vecs.reshape(vecs.shape[:-1] + (2, 3)) @ rot.T).reshape(vecs.shape)
+
+    if ets is None:
+        raise ValueError(f"`ets` is required for the time-dependent rotation {fromfr} -> {tofr}.")
+    ets = np.broadcast_to(np.asarray(ets, dtype=np.float64), vecs.shape[:-1])
+    if ndim == 3:
+        mats = frame_rotation(fromfr, tofr, ets)
+    else:
+        mats = frame_transform(fromfr, tofr, ets)
+    return np.einsum("...ij,...j->...i", mats, vecs)
@@ -0,0 +1,138 @@
+import numpy as np
+
+from .constants import R2D
+
+
+__all__ = ["OBSERVABLE_FIELDS", "observable_dtype", "observables"]
+
+
+# Fields of the structured array returned by `observables`:
+#   ra, dec         : longitude/latitude of the target seen from the observer
+#                     in the input frame (RA/Dec if the frame is ``"J2000"``)
+#                     [deg]
+#   dra_cosdec, ddec: sky-plane angular rates [arcsec/s]
+#   r_hel           : target-Sun distance [km]
+#   delta           : target-observer distance [km]
+#   alpha           : phase angle (Sun-target-observer) [deg]
+#   elong           : solar elongation (Sun-observer-target) [deg]
+OBSERVABLE_FIELDS = ["ra", "dec", "dra_cosdec", "ddec", "r_hel", "delta", "alpha", "elong"]
+
+
+def observable_dtype(dtype=np.float64):
+    """Return the structured dtype used by `observables`.
+
+    Parameters
+    ----------
+    dtype : dtype-like, optional
+        Float type of all fields (``np.float32`` or ``np.float64``).
+        Default is ``np.float64``.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind != "f":
+        raise TypeError(f"`dtype` must be a float type, got {dtype}")
+    return np.dtype([(f, dtype) for f in OBSERVABLE_FIELDS])
+
+
+def _angle(u, v):
+    """Angle between vectors (rows of `u` and `v`) in radians.
+    ``arctan2(|u x v|, u.v)`` is used, which is accurate at all angles.
+    """
+    return np.arctan2(np.linalg.norm(np.cross(u, v), axis=-1), np.sum(u*v, axis=-1))
+
+
+def _observables_chunk(targ_sta, obs_sta, sun_pos, out):
+    rel = targ_sta - obs_sta  # target as seen from the observer
+    pos, vel = rel[:, :3], rel[:, 3:]
+    delta = np.linalg.norm(pos, axis=1)
+    ra = np.arctan2(pos[:, 1], pos[:, 0])
+    dec = np.arcsin(pos[:, 2]/delta)
+    sin_ra, cos_ra = np.sin(ra), np.cos(ra)
+    sin_dec, cos_dec = np.sin(dec), np.cos(dec)
+    # Time derivatives of (ra, dec) projected onto the sky plane (rad/s):
+    dra_cosdec = (-sin_ra*vel[:, 0] + cos_ra*vel[:, 1])/delta
+    ddec = (-sin_dec*cos_ra*vel[:, 0] - sin_dec*sin_ra*vel[:, 1] + cos_dec*vel[:, 2])/delta
+
+    targ2sun = sun_pos - targ_sta[:, :3]
+    obs2sun = sun_pos - obs_sta[:, :3]
+
+    out["ra"] = (ra*R2D) % 360
+    out["dec"] = dec*R2D
+    out["dra_cosdec"] = dra_cosdec*(R2D*3600)
+    out["ddec"] = ddec*(R2D*3600)
+    out["r_hel"] = np.linalg.norm(targ2sun, axis=1)
+    out["delta"] = delta
+    out["alpha"] = _angle(targ2sun, -pos)*R2D
+    out["elong"] = _angle(obs2sun, pos)*R2D
+
+
+def observables(targ_sta, obs_sta, sun_pos=None, dtype=np.float64, chunksize=100_000):
+    """Compute the observables of many targets from observer state(s).
+
+    Parameters
+    ----------
+    targ_sta : array-like
+        The ``(N, 6)`` state vectors (km, km/s) of the targets, e.g., from
+        `fastfunc` or CLUT. All of `targ_sta`, `obs_sta`, and `sun_pos` must
+        be relative to the same center (e.g., the Sun or SSB) and in the same
+        frame.
+
+    obs_sta : array-like
+        The ``(6,)`` state of the observer, used for all targets, or the
+        ``(N, 6)`` states (one per row of `targ_sta`).
+
+    sun_pos : array-like, optional
+        The ``(3,)`` or ``(N, 3)`` position of the Sun. Default is `None`,
+        i.e., the states are heliocentric (Sun at the origin).
+
+    dtype : dtype-like, optional
+        Float type of the output fields (``np.float32`` or ``np.float64``).
+        The calculation itself is always done in float64.
+
+    chunksize : int, optional
+        Maximum number of rows to be processed at once, to limit the size of
+        the temporary arrays. Default is 100,000.
+
+    Returns
+    -------
+    obs : np.ndarray
+        Structured array of length ``N`` with the fields in
+        `OBSERVABLE_FIELDS`::
+
+          * ``ra``, ``dec``: longitude & latitude [deg] in the input frame
+            (i.e., RA & Dec only if the frame is equatorial, e.g.,
+            ``"J2000"``).
+          * ``dra_cosdec``, ``ddec``: angular rates [arcsec/s]
+          * ``r_hel``, ``delta``: heliocentric & observer distances [km]
+          * ``alpha``: phase angle [deg]
+          * ``elong``: solar elongation [deg]
+
+    Notes
+    -----
+    The light-time (aberration) correction must be applied to `targ_sta`
+    beforehand (e.g., by ``spkcvo`` with ``abcorr="LT+S"``) if needed.
+    """
+    targ_sta = np.atleast_2d(np.asarray(targ_sta, dtype=np.float64))
+    obs_sta = np.atleast_2d(np.asarray(obs_sta, dtype=np.float64))
+    sun_pos = (np.zeros((1, 3)) if sun_pos is None
+               else np.atleast_2d(np.asarray(sun_pos, dtype=np.float64)))
+
+    if targ_sta.ndim != 2 or targ_sta.shape[1] != 6:
+        raise ValueError(f"`targ_sta` must be of shape (N, 6), got {targ_sta.shape}")
+    if obs_sta.shape[1] != 6 or obs_sta.shape[0] not in (1, len(targ_sta)):
+        raise ValueError(f"`obs_sta` must be of shape (6,) or (N, 6), got {obs_sta.shape}")
+    if sun_pos.shape[1] != 3 or sun_pos.shape[0] not in (1, len(targ_sta)):
+        raise ValueError(f"`sun_pos` must be of shape (3,) or (N, 3), got {sun_pos.shape}")
+    if chunksize < 1:
+        raise ValueError("`chunksize` must be positive.")
+
+    n = len(targ_sta)
+    out = np.empty(n, dtype=observable_dtype(dtype))
+    for i in range(0, n, chunksize):
+        sl = slice(i, i + chunksize)
+        _observables_chunk(
+            targ_sta[sl],
+            obs_sta if len(obs_sta) == 1 else obs_sta[sl],
+            sun_pos if len(sun_pos) == 1 else sun_pos[sl],
+            out[sl]
+        )
+    return out
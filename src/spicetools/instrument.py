@@ -0,0 +1,153 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from functools import wraps
+
+import numpy as np
+
+
+__all__ = ["Instrumentation", "INSTRUMENT"]
+
+
+_NULL_CONTEXT = nullcontext()
+
+
+class _Timer:
+    __slots__ = ("_inst", "_stage", "_t0")
+
+    def __init__(self, inst, stage):
+        self._inst = inst
+        self._stage = stage
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._inst._times[self._stage].append(time.perf_counter() - self._t0)
+        return False
+
+
+class Instrumentation:
+    """Opt-in per-stage timers and counters for the long-running pipelines.
+
+    The pipelines (`fastfunc` batch functions, `clut`, `plut`, `times2et`)
+    report to the global `INSTRUMENT`. When disabled (default), `timer`
+    returns a shared no-op context manager and `count`/`add_bytes` return
+    immediately, so the overhead is negligible.
+
+    Examples
+    --------
+    >>> from spicetools.instrument import INSTRUMENT
+    >>> INSTRUMENT.enable()
+    >>> # ... run CLUT/PLUT ...
+    >>> INSTRUMENT.summary()  # pandas DataFrame, one row per stage
+    >>> INSTRUMENT.dump_json("timing.json")
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.reset()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Clear all the recorded values."""
+        self._times = defaultdict(list)
+        self._counts = defaultdict(int)
+        self._bytes = defaultdict(int)
+
+    def timer(self, stage):
+        """Context manager to time a stage (one call per ``with`` block)."""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _Timer(self, stage)
+
+    def count(self, stage, n=1):
+        """Add `n` to the counter of `stage` (e.g., number of CSPICE calls)."""
+        if self.enabled:
+            self._counts[stage] += n
+
+    def add_bytes(self, stage, nbytes):
+        """Add `nbytes` to the bytes written by `stage`."""
+        if self.enabled:
+            self._bytes[stage] += int(nbytes)
+
+    def wrap(self, stage):
+        """Decorator to time every call of a function as `stage`."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Timer(self, stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """Raw records as a JSON-serializable dict (e.g., to send from a
+        worker process to the parent, see `merge`)."""
+        return {
+            "times": {k: list(v) for k, v in self._times.items()},
+            "counts": dict(self._counts),
+            "bytes": dict(self._bytes),
+        }
+
+    def merge(self, snapshot):
+        """Merge a `snapshot` (e.g., from a worker process) into this."""
+        for k, v in snapshot["times"].items():
+            self._times[k].extend(v)
+        for k, v in snapshot["counts"].items():
+            self._counts[k] += v
+        for k, v in snapshot["bytes"].items():
+            self._bytes[k] += v
+
+    def to_dict(self, percentiles=(50, 90, 99)):
+        """Summary statistics of each stage.
+
+        Returns
+        -------
+        stats : dict
+            ``{stage: {"calls", "total_s", "mean_s", "p<q>_s", ..., "max_s",
+            "count", "bytes"}}``. Times are `None` for stages without timers.
+        """
+        stages = sorted(set(self._times) | set(self._counts) | set(self._bytes))
+        stats = {}
+        for stage in stages:
+            times = np.asarray(self._times.get(stage, []), dtype=np.float64)
+            _stat = {"calls": len(times)}
+            if len(times):
+                _stat["total_s"] = float(times.sum())
+                _stat["mean_s"] = float(times.mean())
+                for q, v in zip(percentiles, np.percentile(times, percentiles)):
+                    _stat[f"p{q}_s"] = float(v)
+                _stat["max_s"] = float(times.max())
+            else:
+                _stat.update({"total_s": None, "mean_s": None, "max_s": None})
+                _stat.update({f"p{q}_s": None for q in percentiles})
+            _stat["count"] = self._counts.get(stage, 0)
+            _stat["bytes"] = self._bytes.get(stage, 0)
+            stats[stage] = _stat
+        return stats
+
+    def dump_json(self, path, **kwargs):
+        """Write the summary (`to_dict`) to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(**kwargs), f, indent=2)
+
+    def summary(self, **kwargs):
+        """Summary (`to_dict`) as a pandas DataFrame, one row per stage."""
+        import pandas as pd
+        df = pd.DataFrame.from_dict(self.to_dict(**kwargs), orient="index")
+        df.index.name = "stage"
+        return df
+
+
+# The global instance used by the pipelines of this package.
+INSTRUMENT = Instrumentation()
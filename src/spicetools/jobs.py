@@ -0,0 +1,286 @@
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import spiceypy as sp
+
+from .bspstore import check_daf
+from .clut import compute_clut, write_clut
+from .queryutil import decode_spk
+
+
+__all__ = ["atomic_path", "ShardRunner", "clut_shard", "decode_shard"]
+
+
+# The manifest of a `ShardRunner` (``_manifest.json`` in its directory):
+# ``{"shards": {key: {"status": "done" | "failed", "attempts": int,
+# "output": file name, "elapsed": sec, "result": ..., "error": str}}}``.
+# Shards not in the manifest are pending.
+MANIFEST = "_manifest.json"
+
+
+@contextmanager
+def atomic_path(path):
+    """Temporary path to write `path` atomically.
+
+    The temporary file (in the same directory) is renamed to `path` only if
+    the ``with`` block succeeds; otherwise it is removed. Thus, `path` is
+    either the complete output or does not exist, even if the process is
+    killed.
+
+    Examples
+    --------
+    >>> with atomic_path("clut_000.parq") as tmp:
+    ...     df.to_parquet(tmp)
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _write_json(path, obj):
+    with atomic_path(path) as tmp:
+        with open(tmp, "w") as f:
+            json.dump(obj, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _init_worker(kernels):
+    for kernel in kernels:
+        sp.furnsh(str(kernel))
+
+
+def _run_shard(func, key, args, output):
+    """Run one shard in a worker: ``(key, ok, result or error, elapsed)``."""
+    t0 = time.perf_counter()
+    try:
+        with atomic_path(output) as tmp:
+            result = func(args, tmp)
+        return key, True, result, time.perf_counter() - t0
+    except Exception:
+        return key, False, traceback.format_exc(), time.perf_counter() - t0
+
+
+class ShardRunner:
+    """Checkpointed runner of a long job split into shards.
+
+    Each shard writes one output file in `workdir` (via `atomic_path`), and
+    the runner records each finished (or failed) shard in the manifest
+    ``_manifest.json``, which is also replaced atomically. When `run` is
+    called again (e.g., after a crash or preemption), the shards already
+    done are skipped, and the failed ones are retried up to `max_attempts`
+    times in total.
+
+    Parameters
+    ----------
+    workdir : str, path-like
+        Directory of the outputs and the manifest (created if not exists).
+
+    max_attempts : int, optional
+        Maximum number of attempts of a failing shard (over all runs).
+        Default is 3.
+
+    Examples
+    --------
+    >>> chunks = {f"a_chunk_{i:03d}": dict(spkids=spkids[i*100000:(i + 1)*100000], ets=ets,
+    ...                                    bsp_fmt="spkbsp/a/spk{spkid}.bsp")
+    ...           for i in range(14)}
+    >>> runner = ShardRunner("clut")
+    >>> runner.run(clut_shard, chunks, suffix=".parq", kernels=["de440s.bsp"], processes=4)
+    >>> runner.status()  # the same call resumes after a crash
+    """
+
+    def __init__(self, workdir, max_attempts=3):
+        self.workdir = Path(workdir)
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.manifest_path = self.workdir / MANIFEST
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {"shards": {}}
+
+    def _record(self, key, ok, result, elapsed, output):
+        entry = self.manifest["shards"].get(key, {"attempts": 0})
+        entry["attempts"] += 1
+        entry.update(status="done" if ok else "failed", output=output.name, elapsed=elapsed)
+        entry.pop("result" if not ok else "error", None)
+        entry["result" if ok else "error"] = result
+        self.manifest["shards"][key] = entry
+        _write_json(self.manifest_path, self.manifest)
+
+    def todo(self, keys):
+        """Keys of the shards to run: pending, or failed with attempts left.
+
+        A shard recorded as done but whose output file is missing (e.g.,
+        deleted by the user) is also to be run again.
+        """
+        res = []
+        for key in keys:
+            entry = self.manifest["shards"].get(str(key))
+            if entry is None:
+                res.append(key)
+            elif entry["status"] == "done":
+                if not (self.workdir / entry["output"]).exists():
+                    res.append(key)
+            elif entry["attempts"] < self.max_attempts:
+                res.append(key)
+        return res
+
+    def run(self, func, shards, suffix="", kernels=(), processes=1):
+        """Run the shards not done yet.
+
+        Parameters
+        ----------
+        func : callable
+            ``func(args, output)`` computes a shard and writes its output to
+            the path ``output`` (a temporary path, renamed when `func`
+            returns). It may return a JSON-serializable value, saved in the
+            manifest (``"result"``). Any exception marks the shard as failed.
+            Must be picklable (module-level) if ``processes != 1``.
+
+        shards : dict
+            ``{key: args}`` of all the shards of the job. The output of each
+            shard is ``workdir/<key><suffix>``.
+
+        suffix : str, optional
+            Suffix of the output files, e.g., ``".parq"``.
+
+        kernels : list of str, path-like, optional
+            Kernels (or meta-kernels) to be furnished in each worker process
+            (or this process if ``processes=1``).
+
+        processes : int, optional
+            Number of worker processes. If ``1`` (default), the shards run in
+            the current process. `None` for the number of CPUs.
+
+        Returns
+        -------
+        status : pd.DataFrame
+            See `status`.
+        """
+        shards = {str(k): v for k, v in shards.items()}
+        keys = self.todo(shards)
+        outputs = {key: self.workdir / f"{key}{suffix}" for key in keys}
+        kernels = [str(k) for k in kernels]
+        if processes == 1:
+            _init_worker(kernels)
+            try:
+                for key in keys:
+                    self._record(*_run_shard(func, key, shards[key], outputs[key]), outputs[key])
+            finally:  # restore the kernel pool of this process
+                for kernel in kernels:
+                    sp.unload(kernel)
+        else:
+            # Results are recorded by this process only, as soon as each
+            # shard finishes, so an interrupted run loses only the running ones.
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=(kernels,)) as pool:
+                futures = [pool.submit(_run_shard, func, key, shards[key], outputs[key])
+                           for key in keys]
+                for future in as_completed(futures):
+                    key, ok, result, elapsed = future.result()
+                    self._record(key, ok, result, elapsed, outputs[key])
+        return self.status(shards)
+
+    def status(self, keys=None):
+        """Status of the shards.
+
+        Parameters
+        ----------
+        keys : iterable, optional
+            Keys of the shards. Default is all shards in the manifest.
+
+        Returns
+        -------
+        status : pd.DataFrame
+            One row per shard with the columns ``"key"``, ``"status"``
+            (``"done"``, ``"failed"``, or ``"pending"``), ``"attempts"``,
+            ``"output"``, ``"elapsed"`` (sec, of the last attempt), and
+            ``"error"`` (the traceback of the last failure).
+        """
+        keys = list(self.manifest["shards"]) if keys is None else [str(k) for k in keys]
+        rows = []
+        for key in keys:
+            entry = self.manifest["shards"].get(key, {})
+            rows.append((key, entry.get("status", "pending"), entry.get("attempts", 0),
+                         entry.get("output"), entry.get("elapsed", np.nan), entry.get("error")))
+        return pd.DataFrame(rows, columns=["key", "status", "attempts", "output", "elapsed", "error"])
+
+    def results(self):
+        """``{key: result}`` of the shards done (see `run`)."""
+        return {key: entry.get("result") for key, entry in self.manifest["shards"].items()
+                if entry["status"] == "done"}
+
+
+def clut_shard(args, output):
+    """Shard function (see `ShardRunner.run`) computing a chunk of the CLUT.
+
+    Parameters
+    ----------
+    args : dict
+        ``"spkids"`` and ``"ets"``, and optionally the other keyword
+        arguments of `~spicetools.clut.compute_clut` (e.g., ``"bsp_fmt"``).
+
+    output : path-like
+        The CLUT parquet file to write.
+
+    Returns
+    -------
+    result : dict
+        ``"n_obj"`` (the number of objects written), and ``"no_spk_file"``
+        and ``"error_file"`` (see `~spicetools.clut.compute_clut`).
+    """
+    args = dict(args)
+    spkids_used, pos, no_spk_file, error_file = compute_clut(args.pop("spkids"), args.pop("ets"),
+                                                             **args)
+    write_clut(output, spkids_used, pos)
+    return {"n_obj": len(spkids_used), "no_spk_file": [int(i) for i in no_spk_file],
+            "error_file": [int(i) for i in error_file]}
+
+
+def decode_shard(args, output):
+    """Shard function (see `ShardRunner.run`) decoding a Horizons SPK response.
+
+    Parameters
+    ----------
+    args : str, path-like
+        Path to the saved response of the Horizons SPK API (JSON, or text
+        with the base64 SPK; see `~spicetools.queryutil.decode_spk`).
+
+    output : path-like
+        The BSP file to write.
+
+    Returns
+    -------
+    result : dict
+        ``"spkids"`` in the decoded SPK.
+
+    Raises
+    ------
+    ValueError
+        If the response has no SPK, or the decoded file is not a valid SPK.
+    """
+    text = Path(args).read_text()
+    try:
+        text = json.loads(text)["spk"]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        pass
+    with open(output, "wb") as f:
+        f.write(decode_spk(text))
+    coverage = check_daf(output)
+    if not coverage:
+        raise ValueError(f"Decoded SPK of {args} is not a valid SPK file.")
+    return {"spkids": sorted(int(i) for i in coverage)}
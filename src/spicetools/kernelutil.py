@@ -1,12 +1,19 @@
 from pathlib import Path
 
 
-__all__ = ["make_meta"]
+__all__ = ["make_meta", "make_meta_shards", "read_meta_shards", "iter_shards"]
 
 
 # Path to spicetools/kernels:
 DEFAULT_KERNELS = Path(__file__).resolve().parent / "kernels"
 
+# Maximum number of kernel files loaded at the same time in CSPICE (``FTSIZE``
+# in keeper.c), including the meta-kernels themselves:
+SPICE_MAX_LOADED = 5000
+
+# The shard manifest of `make_meta_shards` (in its output directory):
+SHARD_MANIFEST = "_shards.parquet"
+
 # Basic template for the meta file:
 META_TEMPLATE = (
     r"""\begintext
@@ -131,3 +138,124 @@ def make_kernels_to_load(*args, linemax=79):
             kernstrs.append(f"'{_part}'")
 
     return kernstrs
+
+
+def make_meta_shards(spkids, output_dir, bsp_fmt="spk{spkid}.bsp", coverage=None, max_files=4000,
+                     prefix="shard"):
+    """Group per-object BSP files into meta-kernels under the CSPICE file limit.
+
+    CSPICE can load at most `SPICE_MAX_LOADED` (5000) files at once. For
+    many more objects, the BSP files are split into shards of at most
+    `max_files` files, each listed in one meta-kernel, so that a worker can
+    ``furnsh`` one shard (thousands of objects at once), compute, and unload
+    it (see `iter_shards`).
+
+    Parameters
+    ----------
+    spkids : array-like of int
+        SPKIDs of the objects.
+
+    output_dir : str, path-like
+        Directory of the meta-kernels (``<prefix>_<NNNNN>.mk``) and the shard
+        manifest ``_shards.parquet`` (created if not exists).
+
+    bsp_fmt : str, optional
+        Format of the path to the BSP file of each object (see
+        `~spicetools.clut.compute_clut`). Objects without the file are
+        skipped. Default is ``"spk{spkid}.bsp"``.
+
+    coverage : pd.DataFrame, optional
+        The coverage index (see `~spicetools.coverage.build_coverage`). If
+        given, the objects are ordered by their coverage (start, stop) and
+        then by spkid, so that the objects in a shard have similar coverage;
+        objects not in it are skipped. Otherwise, they are ordered by spkid.
+
+    max_files : int, optional
+        Maximum number of BSP files per shard. It must leave room for the
+        other kernels loaded meanwhile (e.g., LSK, DE), i.e., ``max_files +
+        N_other + 1 <= 5000``. Default is 4000.
+
+    prefix : str, optional
+        Prefix of the meta-kernel file names. Default is ``"shard"``.
+
+    Returns
+    -------
+    manifest : pd.DataFrame
+        One row per shard with the columns ``"shard"``, ``"path"`` (of the
+        meta-kernel), ``"n_obj"``, ``"spkids"`` (array of the SPKIDs),
+        ``"et_start"`` and ``"et_stop"`` (the earliest start and the latest
+        stop of the objects' coverage; `np.nan` without `coverage`).
+    """
+    # Imported here so that this module stays free of dependencies (it is
+    # imported by the workers for `make_meta`):
+    import numpy as np
+    import pandas as pd
+
+    if not 0 < max_files < SPICE_MAX_LOADED:
+        raise ValueError(f"`max_files` must be in 1..{SPICE_MAX_LOADED - 1}.")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    df = pd.DataFrame({"spkid": np.unique(np.asarray(spkids, dtype=np.int64))})
+    df["path"] = [str(Path(bsp_fmt.format(spkid=spkid)).resolve()) for spkid in df["spkid"]]
+    df = df[[Path(p).exists() for p in df["path"]]]
+    if coverage is not None:
+        cov = coverage.groupby("spkid").agg(et_start=("et_start", "min"), et_stop=("et_stop", "max"))
+        df = df.join(cov, on="spkid", how="inner").sort_values(["et_start", "et_stop", "spkid"])
+    else:
+        df["et_start"] = df["et_stop"] = np.nan
+
+    rows = []
+    for i, start in enumerate(range(0, len(df), max_files)):
+        chunk = df.iloc[start:start + max_files]
+        path = output_dir / f"{prefix}_{i:05d}.mk"
+        make_meta(*chunk["path"], output=path)
+        rows.append((i, str(path), len(chunk), chunk["spkid"].to_numpy(),
+                     chunk["et_start"].min(), chunk["et_stop"].max()))
+    manifest = pd.DataFrame(rows, columns=["shard", "path", "n_obj", "spkids", "et_start", "et_stop"])
+    manifest.to_parquet(output_dir / SHARD_MANIFEST, index=False)
+    return manifest
+
+
+def read_meta_shards(output_dir):
+    """Read the shard manifest made by `make_meta_shards`."""
+    import pandas as pd
+
+    return pd.read_parquet(Path(output_dir) / SHARD_MANIFEST)
+
+
+def iter_shards(manifest, et_start=None, et_stop=None):
+    """Furnish the shards one at a time.
+
+    Parameters
+    ----------
+    manifest : pd.DataFrame
+        The shard manifest (see `make_meta_shards`), e.g., only the rows of
+        the shards assigned to a worker.
+
+    et_start, et_stop : float, optional
+        If given, the shards whose objects' coverage does not overlap with
+        ``[et_start, et_stop]`` are skipped.
+
+    Yields
+    ------
+    row : pd.Series
+        The manifest row of the shard, which is loaded until the next
+        iteration (or the end of the loop).
+
+    Examples
+    --------
+    >>> for shard in iter_shards(read_meta_shards("shards")):
+    ...     pos = spkgps_batch(shard["spkids"], ets, "ECLIPJ2000", 399)
+    """
+    import spiceypy as sp
+
+    for _, row in manifest.iterrows():
+        if et_start is not None and row["et_stop"] < et_start:
+            continue
+        if et_stop is not None and row["et_start"] > et_stop:
+            continue
+        sp.furnsh(str(row["path"]))
+        try:
+            yield row
+        finally:
+            sp.unload(str(row["path"]))
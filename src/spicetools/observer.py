@@ -0,0 +1,166 @@
+import numpy as np
+import spiceypy as sp
+
+from .fastfunc import spkcvo_batch
+from .frames import is_inertial, rotate
+from .geometry import observables
+
+
+__all__ = ["ObserverTrajectory"]
+
+
+class ObserverTrajectory:
+    """Observer (spacecraft or site) states sampled once at all epochs.
+
+    The observer ephemeris is evaluated only once per epoch (O(N_epoch)) and
+    reused for every target, instead of being re-evaluated by SPICE for every
+    (target, epoch) pair (O(N_epoch x N_target)).
+    """
+
+    def __init__(self, observer, ets, center="SUN", ref="J2000"):
+        """Sample the observer states from the loaded SPICE kernels.
+
+        Parameters
+        ----------
+        observer : str or int
+            Observer name or SPKID (e.g., the spacecraft NAIF ID).
+
+        ets : float or array-like of float
+            Epochs in ET.
+
+        center : str or int, optional
+            Center of the observer states. Targets computed by `spkcvo` are
+            also computed relative to this center internally, so it is better
+            to be close to the targets' center in the kernels (e.g., the Sun
+            for small bodies). Default is ``"SUN"``.
+
+        ref : str, optional
+            Reference frame of the observer states. Default is ``"J2000"``.
+        """
+        self.observer = str(observer)
+        self.center = str(center)
+        self.ref = ref
+        self.ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+        if len(self.ets) == 0:
+            raise ValueError("`ets` must not be empty.")
+        states, _ = sp.spkezr(self.observer, self.ets, ref, "NONE", self.center)
+        self.states = np.ascontiguousarray(states, dtype=np.float64).reshape(-1, 6)
+        self.sun_pos = self._sample_sun()
+
+    @classmethod
+    def from_states(cls, states, ets, center="SUN", ref="J2000", observer=None):
+        """Make the trajectory from precomputed observer states.
+
+        Parameters
+        ----------
+        states : array-like
+            The ``(N_et, 6)`` observer states (km, km/s) relative to `center`
+            in `ref` frame, e.g., a site state or a spacecraft ephemeris from
+            non-SPICE sources.
+
+        ets, center, ref :
+            See `__init__`.
+
+        observer : str, optional
+            Name of the observer (only for bookkeeping).
+        """
+        self = cls.__new__(cls)
+        self.observer = observer
+        self.center = str(center)
+        self.ref = ref
+        self.ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+        self.states = np.array(states, dtype=np.float64, order="C").reshape(-1, 6)
+        if len(self.states) != len(self.ets):
+            raise ValueError(
+                f"`states` ({len(self.states)}) and `ets` ({len(self.ets)}) must have the same length."
+            )
+        self.sun_pos = self._sample_sun()
+        return self
+
+    def _sample_sun(self):
+        if self.center.upper() in ("SUN", "10"):
+            return np.zeros((len(self.ets), 3))
+        pos, _ = sp.spkpos("SUN", self.ets, self.ref, "NONE", self.center)
+        return np.ascontiguousarray(pos, dtype=np.float64).reshape(-1, 3)
+
+    def __len__(self):
+        return len(self.ets)
+
+    def __repr__(self):
+        return (f"<ObserverTrajectory observer={self.observer} center={self.center} "
+                f"ref={self.ref} N_et={len(self)}>")
+
+    def spkcvo(self, targets, outref=None, refloc="OBSERVER", abcorr="NONE", out=None):
+        """States of targets relative to the observer at all epochs.
+
+        Parameters
+        ----------
+        targets : int, str, or array-like of those
+            Target SPKIDs or names.
+
+        outref : str, optional
+            Output reference frame. Default is the frame of this trajectory.
+            If both `outref` and the frame of this trajectory are inertial,
+            the states are computed in the latter and rotated in bulk.
+
+        refloc, abcorr : str, optional
+            See `fastfunc.spkcvo`.
+
+        out : np.ndarray, optional
+            See `fastfunc.spkcvo_batch`.
+
+        Returns
+        -------
+        sta : np.ndarray
+            The ``(N_targ, N_et, 6)`` states of the targets relative to the
+            observer.
+        """
+        outref = self.ref if outref is None else outref
+        bulk_rotate = outref.upper() != self.ref.upper() and is_inertial(outref) and is_inertial(self.ref)
+        sta = spkcvo_batch(
+            targets, self.ets, self.states,
+            outref=self.ref if bulk_rotate else outref,
+            refloc=refloc, abcorr=abcorr, obsctr=self.center, obsref=self.ref, out=out
+        )
+        if bulk_rotate:
+            sta[...] = rotate(sta, self.ref, outref)
+        return sta
+
+    def observables(self, rel_sta, dtype=np.float64, chunksize=100_000):
+        """Observables of targets from target states relative to the observer.
+
+        Parameters
+        ----------
+        rel_sta : array-like
+            The ``(N_targ, N_et, 6)`` (or ``(N_et, 6)``) target states
+            relative to the observer, in the frame of this trajectory (e.g.,
+            the output of `spkcvo` with the default `outref`).
+
+        dtype, chunksize :
+            See `geometry.observables`.
+
+        Returns
+        -------
+        obs : np.ndarray
+            Structured array of shape ``(N_targ, N_et)`` (or ``(N_et,)``)
+            from `geometry.observables`.
+
+        Notes
+        -----
+        The Sun position is taken at the observation epoch, i.e., the phase
+        angle is not light-time corrected for the Sun-target leg.
+        """
+        rel_sta = np.asarray(rel_sta, dtype=np.float64)
+        shape = rel_sta.shape[:-1]
+        if rel_sta.shape[-1] != 6 or shape[-1:] != (len(self),):
+            raise ValueError(f"`rel_sta` must be of shape (..., {len(self)}, 6), got {rel_sta.shape}")
+        n_targ = int(np.prod(shape[:-1]))
+        targ_sta = (rel_sta + self.states).reshape(-1, 6)
+        res = observables(
+            targ_sta,
+            obs_sta=np.tile(self.states, (n_targ, 1)),
+            sun_pos=np.tile(self.sun_pos, (n_targ, 1)),
+            dtype=dtype,
+            chunksize=chunksize
+        )
+        return res.reshape(shape)
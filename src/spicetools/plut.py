@@ -0,0 +1,306 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import spiceypy as sp
+
+from .clut import interp_clut
+from .constants import D2R
+from .frames import rotate
+from .geometry import OBSERVABLE_FIELDS
+from .instrument import INSTRUMENT
+from .jobs import atomic_path
+from .observer import ObserverTrajectory
+
+
+__all__ = ["screen_pointings", "build_plut", "read_plut"]
+
+
+# The precise look-up table (PLUT) is a directory of parquet files (one per
+# task of pointings) and the index file ``_index.parquet`` (pointing_id ->
+# file). Each row is one (pointing, object, epoch) with the columns below.
+PLUT_INDEX = "_index.parquet"
+_STATE_FIELDS = ["x", "y", "z", "vx", "vy", "vz"]
+
+
+def _radec2vec(ra__deg, dec__deg):
+    ra = np.asarray(ra__deg, dtype=np.float64)*D2R
+    dec = np.asarray(dec__deg, dtype=np.float64)*D2R
+    return np.stack([np.cos(dec)*np.cos(ra), np.cos(dec)*np.sin(ra), np.sin(dec)], axis=-1)
+
+
+def screen_pointings(pointings, clut_spkids, clut_pos, clut_ets, clut_ref="ECLIPJ2000", margin=1.0,
+                     obj_margin=None):
+    """Select candidate objects for each pointing from the CLUT.
+
+    Parameters
+    ----------
+    pointings : pd.DataFrame
+        Planned pointings with the columns ``"et"`` (ET), ``"ra"``, ``"dec"``
+        (J2000, deg), and ``"radius"`` (radius of the field of view, deg).
+
+    clut_spkids : array-like of int
+        SPKIDs of the CLUT objects.
+
+    clut_pos : np.ndarray
+        The ``(N_obj, N_et, 3)`` CLUT positions relative to (roughly) the
+        observer, e.g., geocentric positions for a near-Earth observer.
+
+    clut_ets : array-like of float
+        The (sorted) epochs of the CLUT in ET.
+
+    clut_ref : str, optional
+        Reference frame of `clut_pos`. Default is ``"ECLIPJ2000"``.
+
+    margin : float, optional
+        Margin (deg) added to ``radius``, which must cover the CLUT
+        interpolation error, the parallax between the CLUT center and the
+        observer, and the motion during the fine-cadence window. Default is
+        1 degree.
+
+    obj_margin : array-like of float, optional
+        Additional margin (deg) of each object, e.g., ``nsigma`` times the
+        orbit uncertainty (`~spicetools.uncertainty.sky_uncertainty`), of
+        shape ``(N_obj,)`` or ``(N_obj, N_et)`` (at the CLUT epochs,
+        linearly interpolated).
+
+    Returns
+    -------
+    candidates : list of np.ndarray
+        The SPKIDs of the candidates for each pointing (row).
+    """
+    clut_spkids = np.asarray(clut_spkids)
+    vecs = rotate(_radec2vec(pointings["ra"], pointings["dec"]), "J2000", clut_ref)
+    radii = np.asarray(pointings["radius"]) + margin
+    if obj_margin is not None:
+        obj_margin = np.asarray(obj_margin, dtype=np.float64)
+    candidates = []
+    for et, vec, radius in zip(np.asarray(pointings["et"], dtype=np.float64), vecs, radii):
+        pos = interp_clut(clut_pos, clut_ets, et)
+        cos_sep = (pos @ vec)/np.linalg.norm(pos, axis=1)
+        if obj_margin is not None:
+            radius = radius + (obj_margin if obj_margin.ndim == 1
+                               else interp_clut(obj_margin[..., None], clut_ets, et)[:, 0])
+        cos_lim = np.cos(np.clip(radius, 0, 180)*D2R)
+        candidates.append(clut_spkids[cos_sep >= cos_lim])
+    return candidates
+
+
+def _init_worker(kernels, instrument=False):
+    for kernel in kernels:
+        sp.furnsh(str(kernel))
+    if instrument:
+        INSTRUMENT.reset()
+        INSTRUMENT.enable()
+
+
+def _plut_task(task):
+    """Compute the PLUT rows of a group of pointings & write a parquet file."""
+    (output, pointing_ids, pointing_ets, candidates, observer, center, ref, abcorr, offsets,
+     bsp_fmt, collect_instrument) = task
+    offsets = np.asarray(offsets, dtype=np.float64)
+    tables = []
+    for pid, et, spkids in zip(pointing_ids, pointing_ets, candidates):
+        if len(spkids) == 0:
+            continue
+        with INSTRUMENT.timer("observer.sample"):
+            traj = ObserverTrajectory(observer, et + offsets, center=center, ref=ref)
+        if bsp_fmt is None:
+            sta = traj.spkcvo(spkids, abcorr=abcorr)
+        else:  # Load the BSP of each object only when needed
+            sta = np.full((len(spkids), len(traj), 6), np.nan)
+            for i, spkid in enumerate(spkids):
+                fpath = Path(bsp_fmt.format(spkid=spkid))
+                if not fpath.exists():
+                    continue
+                with INSTRUMENT.timer("kernel.load"):
+                    handle = sp.spklef(str(fpath))
+                traj.spkcvo(spkid, abcorr=abcorr, out=sta[i:i + 1])
+                with INSTRUMENT.timer("kernel.unload"):
+                    sp.spkuef(handle)
+        with INSTRUMENT.timer("plut.observables"):
+            obs = traj.observables(sta)
+        with INSTRUMENT.timer("plut.assemble"):
+            n = sta.shape[0]*sta.shape[1]
+            cols = {
+                "pointing_id": np.full(n, pid, dtype=np.int64),
+                "spkid": np.repeat(np.asarray(spkids, dtype=np.int64), len(traj)),
+                "et": np.tile(traj.ets, len(spkids)),
+            }
+            cols.update({f: sta[..., i].ravel() for i, f in enumerate(_STATE_FIELDS)})
+            cols.update({f: obs[f].ravel() for f in OBSERVABLE_FIELDS})
+            tables.append(pa.table(cols))
+
+    n_rows = 0
+    if tables:
+        table = pa.concat_tables(tables)
+        # Objects with SPICE errors (e.g., out of coverage) are dropped:
+        table = table.filter(pc.is_finite(table["x"]))
+        with INSTRUMENT.timer("plut.write"), atomic_path(output) as tmp:
+            pq.write_table(table, tmp)
+        if INSTRUMENT.enabled:
+            INSTRUMENT.add_bytes("plut.write", Path(output).stat().st_size)
+        n_rows = table.num_rows
+
+    snapshot = None
+    if collect_instrument:  # send the records of this worker to the parent
+        snapshot = INSTRUMENT.snapshot()
+        INSTRUMENT.reset()
+    return output, n_rows, snapshot
+
+
+def build_plut(pointings, clut_spkids, clut_pos, clut_ets, output_dir, observer, kernels=(),
+               center="SUN", ref="J2000", abcorr="LT+S", offsets=(0.0,), margin=1.0,
+               clut_ref="ECLIPJ2000", bsp_fmt=None, pointings_per_task=10, processes=None,
+               resume=False, obj_margin=None):
+    """Build the precise look-up table (PLUT) for an observation plan.
+
+    The CLUT is used to screen candidate objects for each pointing, and the
+    aberration-corrected ``spkcvo`` states are computed only for those
+    candidates at the fine-cadence epochs, in parallel processes.
+
+    Parameters
+    ----------
+    pointings : pd.DataFrame
+        Planned pointings (see `screen_pointings`). If it has the
+        ``"pointing_id"`` column, it is used as the ID of each pointing;
+        otherwise the row number is used.
+
+    clut_spkids, clut_pos, clut_ets, clut_ref, margin, obj_margin :
+        See `screen_pointings`.
+
+    output_dir : str, path-like
+        Output directory of the PLUT dataset.
+
+    observer : str or int
+        Observer name or SPKID (e.g., the spacecraft NAIF ID).
+
+    kernels : list of str, path-like, optional
+        Kernels (or meta-kernels) to be furnished in each worker process.
+        Needed unless the workers are forked from a process that already
+        furnished them.
+
+    center, ref : str, optional
+        See `ObserverTrajectory`. Note ``ra`` and ``dec`` in the output are
+        computed in `ref`.
+
+    abcorr : str, optional
+        Aberration correction. Default is ``"LT+S"``.
+
+    offsets : array-like of float, optional
+        Fine-cadence epochs relative to the epoch of each pointing (sec).
+        Default is ``(0.0,)``.
+
+    bsp_fmt : str, optional
+        If given, the BSP file of each candidate object is loaded only when
+        needed, from ``bsp_fmt.format(spkid=spkid)``. Otherwise, all object
+        kernels must be in `kernels` (or already loaded).
+
+    pointings_per_task : int, optional
+        Number of pointings per task (one output parquet file per task).
+
+    processes : int, optional
+        Number of worker processes. If ``1``, everything runs in the current
+        process. Default is `None` (number of CPUs).
+
+    resume : bool, optional
+        If `True`, the tasks whose output file already exists (e.g., from an
+        interrupted call with the same arguments) are not computed again.
+        The files are written atomically, so an existing file is complete.
+
+    Returns
+    -------
+    index : pd.DataFrame
+        The index of the dataset (also saved as ``_index.parquet``) with the
+        columns ``"pointing_id"``, ``"path"``, and ``"n_rows"`` (of the file).
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    pointings = pointings.reset_index(drop=True)
+    if "pointing_id" in pointings.columns:
+        pointing_ids = pointings["pointing_id"].to_numpy(dtype=np.int64)
+    else:
+        pointing_ids = np.arange(len(pointings), dtype=np.int64)
+    candidates = screen_pointings(pointings, clut_spkids, clut_pos, clut_ets,
+                                  clut_ref=clut_ref, margin=margin, obj_margin=obj_margin)
+    pointing_ets = pointings["et"].to_numpy(dtype=np.float64)
+
+    tasks = []
+    for i, start in enumerate(range(0, len(pointings), pointings_per_task)):
+        sl = slice(start, start + pointings_per_task)
+        tasks.append((
+            str(output_dir / f"plut_{i:05d}.parquet"), pointing_ids[sl], pointing_ets[sl],
+            candidates[sl], str(observer), center, ref, abcorr, tuple(offsets), bsp_fmt,
+            INSTRUMENT.enabled and processes != 1
+        ))
+
+    done = {}
+    if resume:
+        done = {task[0]: (task[0], pq.read_metadata(task[0]).num_rows, None)
+                for task in tasks if Path(task[0]).exists()}
+    todo = [task for task in tasks if task[0] not in done]
+
+    kernels = [str(k) for k in kernels]
+    if processes == 1:
+        _init_worker(kernels)
+        try:
+            results = [_plut_task(task) for task in todo]
+        finally:  # restore the kernel pool of this process
+            for kernel in kernels:
+                sp.unload(kernel)
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(kernels, INSTRUMENT.enabled)) as pool:
+            results = list(pool.map(_plut_task, todo))
+        for result in results:
+            if result[2] is not None:
+                INSTRUMENT.merge(result[2])
+    done.update({result[0]: result for result in results})
+    results = [done[task[0]] for task in tasks]
+
+    rows = [(pid, Path(path).name, n_rows)
+            for task, (path, n_rows, _) in zip(tasks, results) for pid in task[1]]
+    index = pd.DataFrame(rows, columns=["pointing_id", "path", "n_rows"])
+    index.to_parquet(output_dir / PLUT_INDEX, index=False)
+    return index
+
+
+def read_plut(output_dir, pointing_ids=None, spkids=None, columns=None):
+    """Read (a part of) the PLUT dataset.
+
+    Parameters
+    ----------
+    output_dir : str, path-like
+        The PLUT directory made by `build_plut`.
+
+    pointing_ids, spkids : array-like of int, optional
+        If given, only the rows of these pointings and/or objects are read.
+        Only the files containing `pointing_ids` are opened.
+
+    columns : list of str, optional
+        Columns to read. Default is all.
+
+    Returns
+    -------
+    table : pa.Table
+        The PLUT rows.
+    """
+    output_dir = Path(output_dir)
+    index = pd.read_parquet(output_dir / PLUT_INDEX)
+    index = index[index["n_rows"] > 0]
+    filt = None
+    if pointing_ids is not None:
+        index = index[index["pointing_id"].isin(pointing_ids)]
+        filt = ds.field("pointing_id").isin(list(pointing_ids))
+    if spkids is not None:
+        _filt = ds.field("spkid").isin(list(spkids))
+        filt = _filt if filt is None else filt & _filt
+    paths = [str(output_dir / p) for p in index["path"].unique()]
+    if not paths:
+        return pa.table({})
+    return ds.dataset(paths, format="parquet").to_table(columns=columns, filter=filt)
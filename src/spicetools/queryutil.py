@@ -1,4 +1,5 @@
 import base64
+from functools import cache
 from pathlib import Path
 from urllib import request
 import pandas as pd
@@ -7,7 +8,10 @@ from io import StringIO
 
 import requests
 
-__all__ = ["SBDBQuery", "drop_impacted", "HorizonsSPKQuery", "download_jpl_de", "sanitize_comets"]
+from .catalog import write_catalog
+
+__all__ = ["SBDBQuery", "drop_impacted", "HorizonsSPKQuery", "download_jpl_de", "sanitize_comets",
+           "sbdb_json2df", "decode_spk"]
 
 # impacted and permanently lost objects by 2024:
 # see also https://en.wikipedia.org/wiki/Asteroid_impact_prediction#List_of_successfully_predicted_asteroid_impacts
@@ -61,8 +65,11 @@ def drop_impacted(df, desig_col="desig"):
 # TODO: Eventually some of these may be moved to astroquery.jplsbdb
 
 
-_SBDB_FIELDS = pd.read_csv(StringIO(
-    """column,ignore,aonly,conly,simple,dtype
+# For details of each column: https://ssd-api.jpl.nasa.gov/doc/sbdb_query.html
+# I found saving columns in, e.g., int32, does not really help reducing memory/storage usage for parquet.
+# ``_SBDB_FIELDS`` (DataFrame) and ``SBDB_FIELDS`` (dict) are built only when
+# first accessed (see ``__getattr__`` below), not at import time.
+_SBDB_FIELDS_CSV = """column,ignore,aonly,conly,simple,dtype
 spkid,0,0,0,1,i
 full_name,0,0,0,0,s
 kind,0,0,0,0,s
@@ -150,19 +157,36 @@ A2_sigma,0,0,0,1,f
 A3,0,0,0,1,f
 A3_sigma,0,0,0,1,f
 DT,0,0,0,1,f
-DT_sigma,0,0,0,1,f"""),
-    dtype={"column": str, "ignore": bool, "aonly": bool, "conly": bool, "simple": bool, "dtype": str}
-)
-_SBDB_FIELDS["dtype"] = _SBDB_FIELDS["dtype"].map({"i": int, "f": float, "s": str})
-# For details of each column: https://ssd-api.jpl.nasa.gov/doc/sbdb_query.html
-# I found saving columns in, e.g., int32, does not really help reducing memory/storage usage for parquet.
+DT_sigma,0,0,0,1,f"""
+
+
+@cache
+def _sbdb_fields_table():
+    df = pd.read_csv(
+        StringIO(_SBDB_FIELDS_CSV),
+        dtype={"column": str, "ignore": bool, "aonly": bool, "conly": bool, "simple": bool, "dtype": str}
+    )
+    df["dtype"] = df["dtype"].map({"i": int, "f": float, "s": str})
+    return df
+
+
+@cache
+def _sbdb_fields():
+    sbdb_fields = {}
+    for _name, _query in zip(["*", "all", "ignore", "simple", "simple_ast", "simple_com", "all_ast", "all_com"],
+                             ["~ignore", "~ignore", "ignore", "simple", "simple & ~conly", "simple & ~aonly",
+                              "~ignore & ~conly", "~ignore & ~aonly"]):
+        _df = _sbdb_fields_table().query(_query)
+        sbdb_fields[_name] = {c: t for c, t in zip(_df["column"], _df["dtype"])}
+    return sbdb_fields
+
 
-SBDB_FIELDS = {}
-for _name, _query in zip(["*", "all", "ignore", "simple", "simple_ast", "simple_com", "all_ast", "all_com"],
-                         ["~ignore", "~ignore", "ignore", "simple", "simple & ~conly", "simple & ~aonly",
-                          "~ignore & ~conly", "~ignore & ~aonly"]):
-    _df = _SBDB_FIELDS.query(_query)
-    SBDB_FIELDS[_name] = {c: t for c, t in zip(_df["column"], _df["dtype"])}
+def __getattr__(name):
+    if name == "SBDB_FIELDS":
+        return _sbdb_fields()
+    if name == "_SBDB_FIELDS":
+        return _sbdb_fields_table()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def download_jpl_de(dename="de440s", output=None, overwrite=False):
@@ -343,7 +367,7 @@ class SBDBQuery:
 
         else:
             try:
-                self.fields = list(SBDB_FIELDS[fields].keys())
+                self.fields = list(_sbdb_fields()[fields].keys())
                 params["fields"] = ",".join(self.fields)
                 if isinstance(fields, str):
                     if fields.endswith("ast"):
@@ -432,7 +456,8 @@ class SBDBQuery:
 
         self._params = params
 
-    def query(self, output_parq=None, compression="gzip", sanitize_comet=False, col2kete=False, **kwargs):
+    def query(self, output_parq=None, compression="gzip", sanitize_comet=False, col2kete=False,
+              output_feather=None, **kwargs):
         """Query SBDB and return the DataFrame.
 
         Parameters
@@ -453,6 +478,12 @@ class SBDBQuery:
 
             Thus, the query should have had
 
+        output_feather : str, optional
+            If provided, also save the DataFrame to a memory-mappable Feather
+            file with the low-cardinality string columns dictionary-encoded
+            (see `~spicetools.catalog.write_catalog`), which is much faster to
+            load than the parquet file.
+
         kwargs : dict, optional
             Additional keyword arguments to pass to `pd.DataFrame.to_parquet`.
 
@@ -461,17 +492,7 @@ class SBDBQuery:
         if not response.ok:
             raise ValueError(f"Query failed: {response.text}")
 
-        data = response.json()
-        if (ver := data["signature"]["version"]) != "1.0":
-            raise ValueError(f"Only ver 1.0 is supported but got {ver}")
-
-        try:
-            self.df = pd.DataFrame(data["data"], columns=data["fields"])
-            for c in self.df.columns:
-                self.df[c] = self.df[c].astype(SBDB_FIELDS["*"][c])
-
-        except Exception as e:
-            raise ValueError(f"Failed to create DataFrame: {e}")
+        self.df = sbdb_json2df(response.json())
 
         if sanitize_comet:
             for col in ["prefix", "M1", "M2", "K1", "K2", "PC", "soln_date", "two_body"]:
@@ -496,9 +517,69 @@ class SBDBQuery:
                 output_parq, compression=compression, index=False, **kwargs
             )
 
+        if output_feather is not None:
+            write_catalog(self.df, output_feather)
+
         return self.df
 
 
+def sbdb_json2df(data):
+    """Convert the SBDB Query API (ver 1.0) JSON response to a DataFrame.
+
+    Parameters
+    ----------
+    data : dict
+        The JSON response (e.g., ``response.json()``).
+
+    Returns
+    -------
+    df : pd.DataFrame
+        The DataFrame with the dtypes in ``SBDB_FIELDS["*"]``.
+    """
+    if (ver := data["signature"]["version"]) != "1.0":
+        raise ValueError(f"Only ver 1.0 is supported but got {ver}")
+
+    try:
+        df = pd.DataFrame(data["data"], columns=data["fields"])
+        for c in df.columns:
+            df[c] = df[c].astype(_sbdb_fields()["*"][c])
+    except Exception as e:
+        raise ValueError(f"Failed to create DataFrame: {e}")
+    return df
+
+
+# base64-encoded "DAF/SP" (the beginning of "DAF/SPK" file ID word)
+SPK_B64_MAGIC = "REFGL1NQ"
+
+
+def decode_spk(text):
+    """Decode the base64-encoded SPK from JPL Horizons.
+
+    Parameters
+    ----------
+    text : str
+        The ``"spk"`` value of the JSON response, or the whole response in
+        the text format (``format=text``), where everything before the first
+        ``"REFGL1NQ"`` is ignored.
+
+    Returns
+    -------
+    spk : bytes
+        The binary SPK (DAF) content.
+
+    Raises
+    ------
+    ValueError
+        If `text` does not contain the SPK or it is not properly encoded
+        (e.g., ``Incorrect padding`` for truncated downloads).
+    """
+    try:
+        b64 = SPK_B64_MAGIC + text.split(SPK_B64_MAGIC, 1)[1]
+    except IndexError:
+        raise ValueError("Invalid SPK data: REFGL1NQ (DAF/SPK) not found.") from None
+    return base64.b64decode(b64)
+
+
 class HorizonsSPKQuery:
     """Class to handle JPL Horizons SPK queries."""
 
@@ -553,10 +634,10 @@ class HorizonsSPKQuery:
         # If the request was valid...
         try:
             self.spk = data["spk"]
-            if not self.spk.startswith("REFGL1NQ"):
+            if not self.spk.startswith(SPK_B64_MAGIC):
                 raise ValueError("Invalid SPK data: It does not start with REFGL1NQ (DAF/SPK).")
             if decode:
-                self.spk = base64.b64decode(self.spk)
+                self.spk = decode_spk(self.spk)
         except KeyError:
             raise ValueError(f"The key 'spk' is not found in the response: {data}")
 
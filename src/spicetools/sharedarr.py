@@ -0,0 +1,243 @@
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .clut import read_clut
+
+
+__all__ = ["SharedArrays", "share_clut", "share_catalog"]
+
+
+# Offsets of the arrays in the buffer are aligned to this (bytes):
+_ALIGN = 64
+
+# Arrays attached in this process, by the buffer name (shm name or file path),
+# so that the tasks sent to a worker re-use one mapping:
+_ATTACHED = {}
+
+
+def _layout(arrays):
+    """The spec entries ``{key: (dtype.str, shape, offset)}`` & the total size."""
+    entries, offset = {}, 0
+    for key, arr in arrays.items():
+        entries[key] = (arr.dtype.str, arr.shape, offset)
+        offset += -(-arr.nbytes//_ALIGN)*_ALIGN
+    return entries, max(offset, 1)
+
+
+class SharedArrays(Mapping):
+    """Named NumPy arrays in one shared memory block or memory-mapped file.
+
+    The arrays are copied once (`create`) into the buffer, and other
+    processes get zero-copy, read-only views by the `spec` (a small
+    picklable dict). A `SharedArrays` itself is picklable as its `spec`, so it
+    can be passed directly as an argument (e.g., ``initargs`` of
+    ``ProcessPoolExecutor``), and each worker maps the buffer only once.
+
+    Use it as a `dict` of arrays: ``shared["pos"]``.
+
+    Parameters
+    ----------
+    spec : dict
+        The `spec` of the arrays (to attach to existing arrays). Use
+        `create` to make new ones.
+
+    Notes
+    -----
+    The shared memory block lives until the creator calls `unlink` (or
+    exits the ``with`` block), so the creator must outlive the workers. The
+    processes attaching to it should be the children of the creator (e.g.,
+    `multiprocessing` or `concurrent.futures` workers), which share its
+    resource tracker. The memory-mapped file (``path`` in `create`) has no
+    such restriction, but its pages are shared only through the page cache.
+
+    Examples
+    --------
+    >>> with share_clut("clut.parq") as shared:
+    ...     with ProcessPoolExecutor(16, initializer=init, initargs=(shared,)) as pool:
+    ...         ...  # `init` keeps `shared` in a global; shared["pos"] is the CLUT
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self._owner = False
+        if spec["shm"] is not None:
+            self._shm = shared_memory.SharedMemory(name=spec["shm"])
+            buf = self._shm.buf
+        else:
+            self._shm = None
+            buf = np.memmap(spec["path"], dtype=np.uint8, mode="r")
+        self._arrays = {}
+        for key, (dtype, shape, offset) in spec["arrays"].items():
+            arr = np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+            arr.flags.writeable = False
+            self._arrays[key] = arr
+
+    @classmethod
+    def create(cls, arrays, path=None):
+        """Copy arrays into a new shared memory block (or a new file).
+
+        Parameters
+        ----------
+        arrays : dict of array-like
+            The arrays by name. Object (e.g., string) arrays are not
+            supported.
+
+        path : str, path-like, optional
+            If given, the arrays are written to this file and memory-mapped
+            instead of the shared memory (e.g., if ``/dev/shm`` is small).
+            The file is overwritten if exists.
+
+        Returns
+        -------
+        shared : SharedArrays
+            The shared arrays. With the shared memory, they are writable
+            in the creator (read-only when attached by other processes).
+            With `path`, they are read-only everywhere (the file is written
+            only here).
+        """
+        arrays = {str(k): np.ascontiguousarray(v) for k, v in arrays.items()}
+        for key, arr in arrays.items():
+            if arr.dtype.hasobject:
+                raise TypeError(f"Array {key!r} of dtype {arr.dtype} cannot be shared.")
+        entries, size = _layout(arrays)
+        if path is None:
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            spec = {"shm": shm.name, "path": None, "arrays": entries}
+            buf = shm.buf
+        else:
+            shm = None
+            spec = {"shm": None, "path": str(path), "arrays": entries}
+            buf = np.memmap(path, dtype=np.uint8, mode="w+", shape=(size,))
+
+        for key, arr in arrays.items():
+            _, _, offset = entries[key]
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=buf, offset=offset)[...] = arr
+        if shm is None:
+            buf.flush()
+            del buf
+        else:
+            shm.close()
+
+        self = cls(spec)
+        self._owner = True
+        if self._shm is not None:
+            for arr in self._arrays.values():
+                arr.flags.writeable = True
+        return self
+
+    @property
+    def nbytes(self):
+        """Total bytes of the arrays."""
+        return sum(arr.nbytes for arr in self._arrays.values())
+
+    def __getitem__(self, key):
+        return self._arrays[key]
+
+    def __iter__(self):
+        return iter(self._arrays)
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def __repr__(self):
+        where = f"shm={self.spec['shm']!r}" if self._shm is not None else f"path={self.spec['path']!r}"
+        shapes = ", ".join(f"{k}: {v.dtype}{list(v.shape)}" for k, v in self._arrays.items())
+        return f"SharedArrays({where}; {shapes})"
+
+    def __reduce__(self):
+        return _attach, (self.spec,)
+
+    def close(self):
+        """Release the views of this process (the arrays become invalid)."""
+        self._arrays = {}
+        if self._shm is not None:
+            try:
+                self._shm.close()
+            except BufferError:  # views still referenced; unmapped when collected
+                pass
+        _ATTACHED.pop(self.spec["shm"] or self.spec["path"], None)
+
+    def unlink(self):
+        """Free the shared memory block (creator only; the file is kept)."""
+        self.close()
+        if self._owner and self._shm is not None:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink() if self._owner else self.close()
+        return False
+
+
+def _attach(spec):
+    """Attach to the arrays of `spec` (once per process)."""
+    key = spec["shm"] or spec["path"]
+    if key not in _ATTACHED:
+        _ATTACHED[key] = SharedArrays(spec)
+    return _ATTACHED[key]
+
+
+def share_clut(path, spkids=None, mmap_path=None):
+    """Read the CLUT parquet file into shared arrays.
+
+    Parameters
+    ----------
+    path : str, path-like
+        Path to the CLUT parquet file.
+
+    spkids : array-like of int, optional
+        See `~spicetools.clut.read_clut`.
+
+    mmap_path : str, path-like, optional
+        See ``path`` of `SharedArrays.create`.
+
+    Returns
+    -------
+    shared : SharedArrays
+        The arrays ``"spkids"`` and ``"pos"`` (float32, ``(N_obj, N_et,
+        3)``).
+    """
+    _spkids, pos = read_clut(path, spkids=spkids)
+    return SharedArrays.create({"spkids": _spkids, "pos": pos}, path=mmap_path)
+
+
+def share_catalog(df, columns=None, mmap_path=None):
+    """Put the numeric columns of a catalog into shared arrays.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The catalog, e.g., from `~spicetools.queryutil.SBDBQuery`.
+
+    columns : list of str, optional
+        Columns to share. Default is all numeric (and boolean) columns, e.g.,
+        ``"spkid"``, ``"H"``, ``"G"``, and the orbital elements.
+
+    mmap_path : str, path-like, optional
+        See ``path`` of `SharedArrays.create`.
+
+    Returns
+    -------
+    shared : SharedArrays
+        One array per column (nullable integer columns with missing values
+        become float64 with `np.nan`).
+    """
+    if columns is None:
+        columns = [c for c in df.columns
+                   if pd.api.types.is_numeric_dtype(df[c]) or pd.api.types.is_bool_dtype(df[c])]
+    arrays = {}
+    for col in columns:
+        ser = df[col]
+        if not (pd.api.types.is_numeric_dtype(ser) or pd.api.types.is_bool_dtype(ser)):
+            raise TypeError(f"Column {col!r} is not numeric.")
+        if ser.hasnans:
+            arrays[col] = ser.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            arrays[col] = ser.to_numpy(dtype=ser.dtype.numpy_dtype
+                                       if hasattr(ser.dtype, "numpy_dtype") else ser.dtype)
+    return SharedArrays.create(arrays, path=mmap_path)
@@ -0,0 +1,200 @@
+import os
+import tarfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from .bspstore import DAF_SPK_IDWORD, check_daf
+from .jobs import atomic_path
+from .queryutil import decode_spk
+
+
+__all__ = ["find_spk_texts", "convert_spk_texts"]
+
+
+# Outputs of `convert_spk_texts` in ``archive_dir``:
+ARCHIVE_INDEX = "_index.parquet"  # source -> shard & member (& tar offset)
+BAD_FILES = "_bad_files.csv"  # source, error
+
+_REPORT_COLUMNS = ["source", "output", "ok", "error", "size"]
+
+
+def find_spk_texts(src_dir, patterns=("spk*.txt", "spk*.zip")):
+    """Find the downloaded Horizons SPK responses (recursively).
+
+    Parameters
+    ----------
+    src_dir : str, path-like
+        The directory of the downloads (e.g., ``_spktxts`` with the ``a/``
+        and ``c/`` subdirectories in 01-astbsp_download).
+
+    patterns : tuple of str, optional
+        Glob patterns of the files: the text responses and the ZIP files of
+        one text response each.
+
+    Returns
+    -------
+    sources : list of str
+        Paths relative to `src_dir` (sorted).
+    """
+    src_dir = Path(src_dir)
+    return sorted({str(p.relative_to(src_dir)) for pat in patterns for p in src_dir.rglob(pat)})
+
+
+def _read_text(path):
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path) as z:
+            return z.read(z.namelist()[0]).decode()
+    return path.read_text()
+
+
+def _convert_batch(src_dir, bsp_dir, sources, full_check, overwrite):
+    """Decode a batch of sources (in a worker): rows of the report."""
+    rows = []
+    for src in sources:
+        output = (bsp_dir / src).with_suffix(".bsp")
+        if output.exists() and not overwrite:
+            rows.append((src, str(output), True, None, output.stat().st_size))
+            continue
+        try:
+            data = decode_spk(_read_text(src_dir / src))
+            # A DAF file is at least 3 records (file record, summary, names):
+            if data[:8] != DAF_SPK_IDWORD or len(data) < 3*1024:
+                raise ValueError("Not a DAF/SPK file (invalid ID word or too short).")
+            output.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_path(output) as tmp:
+                tmp.write_bytes(data)
+                if full_check and not check_daf(tmp):
+                    raise ValueError("Invalid DAF/SPK file (segments cannot be read).")
+            rows.append((src, str(output), True, None, len(data)))
+        except Exception as e:  # e.g., binascii.Error: Incorrect padding
+            rows.append((src, None, False, f"{type(e).__name__}: {e}", None))
+    return rows
+
+
+def _archive_shard(src_dir, sources, shard_path, fmt):
+    """Archive a batch of sources into one shard (in a worker): index rows."""
+    rows = []
+    with atomic_path(shard_path) as tmp:
+        if fmt == "tar":
+            with tarfile.open(tmp, "w") as tar:
+                for src in sources:
+                    tar.add(src_dir / src, arcname=src)
+            with tarfile.open(tmp, "r") as tar:  # offsets for the direct access
+                for info in tar:
+                    rows.append((info.name, shard_path.name, info.name, info.offset_data, info.size))
+        else:
+            with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as z:
+                for src in sources:
+                    z.write(src_dir / src, arcname=src)
+                    rows.append((src, shard_path.name, src, -1, (src_dir / src).stat().st_size))
+    return rows
+
+
+def convert_spk_texts(src_dir, bsp_dir, archive_dir=None, sources=None, fmt="tar", shard_size=100000,
+                      batch_size=1000, full_check=False, overwrite=False, delete=False, processes=None):
+    """Decode downloaded Horizons SPK responses to BSP files in parallel.
+
+    Each response (text or single-file ZIP) is base64-decoded to
+    ``bsp_dir/<relative path>.bsp`` (e.g., ``_spktxts/a/spk2000001.txt`` ->
+    ``spkbsp/a/spk2000001.bsp`` for ``src_dir="_spktxts"`` and
+    ``bsp_dir="spkbsp"``), and its DAF header is validated. Optionally, the
+    successfully decoded sources are archived into a few large shards
+    (instead of one ZIP per object) with an index.
+
+    Parameters
+    ----------
+    src_dir : str, path-like
+        The directory of the downloads.
+
+    bsp_dir : str, path-like
+        The output directory of the BSP files.
+
+    archive_dir : str, path-like, optional
+        If given, the sources decoded successfully are archived into
+        ``archive_dir/sources_<NNNNN>.tar`` (or ``.zip``), with the index
+        ``_index.parquet`` (columns ``"source"``, ``"shard"``, ``"member"``,
+        ``"offset"`` of the data in the tar file (``-1`` for zip), and
+        ``"size"``). The sources already in the index are not archived
+        again. The list of bad files ``_bad_files.csv`` is also saved here.
+
+    sources : list of str, optional
+        The paths (relative to `src_dir`) to convert. Default is all files
+        found by `find_spk_texts`.
+
+    fmt : {"tar", "zip"}, optional
+        Format of the archive shards. ``"tar"`` (uncompressed; each member
+        can be read directly by its offset) or ``"zip"`` (deflated).
+
+    shard_size : int, optional
+        Maximum number of sources per archive shard.
+
+    batch_size : int, optional
+        Number of sources per task of the workers.
+
+    full_check : bool, optional
+        If `True`, each BSP file is also opened by SPICE to read its
+        segments (`~spicetools.bspstore.check_daf`), which is slower.
+        Otherwise, only the DAF/SPK ID word and the size are checked.
+
+    overwrite : bool, optional
+        If `False` (default), the sources whose BSP file exists are not
+        decoded again (so the call can be repeated while downloading).
+
+    delete : bool, optional
+        If `True`, the sources are deleted after being archived (requires
+        `archive_dir`). The bad files are never deleted.
+
+    processes : int, optional
+        Number of worker processes. Default is `None` (number of CPUs).
+
+    Returns
+    -------
+    report : pd.DataFrame
+        One row per source with the columns ``"source"``, ``"output"`` (the
+        BSP path), ``"ok"``, ``"error"`` (message for the bad files, which
+        should be downloaded again), and ``"size"`` (of the BSP file).
+    """
+    if fmt not in ("tar", "zip"):
+        raise ValueError(f"`fmt` must be 'tar' or 'zip', not {fmt!r}.")
+    if delete and archive_dir is None:
+        raise ValueError("`delete=True` requires `archive_dir`.")
+    src_dir, bsp_dir = Path(src_dir), Path(bsp_dir)
+    if sources is None:
+        sources = find_spk_texts(src_dir)
+    sources = [str(s) for s in sources]
+    batches = [sources[i:i + batch_size] for i in range(0, len(sources), batch_size)]
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = pool.map(_convert_batch, [src_dir]*len(batches), [bsp_dir]*len(batches),
+                           batches, [full_check]*len(batches), [overwrite]*len(batches))
+        report = pd.DataFrame([row for rows in results for row in rows], columns=_REPORT_COLUMNS)
+
+        if archive_dir is not None:
+            archive_dir = Path(archive_dir)
+            archive_dir.mkdir(parents=True, exist_ok=True)
+            report.loc[~report["ok"], ["source", "error"]].to_csv(archive_dir / BAD_FILES, index=False)
+            old_index = None
+            if (archive_dir / ARCHIVE_INDEX).exists():
+                old_index = pd.read_parquet(archive_dir / ARCHIVE_INDEX)
+            # The sources already archived (e.g., by a previous call with
+            # ``delete=False``) are not archived again:
+            archived = set() if old_index is None else set(old_index["source"])
+            good = [src for src in report.loc[report["ok"], "source"] if src not in archived]
+            # New shards are numbered after the existing ones (repeated calls):
+            start = len(list(archive_dir.glob(f"sources_*.{fmt}")))
+            shards = [good[i:i + shard_size] for i in range(0, len(good), shard_size)]
+            paths = [archive_dir / f"sources_{start + k:05d}.{fmt}" for k in range(len(shards))]
+            results = pool.map(_archive_shard, [src_dir]*len(shards), shards, paths, [fmt]*len(shards))
+            index = pd.DataFrame([row for rows in results for row in rows],
+                                 columns=["source", "shard", "member", "offset", "size"])
+            if old_index is not None:
+                index = pd.concat([old_index, index], ignore_index=True)
+            with atomic_path(archive_dir / ARCHIVE_INDEX) as tmp:
+                index.to_parquet(tmp, index=False)
+            if delete:
+                for src in good:
+                    os.unlink(src_dir / src)
+    return report
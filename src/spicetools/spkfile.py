@@ -0,0 +1,192 @@
+import ctypes
+
+import numpy as np
+import pandas as pd
+import spiceypy as sp
+
+from .fastfunc import _check_failed, spkgps_batch
+from .frames import frame_rotation
+from .instrument import INSTRUMENT
+from .typeutil import box_doubles
+
+
+__all__ = ["spk_segments", "spkgps_file"]
+
+
+_SEGMENT_COLUMNS = ["spkid", "center", "frame", "type", "et_start", "et_stop"]
+
+
+def _read_segments(handle):
+    """Segment summaries (in file order) & packed descriptors of a loaded SPK."""
+    rows, descrs = [], []
+    sp.dafbfs(handle)
+    while sp.daffna():
+        descr = sp.dafgs(5)  # ND=2, NI=6 -> 2 + (6 + 1)//2 = 5 doubles
+        (et_start, et_stop), ic = sp.dafus(descr, 2, 6)
+        rows.append((ic[0], ic[1], ic[2], ic[3], et_start, et_stop))
+        descrs.append(np.array(descr, dtype=np.float64))
+    segs = pd.DataFrame(rows, columns=_SEGMENT_COLUMNS).astype(
+        {"spkid": np.int64, "center": np.int64, "frame": np.int64, "type": np.int64}
+    )
+    return segs, np.array(descrs, dtype=np.float64).reshape(-1, 5)
+
+
+def spk_segments(path):
+    """Segment summaries of an SPK file.
+
+    Parameters
+    ----------
+    path : str, path-like
+        Path to the SPK file.
+
+    Returns
+    -------
+    segs : pd.DataFrame
+        One row per segment (in file order) with the columns ``"spkid"``
+        (target), ``"center"``, ``"frame"`` (frame ID code), ``"type"`` (SPK
+        data type), ``"et_start"``, and ``"et_stop"``.
+    """
+    handle = sp.dafopr(str(path))
+    try:
+        return _read_segments(handle)[0]
+    finally:
+        sp.dafcls(handle)
+
+
+def spkgps_file(path, ets, ref="J2000", obs=0, spkids=None, out=None):
+    """Positions of all (or selected) objects of an SPK file in one pass.
+
+    Unlike `~spicetools.fastfunc.spkgps_batch` (``spkgps`` for each target
+    and epoch), the segments of the file are read once and evaluated
+    directly (``spkpvn``) without searching the loaded kernels. The position
+    of each segment center relative to `obs` and the frame rotation are
+    computed only once per unique center/frame for all targets, e.g., the
+    Sun relative to the geocenter for thousands of heliocentric asteroids.
+
+    Parameters
+    ----------
+    path : str, path-like
+        Path to the SPK file with many objects (e.g., a consolidated kernel
+        or a multi-object Horizons SPK). It is loaded during the call only.
+
+    ets : float or array-like of float
+        Epochs in ET.
+
+    ref : str, optional
+        Reference frame of the output. Default is ``"J2000"``.
+
+    obs : int, optional
+        Observer SPKID. Default is ``0`` (solar system barycenter). The
+        kernels connecting the segment centers to `obs` (e.g., DE) must be
+        loaded, unless the centers are `obs` itself.
+
+    spkids : array-like of int, optional
+        Objects to evaluate (output in this order). Default is all targets in
+        the file (sorted).
+
+    out : np.ndarray, optional
+        The C-contiguous float64 array of shape ``(N_targ, N_et, 3)`` to
+        write the results into.
+
+    Returns
+    -------
+    spkids : np.ndarray
+        SPKIDs of the rows of `pos`.
+
+    pos : np.ndarray
+        Geometric positions (km) of shape ``(N_targ, N_et, 3)``. `np.nan` at
+        the epochs not covered by the file (objects not in the file are all
+        `np.nan`). If any SPICE error occurs for an object (e.g., the segment
+        center cannot be connected to `obs`), its positions at all epochs are
+        `np.nan`.
+    """
+    ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+    n_et = len(ets)
+    with INSTRUMENT.timer("kernel.load"):
+        handle = sp.spklef(str(path))
+    try:
+        segs, descrs = _read_segments(handle)
+        if spkids is None:
+            spkids = np.unique(segs["spkid"])
+        spkids = np.atleast_1d(np.asarray(spkids, dtype=np.int64))
+        if out is None:
+            out = np.empty((len(spkids), n_et, 3))
+        elif out.shape != (len(spkids), n_et, 3) or out.dtype != np.float64 or not out.flags.c_contiguous:
+            raise ValueError("`out` must be a C-contiguous float64 array of shape (N_targ, N_et, 3).")
+        out[:] = np.nan
+        # Segment index used at each (target, epoch):
+        iseg = np.full((len(spkids), n_et), -1, dtype=np.int64)
+        with INSTRUMENT.timer("spkfile.evaluate"):
+            _evaluate(handle, segs, descrs, spkids, ets, out, iseg)
+    finally:
+        with INSTRUMENT.timer("kernel.unload"):
+            sp.spkuef(handle)
+
+    with INSTRUMENT.timer("spkfile.connect"):
+        _connect(segs, spkids, ets, ref, obs, out, iseg)
+    return spkids, out
+
+
+def _evaluate(handle, segs, descrs, spkids, ets, out, iseg):
+    """Segment-relative positions in the segment frames."""
+    _handle = ctypes.c_int(handle)
+    _ets = box_doubles(ets)
+    _frame = ctypes.byref(ctypes.c_int())
+    _center = ctypes.byref(ctypes.c_int())
+    _buf = np.empty((len(ets), 6))
+    _states = (ctypes.c_double*6*len(ets)).from_buffer(_buf)  # written directly by spkpvn_c
+    _spkpvn_c = sp.libspice.spkpvn_c
+    seg_spkids = segs["spkid"].to_numpy()
+    et_start = segs["et_start"].to_numpy()
+    et_stop = segs["et_stop"].to_numpy()
+    n_call = 0
+    _check_failed()
+    for i, spkid in enumerate(spkids):
+        todo = np.ones(len(ets), dtype=bool)
+        # Later segments in a file take precedence (same as SPICE):
+        for k in np.flatnonzero(seg_spkids == spkid)[::-1]:
+            use = todo & (ets >= et_start[k]) & (ets <= et_stop[k])
+            if not use.any():
+                continue
+            _descr = (ctypes.c_double*5)(*descrs[k])
+            for j in np.flatnonzero(use).tolist():
+                _spkpvn_c(_handle, _descr, _ets[j], _frame, _states[j], _center)
+            out[i, use] = _buf[use, :3]
+            n_call += int(use.sum())
+            iseg[i, use] = k
+            todo &= ~use
+            if not todo.any():
+                break
+        if _check_failed():
+            out[i] = np.nan
+            iseg[i] = -1
+            INSTRUMENT.count("fastfunc.failed_targets")
+    INSTRUMENT.count("spkfile.spkpvn_c", n_call)
+
+
+def _connect(segs, spkids, ets, ref, obs, out, iseg):
+    """Rotate to `ref` & add the center positions relative to `obs` (in place)."""
+    used = iseg >= 0
+    centers = np.full(iseg.shape, -1, dtype=np.int64)
+    frames = np.full(iseg.shape, 0, dtype=np.int64)
+    centers[used] = segs["center"].to_numpy()[iseg[used]]
+    frames[used] = segs["frame"].to_numpy()[iseg[used]]
+    ets2d = np.broadcast_to(ets, iseg.shape)
+
+    for frame in np.unique(frames[used]):
+        mask = used & (frames == frame)
+        rot = frame_rotation(sp.frmnam(int(frame)), ref, ets2d[mask])
+        if rot.ndim == 2:
+            out[mask] = out[mask] @ rot.T
+        else:
+            out[mask] = np.einsum("...ij,...j->...i", rot, out[mask])
+
+    for center in np.unique(centers[used]):
+        if center == obs:
+            continue
+        mask = used & (centers == center)
+        # Once per center (not per target), only at the epochs needed:
+        jet = np.flatnonzero(mask.any(axis=0))
+        cpos = np.full((len(ets), 3), np.nan)
+        cpos[jet] = spkgps_batch(int(center), ets[jet], ref, obs)[0]
+        out[mask] += np.broadcast_to(cpos, out.shape)[mask]
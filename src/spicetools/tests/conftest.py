@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from spicetools.constants import AU2KM
+
+
+@pytest.fixture(scope="session")
+def fake_earth_bsp(tmp_path_factory):
+    """Type 9 SPK of a fake "Earth" (399) in a circular orbit around the Sun.
+
+    The Sun is fixed at the solar system barycenter (also saved) so that
+    aberration corrections can be used. It covers the bundled ``spk3200_*.bsp`` so that geocentric calculations
+    can be tested without downloading the DE kernel.
+    """
+    path = tmp_path_factory.mktemp("fake_de") / "fake_earth.bsp"
+    ets = np.arange(-3e6, 3.2e7 + 86400, 86400.0)
+    omega = 2*np.pi/(365.25*86400)
+    states = np.array([[AU2KM*np.cos(omega*et), AU2KM*np.sin(omega*et), 0,
+                        -AU2KM*omega*np.sin(omega*et), AU2KM*omega*np.cos(omega*et), 0]
+                       for et in ets])
+    handle = sp.spkopn(str(path), "FAKE", 0)
+    sp.spkw09(handle, 399, 10, "ECLIPJ2000", ets[0], ets[-1], "FAKE", 7, len(ets), states, ets)
+    sp.spkw09(handle, 10, 0, "ECLIPJ2000", ets[0], ets[-1], "FAKE", 7, len(ets), 0*states, ets)
+    sp.spkcls(handle)
+    return str(path)
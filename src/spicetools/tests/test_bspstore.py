@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pytest
+
+from spicetools.bspstore import BSPStore, check_daf
+from spicetools.kernelutil import DEFAULT_KERNELS
+
+BSP_3200 = DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp"
+SPKID = 20003200
+
+
+def test_check_daf(tmp_path):
+    coverage = check_daf(BSP_3200)
+    assert list(coverage) == [SPKID]
+    np.testing.assert_allclose(coverage[SPKID], (-2721600, 31579200))
+
+    (tmp_path / "error.bsp").write_text("Cannot find the object")
+    assert check_daf(tmp_path / "error.bsp") is None
+    (tmp_path / "trunc.bsp").write_bytes(BSP_3200.read_bytes()[:2048])
+    assert check_daf(tmp_path / "trunc.bsp") is None
+    assert check_daf(tmp_path / "missing.bsp") is None
+
+
+def test_store(tmp_path):
+    store = BSPStore(tmp_path / "store")
+    entry = store.add(BSP_3200, soln_date="2024-01-01")
+    assert entry["new"] and entry["valid"] and entry["spkid"] == SPKID
+    assert store.path(SPKID).read_bytes() == BSP_3200.read_bytes()
+    assert BSP_3200.exists()
+
+    # Same content is stored only once:
+    entry = store.add_bytes(BSP_3200.read_bytes(), soln_date="2024-06-01")
+    assert not entry["new"]
+    assert len(list((tmp_path / "store" / "objects").rglob("*.bsp"))) == 1
+    assert store.index()["soln_date"].tolist() == ["2024-06-01"]
+    assert not list((tmp_path / "store").glob("*.bsp"))  # temporary file removed
+
+    # Invalid files are indexed but not stored:
+    entry = store.add_bytes(b"Error", spkid=2000001)
+    assert not entry["valid"]
+    assert store.path(2000001) is None
+    assert len(store.index(latest=False)) == 2
+    with pytest.raises(ValueError):
+        store.add_bytes(b"Error")
+    assert not list((tmp_path / "store").glob("*.bsp"))
+
+    # Invalid sources are not removed even with `move=True`:
+    (tmp_path / "error.bsp").write_text("Error")
+    assert not store.add(tmp_path / "error.bsp", spkid=2000001, move=True)["valid"]
+    assert (tmp_path / "error.bsp").exists()
+    assert len(store.index(latest=False)) == 2
+
+    np.testing.assert_array_equal(
+        store.stale([SPKID, 2000001, 2000002], ["2024-06-01", "x", "x"]), [2000001, 2000002]
+    )
+    np.testing.assert_array_equal(store.stale([SPKID], ["2024-07-01"]), [SPKID])
+    np.testing.assert_array_equal(store.stale([SPKID]), [])
+
+    paths = store.export(tmp_path / "bsp")
+    assert [p.name for p in paths] == [f"spk{SPKID}.bsp"]
+    assert os.path.samefile(paths[0], store.path(SPKID))
+    assert store.export(tmp_path / "bsp") == paths
+    assert store.verify() == []
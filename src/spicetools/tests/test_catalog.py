@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from spicetools.catalog import SBDBCatalog, write_catalog
+
+
+@pytest.fixture
+def catalog_df():
+    return pd.DataFrame({
+        "spkid": [20000001, 20000002, 20000003, 1000001, 1000002],
+        "pdes": ["1", "2", "3", "1P", "2P"],
+        "kind": ["an", "an", "au", "cn", "cn"],
+        "condition_code": ["0", "E", "9", "1", "2"],
+        "H": [3.3, 4.1, np.nan, np.nan, np.nan],
+        "G": [0.12, 0.11, np.nan, np.nan, np.nan],
+        "M1": [np.nan, np.nan, np.nan, 5.5, np.nan],
+        "K1": [np.nan, np.nan, np.nan, np.nan, 11.0],
+        "data_arc": [80000, 70000, 3, 30000, 0],
+        "class": ["MBA", "MBA", "APO", "HTC", "JFc"],
+    })
+
+
+@pytest.mark.parametrize("compression", ["uncompressed", "lz4"])
+def test_write_catalog(tmp_path, catalog_df, compression):
+    write_catalog(catalog_df, tmp_path / "sbdb.feather", compression=compression)
+    cat = SBDBCatalog(tmp_path / "sbdb.feather")
+    assert len(cat) == 5
+    assert cat.columns == list(catalog_df.columns)
+    for col in ["kind", "condition_code", "class"]:
+        assert pa.types.is_dictionary(cat.table.schema.field(col).type)
+    assert not pa.types.is_dictionary(cat.table.schema.field("pdes").type)
+    np.testing.assert_array_equal(cat.column("spkid"), catalog_df["spkid"])
+    np.testing.assert_array_equal(cat.column("class"), catalog_df["class"])
+    df = cat.select().to_pandas()
+    assert isinstance(df["kind"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(df.astype({c: str for c in ["kind", "condition_code", "class"]}),
+                                  catalog_df)
+
+
+def test_select(tmp_path, catalog_df):
+    write_catalog(catalog_df, tmp_path / "sbdb.feather")
+    cat = SBDBCatalog(tmp_path / "sbdb.feather")
+    # The asteroid and comet filters of 02-CLUT:
+    ast = cat.select(["spkid", "H"], condition_codes="0123456789", h_max=100)
+    assert ast.column_names == ["spkid", "H"]
+    assert ast["spkid"].to_pylist() == [20000001]
+    com = cat.select(["spkid"], condition_codes="0123456789", data_arc_min=0, comet_mag_max=100)
+    assert com["spkid"].to_pylist() == [1000001]
+    assert cat.mask(comet_mag_max=100).to_pylist() == [False, False, False, True, True]
+    assert len(cat.select()) == 5
+
+    write_catalog(catalog_df.drop(columns=["M1", "K1"]), tmp_path / "ast.feather")
+    with pytest.raises(KeyError):
+        SBDBCatalog(tmp_path / "ast.feather").select(comet_mag_max=100)
@@ -0,0 +1,67 @@
+import shutil
+
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from spicetools.clut import compute_clut, interp_clut, read_clut, write_clut
+from spicetools.fastfunc import spkgps_batch
+from spicetools.kernelutil import DEFAULT_KERNELS
+
+ETS = np.arange(5)*86400.0
+BSP_3200 = DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp"
+
+
+@pytest.fixture(scope="module")
+def setup_lsk():
+    lsk = str(DEFAULT_KERNELS / "lsk" / "naif0012.tls")
+    sp.furnsh(lsk)
+    yield lsk
+    sp.unload(lsk)
+
+
+def test_compute_clut(setup_lsk, tmp_path):
+    shutil.copy(BSP_3200, tmp_path / "spk20003200.bsp")
+    spkids, pos, no_file, error = compute_clut(
+        [2000001, 20003200], ETS, bsp_fmt=str(tmp_path / "spk{spkid}.bsp"), ref="ECLIPJ2000", obs=10
+    )
+    assert no_file == [2000001]
+    assert error == []
+    np.testing.assert_array_equal(spkids, [20003200])
+    assert pos.shape == (1, len(ETS), 3)
+    assert pos.dtype == np.float32
+    np.testing.assert_allclose(pos[0], spkgps_batch_loaded(BSP_3200), rtol=1e-6)
+    # kernel is unloaded after the calculation:
+    assert np.all(np.isnan(spkgps_batch(20003200, ETS, "ECLIPJ2000", 10)))
+
+
+def spkgps_batch_loaded(path):
+    sp.furnsh(str(path))
+    res = spkgps_batch(20003200, ETS, "ECLIPJ2000", 10)[0]
+    sp.unload(str(path))
+    return res
+
+
+def test_write_read_clut(tmp_path):
+    rng = np.random.default_rng(0)
+    pos = rng.normal(size=(4, 3, 3)).astype(np.float32)
+    spkids = np.array([1, 2, 3, 4])
+    write_clut(tmp_path / "clut.parq", spkids, pos)
+    _spkids, _pos = read_clut(tmp_path / "clut.parq")
+    np.testing.assert_array_equal(_spkids, spkids)
+    np.testing.assert_array_equal(_pos, pos)
+
+    _spkids, _pos = read_clut(tmp_path / "clut.parq", spkids=[4, 2])
+    np.testing.assert_array_equal(_spkids, [2, 4])
+    np.testing.assert_array_equal(_pos, pos[[1, 3]])
+
+
+def test_interp_clut():
+    pos = np.arange(2*3*3, dtype=float).reshape(2, 3, 3)
+    ets = [0.0, 10.0, 20.0]
+    np.testing.assert_allclose(interp_clut(pos, ets, 0.0), pos[:, 0])
+    np.testing.assert_allclose(interp_clut(pos, ets, 20.0), pos[:, 2])
+    np.testing.assert_allclose(interp_clut(pos, ets, [5.0, 15.0]),
+                               0.5*(pos[:, :2] + pos[:, 1:]))
+    with pytest.raises(ValueError):
+        interp_clut(pos, ets, 21.0)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from spicetools.clutcodec import CompactCLUT
+from spicetools.fastfunc import spkgps_batch
+from spicetools.kernelutil import DEFAULT_KERNELS
+
+BSP_3200 = DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp"
+ETS = np.arange(365)*86400.0
+
+
+@pytest.fixture(scope="module")
+def geocentric(fake_earth_bsp):
+    sp.furnsh(fake_earth_bsp)
+    sp.furnsh(str(BSP_3200))
+    pos = spkgps_batch([20003200], ETS, "ECLIPJ2000", 399)
+    sp.unload(str(BSP_3200))
+    sp.unload(fake_earth_bsp)
+    assert np.all(np.isfinite(pos))
+    return pos
+
+
+# (3200) Phaethon has a perihelion (q ~ 0.14 au) in this period:
+@pytest.mark.parametrize("dtype, max_km", [(np.int16, 50.0), (np.int8, 1.e4)])
+def test_error_budget(geocentric, dtype, max_km):
+    compact = CompactCLUT.encode([20003200], geocentric, dtype=dtype)
+    assert compact.ddiff.dtype == dtype
+    budget = compact.error_budget(geocentric)
+    assert budget["max_km"] <= compact.max_error[0] + 1e-6
+    assert budget["max_km"] < max_km
+    assert budget["bytes_per_object"] < geocentric[0].astype(np.float32).nbytes/(1.6 if dtype == np.int16 else 2.5)
+    # Most blocks (without the perihelion) have much smaller errors:
+    assert np.median(np.linalg.norm(compact.scale[0], axis=-1)/2) < max_km/10
+
+
+def test_roundtrip(tmp_path):
+    rng = np.random.default_rng(0)
+    ets = np.arange(20)
+    pos = np.stack([1e8*np.cos(0.1*ets + rng.uniform(0, 6, size=(5, 1))),
+                    1e8*np.sin(0.1*ets + rng.uniform(0, 6, size=(5, 1))),
+                    1e6*rng.normal(size=(5, 20))], axis=-1)
+    pos[2, 3] = np.nan
+    pos[4, :] = np.nan
+    compact = CompactCLUT.encode(np.arange(5), pos, block=6)
+    assert compact.ref.shape == (5, 4, 3)
+    dec = compact.decode(dtype=np.float64)
+    np.testing.assert_array_equal(np.isnan(dec), np.isnan(pos))
+    ok = np.isfinite(pos)
+    scale = np.repeat(compact.scale, 6, axis=1)[:, :20]
+    assert np.all(np.abs(dec - pos)[ok] <= scale[ok]/2 + 1e-6)
+    np.testing.assert_array_equal(compact.decode(spkids=[1, 3]), compact.decode()[[1, 3]])
+
+    compact.save(tmp_path / "clut.npz")
+    loaded = CompactCLUT.load(tmp_path / "clut.npz")
+    np.testing.assert_array_equal(loaded.decode(), compact.decode())
+
+    with pytest.raises(ValueError):
+        CompactCLUT.encode([1], pos[:1, :1])
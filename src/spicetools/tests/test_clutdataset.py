@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from spicetools.clutdataset import CLUTDataset, sky_cells, write_clut_dataset
+from spicetools.constants import D2R
+
+ETS = np.arange(10)*86400.0
+
+
+def _fake_clut(n_obj=50, seed=0):
+    rng = np.random.default_rng(seed)
+    pos = rng.normal(size=(n_obj, len(ETS), 3))*1e8
+    pos[3, 4] = np.nan
+    return np.arange(n_obj) + 2000001, pos.astype(np.float32)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    spkids, pos = _fake_clut()
+    write_clut_dataset(tmp_path / "ds", spkids[:30], pos[:30], ETS, row_group_size=100)
+    write_clut_dataset(tmp_path / "ds", spkids[30:], pos[30:], ETS, part=1, row_group_size=100)
+    return CLUTDataset(tmp_path / "ds"), spkids, pos
+
+
+def test_sky_cells():
+    np.testing.assert_array_equal(sky_cells([[1, 0, 0], [0, 1, 0], [0, 0, 1], [0, 0, -1]]),
+                                  [9*36 + 0, 9*36 + 9, 17*36 + 0, 0])
+    assert sky_cells(np.ones((2, 5, 3))).shape == (2, 5)
+
+
+def test_write_mismatch(dataset, tmp_path):
+    _, spkids, pos = dataset
+    with pytest.raises(ValueError):
+        write_clut_dataset(tmp_path / "ds", spkids, pos[:, :5], ETS[:5], part=2)
+
+
+def test_select(dataset):
+    clut, spkids, pos = dataset
+    table = clut.select()
+    assert table.num_rows == pos.shape[0]*pos.shape[1] - 1  # NaN is dropped
+
+    table = clut.select(spkids=[2000004, 2000010], et_range=(ETS[2], ETS[5]),
+                        columns=["spkid", "et", "x"]).sort_by([("spkid", "ascending"), ("et", "ascending")])
+    assert table.column_names == ["spkid", "et", "x"]
+    assert table["spkid"].to_pylist() == [2000004]*3 + [2000010]*4  # 2000004 at ETS[4] is NaN
+    np.testing.assert_array_equal(table["x"].to_numpy()[3:], pos[9, 2:6, 0])
+
+    lon, lat, radius = 40.0, -20.0, 30.0
+    vec = np.array([np.cos(lat*D2R)*np.cos(lon*D2R), np.cos(lat*D2R)*np.sin(lon*D2R), np.sin(lat*D2R)])
+    xyz = pos.reshape(-1, 3).astype(np.float64)
+    cos_sep = xyz @ vec/np.linalg.norm(xyz, axis=1)
+    n_ans = np.sum(cos_sep >= np.cos(radius*D2R))
+    assert 0 < n_ans
+    table = clut.select(region=(lon, lat, radius), columns=["spkid"])
+    assert table.column_names == ["spkid"]
+    assert table.num_rows == n_ans
+    assert clut.select(region=(lon, lat, radius), exact=False).num_rows >= n_ans
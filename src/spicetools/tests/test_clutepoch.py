@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from spicetools.clut import interp_clut, write_clut
+from spicetools.clutepoch import EpochCLUT, transpose_clut
+
+
+@pytest.fixture
+def clut_chunks(tmp_path):
+    rng = np.random.default_rng(0)
+    spkids = rng.permutation(np.arange(20000001, 20000011))
+    pos = rng.normal(size=(10, 7, 3)).astype(np.float32)
+    paths = [tmp_path / "a_chunk_000.parq", tmp_path / "a_chunk_001.parq"]
+    write_clut(paths[0], spkids[:6], pos[:6])
+    write_clut(paths[1], spkids[6:], pos[6:])
+    return paths, spkids, pos
+
+
+@pytest.mark.parametrize("epochs_per_pass", [1, 3, 32])
+def test_transpose_clut(tmp_path, clut_chunks, epochs_per_pass):
+    paths, spkids, pos = clut_chunks
+    ets = np.arange(7)*86400.0
+    clut = transpose_clut(paths, tmp_path / "epoch", ets=ets, epochs_per_pass=epochs_per_pass)
+    order = np.argsort(spkids)
+    np.testing.assert_array_equal(clut.spkids, spkids[order])
+    assert len(clut) == 10 and clut.n_et == 7
+    for k in range(7):
+        np.testing.assert_array_equal(clut.at(k), pos[order, k])
+    assert sorted(p.name for p in (tmp_path / "epoch").glob("epoch_*.npy"))[-1] == "epoch_00006.npy"
+
+    reader = EpochCLUT(tmp_path / "epoch", mmap=True)
+    assert isinstance(reader.at(3), np.memmap)
+    np.testing.assert_array_equal(reader.at(3, spkids=spkids[[4, 1]]), pos[[4, 1], 3])
+    np.testing.assert_allclose(reader.interp(2.25*86400), interp_clut(pos[order], ets, 2.25*86400),
+                               atol=1e-6)
+    np.testing.assert_array_equal(reader.interp(ets[4]), pos[order, 4])
+    with pytest.raises(KeyError):
+        reader.at(0, spkids=[1])
+    with pytest.raises(IndexError):
+        reader.at(7)
+
+
+def test_single_epoch(tmp_path, clut_chunks):
+    paths, spkids, pos = clut_chunks
+    write_clut(tmp_path / "single.parq", spkids, pos[:, :1])
+    clut = transpose_clut([tmp_path / "single.parq"], tmp_path / "epoch", ets=[86400.0])
+    np.testing.assert_array_equal(clut.interp(86400.0, spkids=spkids[:3]), pos[:3, 0])
+    with pytest.raises(ValueError):
+        clut.interp(0.0)
+
+
+def test_transpose_clut_errors(tmp_path, clut_chunks):
+    paths, spkids, pos = clut_chunks
+    with pytest.raises(ValueError):
+        transpose_clut([paths[0], paths[0]], tmp_path / "dup")
+    with pytest.raises(ValueError):
+        transpose_clut(paths, tmp_path / "ets", ets=[0.0, 1.0])
+    with pytest.raises(ValueError):
+        transpose_clut(paths, tmp_path / "no_ets").interp(0.0)
@@ -0,0 +1,74 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+import spiceypy as sp
+
+from spicetools.clut import compute_clut
+from spicetools.coverage import build_coverage, coverage_mask, spk_coverage, uncovered
+from spicetools.fastfunc import spkgps_batch
+from spicetools.kernelutil import DEFAULT_KERNELS
+
+BSP_3200 = DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp"
+SPKID = 20003200
+ET_STOP = 31579200.0
+# The last 2 epochs are out of coverage:
+ETS = ET_STOP + np.array([-2, -1, 0, 1, 2])*86400.0
+
+
+@pytest.fixture
+def bsp_dir(tmp_path):
+    shutil.copy(BSP_3200, tmp_path / f"spk{SPKID}.bsp")
+    (tmp_path / "spk2000001.bsp").write_text("Not an SPK")
+    return tmp_path
+
+
+def test_spk_coverage():
+    coverage = spk_coverage(BSP_3200)
+    np.testing.assert_allclose(coverage[SPKID], [[-2721600, ET_STOP]])
+
+
+def test_build_coverage(bsp_dir):
+    df = build_coverage([SPKID, 2000001, 2000002], bsp_fmt=str(bsp_dir / "spk{spkid}.bsp"))
+    assert df["spkid"].tolist() == [SPKID]
+    np.testing.assert_array_equal(uncovered(df, [SPKID, 2000001], 0, 1e7), [2000001])
+    np.testing.assert_array_equal(uncovered(df, [SPKID], 0, 1e9), [SPKID])
+
+
+def test_coverage_mask():
+    df = pd.DataFrame({"spkid": [1, 1, 2], "et_start": [0.0, 5.0, 2.0], "et_stop": [1.0, 6.0, 3.0]})
+    ets = [6.0, 0.0, 1.0, 2.0, 5.5, 7.0]  # unsorted
+    mask = coverage_mask(df, [2, 3, 1, 2], ets)
+    np.testing.assert_array_equal(mask, [
+        [0, 0, 0, 1, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [1, 1, 1, 0, 1, 0],
+        [0, 0, 0, 1, 0, 0],
+    ])
+    assert coverage_mask(df, [], ets).shape == (0, 6)
+
+
+def test_batch_covered(bsp_dir):
+    sp.furnsh(str(BSP_3200))
+    try:
+        # Without coverage, the whole object is lost:
+        assert np.all(np.isnan(spkgps_batch(SPKID, ETS, "J2000", 10)))
+        mask = coverage_mask(spk_coverage_df(), [SPKID], ETS)
+        pos = spkgps_batch(SPKID, ETS, "J2000", 10, covered=mask)
+        np.testing.assert_allclose(pos[0, :3], spkgps_batch(SPKID, ETS[:3], "J2000", 10)[0])
+        assert np.all(np.isnan(pos[0, 3:]))
+    finally:
+        sp.unload(str(BSP_3200))
+
+    df = build_coverage([SPKID, 2000001], bsp_fmt=str(bsp_dir / "spk{spkid}.bsp"))
+    spkids, pos, no_file, error = compute_clut([SPKID, 2000001], ETS, obs=10, coverage=df,
+                                               bsp_fmt=str(bsp_dir / "spk{spkid}.bsp"))
+    np.testing.assert_array_equal(spkids, [SPKID])
+    assert error == [2000001]
+    assert np.all(np.isfinite(pos[0, :3])) and np.all(np.isnan(pos[0, 3:]))
+
+
+def spk_coverage_df():
+    return pd.DataFrame([(SPKID, *w) for w in spk_coverage(BSP_3200)[SPKID]],
+                        columns=["spkid", "et_start", "et_stop"])
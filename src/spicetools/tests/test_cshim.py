@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from spicetools import cshim, fastfunc
+from spicetools.kernelutil import DEFAULT_KERNELS
+
+BSP_3200 = DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp"
+# Last epoch is out of coverage of 20003200
+ETS = np.linspace(0, 31579200 + 86400, 50)
+pytestmark = pytest.mark.skipif(not cshim.shim_available(), reason="C shim unavailable")
+
+
+@pytest.fixture(scope="module")
+def setup_bsp():
+    sp.furnsh(str(BSP_3200))
+    yield
+    sp.unload(str(BSP_3200))
+
+
+@pytest.mark.parametrize("covered", [None, "half"])
+def test_spkgps_batch(setup_bsp, covered):
+    targs = [20003200, 2000001, 20003200]
+    if covered == "half":
+        covered = np.zeros((len(targs), len(ETS)), dtype=bool)
+        covered[:, ::2] = True
+        covered[:, -1] = False
+    res = cshim.spkgps_batch(targs, ETS, "ECLIPJ2000", 10, covered=covered)
+    ans = fastfunc.spkgps_batch(targs, ETS, "ECLIPJ2000", 10, covered=covered)
+    np.testing.assert_array_equal(res, ans)
+    assert np.all(np.isnan(res[1]))
+    assert np.any(np.isfinite(res[0])) == (covered is not None)
+
+
+def test_spkcvo_batch(setup_bsp):
+    targets = ["20003200", 2000001]
+    args = (ETS[:-1], np.zeros(6), "J2000", "OBSERVER", "NONE", "10", "J2000")
+    res = cshim.spkcvo_batch(targets, *args)
+    np.testing.assert_array_equal(res, fastfunc.spkcvo_batch(targets, *args))
+    assert np.all(np.isfinite(res[0])) and np.all(np.isnan(res[1]))
+
+
+def test_fallback(monkeypatch):
+    monkeypatch.setattr(cshim, "_SHIM", False)
+    assert not cshim.shim_available()
+    res = cshim.spkgps_batch([2000001], ETS[:2], "J2000", 10)
+    assert res.shape == (1, 2, 3) and np.all(np.isnan(res))
@@ -0,0 +1,92 @@
+import shutil
+
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from spicetools.dispatch import TIERS, clut_error_bound, positions
+from spicetools.fastfunc import spkgps_batch
+from spicetools.instrument import INSTRUMENT
+from spicetools.kernelutil import DEFAULT_KERNELS
+
+BSP_3200 = DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp"
+CLUT_ETS = np.arange(0, 120)*86400.0
+ETS = np.linspace(1.3, 117.6, 50)*86400.0
+
+
+@pytest.fixture(scope="module")
+def kernels(fake_earth_bsp):
+    sp.furnsh(fake_earth_bsp)
+    sp.furnsh(str(BSP_3200))
+    yield
+    sp.unload(str(BSP_3200))
+    sp.unload(fake_earth_bsp)
+
+
+@pytest.fixture(scope="module")
+def clut(kernels):
+    return spkgps_batch([20003200, 10], CLUT_ETS, "ECLIPJ2000", 399).astype(np.float32)
+
+
+def test_clut_error_bound(clut):
+    truth = spkgps_batch([20003200, 10], ETS, "ECLIPJ2000", 399)
+    bound = clut_error_bound(clut, CLUT_ETS, ETS)
+    w = ((ETS - np.floor(ETS/86400)*86400)/86400)[None, :, None]
+    i0 = (ETS//86400).astype(int)
+    interp = (1 - w)*clut[:, i0] + w*clut[:, i0 + 1]
+    assert np.all(np.linalg.norm(interp - truth, axis=-1) <= bound)
+    # At the CLUT epochs, only the float32 rounding:
+    np.testing.assert_array_less(clut_error_bound(clut, CLUT_ETS, CLUT_ETS[5:7]),
+                                 1e-6*np.linalg.norm(clut[:, 5:7], axis=-1))
+    assert np.isinf(clut_error_bound(clut, CLUT_ETS, [-1.0, 1e9])).all()
+    assert np.all(clut_error_bound(clut, CLUT_ETS, ETS, clut_error=[10, 20]) >= bound + [[10], [20]])
+
+
+@pytest.mark.parametrize("tol_km", [1.e-3, 9.e3, 1.e6])
+def test_positions(clut, tol_km):
+    truth = spkgps_batch([20003200, 10, 399], ETS, "J2000", 399)
+    INSTRUMENT.reset()
+    INSTRUMENT.enable()
+    try:
+        pos, tiers, stats = positions([20003200, 10, 399], ETS, obs=399, ref="J2000", tol_km=tol_km,
+                                      clut_spkids=[20003200, 10], clut_pos=clut, clut_ets=CLUT_ETS)
+        counts = INSTRUMENT.to_dict()
+    finally:
+        INSTRUMENT.disable()
+        INSTRUMENT.reset()
+    assert np.all(np.linalg.norm(pos - truth, axis=-1) <= tol_km)
+    assert np.all(tiers[2] == TIERS.index("spice"))  # not in the CLUT
+    assert stats["clut"] + stats["spice"] == tiers.size and stats["failed"] == 0
+    assert counts["dispatch.clut"]["count"] == stats["clut"]
+    if tol_km == 1.e-3:
+        assert stats["clut"] == 0
+    elif tol_km == 9.e3:  # daily CLUT: ~1e4 km at the middle of the intervals
+        assert np.any(tiers[:2] == 0) and np.any(tiers[:2] == 1)
+    else:
+        assert stats["spice"] == len(ETS)
+
+
+def test_positions_non_inertial(clut):
+    pck = str(DEFAULT_KERNELS / "pck" / "pck00011.tpc")
+    sp.furnsh(pck)
+    try:
+        truth = spkgps_batch([20003200], ETS, "IAU_EARTH", 399)
+        pos, tiers, stats = positions([20003200], ETS, ref="IAU_EARTH", tol_km=1.e6,
+                                      clut_spkids=[20003200], clut_pos=clut[:1], clut_ets=CLUT_ETS)
+    finally:
+        sp.unload(pck)
+    assert stats["clut"] == len(ETS)
+    # The rotation keeps the interpolation error (a wrong one gives ~1e8 km):
+    assert np.all(np.linalg.norm(pos - truth, axis=-1) <= clut_error_bound(clut[:1], CLUT_ETS, ETS))
+
+
+def test_positions_bsp_fmt(clut, tmp_path):
+    shutil.copy(BSP_3200, tmp_path / "spk20003200.bsp")  # not to unload the loaded one
+    pos, tiers, stats = positions([20003200, 20000001], ETS, tol_km=1.e-3,
+                                  bsp_fmt=str(tmp_path / "spk{spkid}.bsp"))
+    assert stats == {"clut": 0, "spice": len(ETS), "failed": len(ETS)}
+    assert np.isnan(pos[1]).all() and np.all(tiers[1] == -1)
+    # Observer different from the CLUT's -> SPICE only
+    _, tiers, _ = positions([20003200], ETS, obs=10, tol_km=1.e6, clut_spkids=[20003200],
+                            clut_pos=clut[:1], clut_ets=CLUT_ETS)
+    assert np.all(tiers == 1)
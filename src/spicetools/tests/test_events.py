@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from spicetools.constants import R2D
+from spicetools.events import (bracket_crossings, bracket_minima, distance_func, elongation_func,
+                               find_crossings, find_minima, refine_crossings, refine_minima)
+from spicetools.fastfunc import spkgps_batch
+from spicetools.kernelutil import make_meta
+
+TARGET = 20003200
+
+
+@pytest.fixture(scope="module")
+def setup_mkfile(tmp_path_factory, fake_earth_bsp):
+    outmk = tmp_path_factory.mktemp("mk") / "test.mk"
+    make_meta(
+        "$KERNELS/lsk/naif0012.tls",
+        "$KERNELS/tests/spk3200_19991201-20010101_retrieved20240916.bsp",
+        fake_earth_bsp,
+        output=outmk
+    )
+    sp.furnsh(str(outmk))
+    yield str(outmk)
+    sp.unload(str(outmk))
+
+
+def test_bracket():
+    values = np.array([[3, 2, 1, 2, 3, 2, 3], [1, 2, 3, 4, 5, 6, 7]], dtype=float)
+    iobj, iet = bracket_minima(values)
+    np.testing.assert_array_equal(iobj, [0, 0])
+    np.testing.assert_array_equal(iet, [2, 5])
+
+    iobj, iet, direction = bracket_crossings(values, 2.5)
+    np.testing.assert_array_equal(iobj, [0, 0, 0, 0, 1])
+    np.testing.assert_array_equal(iet, [0, 3, 4, 5, 1])
+    np.testing.assert_array_equal(direction, [-1, 1, -1, 1, 1])
+
+
+def test_refine():
+    # Parabolas with different minima
+    t0 = np.array([1.3, -4.0, 10.25])
+
+    def func(iobj, ets):
+        return (ets - t0[iobj])**2
+
+    et, val = refine_minima(func, [0, 1, 2], [0, -10, 5], [3, 0, 20], tol=1e-6)
+    np.testing.assert_allclose(et, t0, atol=1e-5)
+    np.testing.assert_allclose(val, 0, atol=1e-9)
+
+    et, val = refine_crossings(func, [0, 1], [t0[0], t0[1] - 5], [t0[0] + 5, t0[1]], 4.0, tol=1e-9)
+    np.testing.assert_allclose(et, [t0[0] + 2, t0[1] - 2], atol=1e-8)
+
+    et, val = refine_minima(func, [], [], [])
+    assert len(et) == 0
+
+
+def test_find_minima_perihelion(setup_mkfile):
+    # Perihelion of (3200) Phaethon within the test kernel coverage
+    ets = np.arange(-2.5e6, 3.15e7, 86400*5.0)
+    dist = np.linalg.norm(spkgps_batch(TARGET, ets, "J2000", 10), axis=-1)
+    func = distance_func([TARGET], obs=10)
+    events = find_minima([TARGET], ets, dist, func, tol=0.1)
+    assert len(events) == 1
+    et0 = events["et"][0]
+    dense = np.linspace(et0 - 60, et0 + 60, 121)
+    dense_dist = func(np.zeros(len(dense), dtype=int), dense)
+    assert events["value"][0] <= dense_dist.min() + 1e-3
+    assert events["spkid"][0] == TARGET
+
+    assert len(find_minima([TARGET], ets, dist, func, max_value=1.0)) == 0
+
+    # crossing of 1 au
+    events = find_crossings([TARGET], ets, dist, 1.495978707e8, func, tol=1e-3)
+    np.testing.assert_allclose(events["value"], 1.495978707e8, rtol=1e-7)
+    np.testing.assert_array_equal(np.sort(events["direction"]), [-1, 1])
+
+
+def test_elongation_func(setup_mkfile):
+    ets = np.array([0.0, 86400.0, 0.0])
+    func = elongation_func([TARGET], obs=399)
+    res = func(np.array([0, 0, 0]), ets)
+    for et, _res in zip(ets, res):
+        targ = sp.spkgps(TARGET, et, "J2000", 399)[0]
+        sun = sp.spkgps(10, et, "J2000", 399)[0]
+        np.testing.assert_allclose(_res, sp.vsep(targ, sun)*R2D)
+
+    # Conjunctions of the target seen from the fake Earth
+    ets = np.arange(-2.5e6, 3.15e7, 86400*2.0)
+    elong = func(np.zeros(len(ets), dtype=int), ets)
+    events = find_minima([TARGET], ets, elong[None, :], func, tol=1.0)
+    assert len(events) > 0
+    for ev in events:
+        dense = np.linspace(ev["et"] - 600, ev["et"] + 600, 11)
+        assert ev["value"] <= func(np.zeros(11, dtype=int), dense).min() + 1e-6
+
+
+def test_func_out_of_coverage(setup_mkfile):
+    # The test kernel covers 1999-12-01 to 2001-01-01
+    func = distance_func([TARGET], obs=10)
+    ets = np.array([-1e8, 0.0, 1e8])
+    dist = func(np.zeros(3, dtype=int), ets)
+    assert np.isnan(dist[[0, 2]]).all()
+    np.testing.assert_allclose(dist[1], np.linalg.norm(sp.spkgps(TARGET, 0.0, "J2000", 10)[0]))
+    assert not sp.failed()
+
+    et, val = refine_minima(func, [0], [-1.1e8], [-0.9e8])
+    assert np.isnan(val).all()
+    assert np.isnan(elongation_func([TARGET], obs=399)([0], [-1e8])).all()
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from spicetools.frames import (clear_frame_cache, frame_rotation, frame_transform,
+                               is_inertial, rotate)
+from spicetools.kernelutil import make_meta
+
+
+@pytest.fixture(scope="module")
+def setup_mkfile(tmp_path_factory):
+    outmk = tmp_path_factory.mktemp("mk") / "test.mk"
+    make_meta("$KERNELS/lsk/naif0012.tls", "$KERNELS/pck/pck00011.tpc", output=outmk)
+    sp.furnsh(str(outmk))
+    yield str(outmk)
+    sp.unload(str(outmk))
+
+
+def test_is_inertial():
+    assert is_inertial("J2000")
+    assert is_inertial("ECLIPJ2000")
+    assert not is_inertial("IAU_EARTH")
+    with pytest.raises(ValueError):
+        is_inertial("NOT_A_FRAME")
+
+
+def test_rotate_inertial():
+    clear_frame_cache()
+    rng = np.random.default_rng(0)
+    sta = rng.normal(size=(4, 5, 6))
+    res = rotate(sta, "J2000", "ECLIPJ2000")
+    mat = sp.pxform("J2000", "ECLIPJ2000", 0.0)
+    np.testing.assert_allclose(res[2, 3, :3], mat @ sta[2, 3, :3])
+    np.testing.assert_allclose(res[2, 3, 3:], mat @ sta[2, 3, 3:])
+    np.testing.assert_allclose(rotate(res[..., :3], "ECLIPJ2000", "J2000"), sta[..., :3])
+    np.testing.assert_allclose(frame_transform("J2000", "ECLIPJ2000"),
+                               sp.sxform("J2000", "ECLIPJ2000", 1.e8))
+    # cached & read-only:
+    assert frame_rotation("J2000", "ECLIPJ2000") is frame_rotation("j2000", "eclipj2000")
+    np.testing.assert_array_equal(frame_rotation("J2000", "J2000"), np.eye(3))
+
+    with pytest.raises(ValueError):
+        rotate(sta[..., :2], "J2000", "ECLIPJ2000")
+
+
+def test_rotate_time_dependent(setup_mkfile):
+    ets = np.array([0.0, 3600.0, 0.0])
+    sta = np.tile(np.arange(1, 7, dtype=float), (3, 1))
+    res = rotate(sta, "J2000", "IAU_EARTH", ets=ets)
+    for et, _res in zip(ets, res):
+        np.testing.assert_allclose(_res, sp.sxform("J2000", "IAU_EARTH", et) @ sta[0])
+    res = rotate(sta[:, :3], "J2000", "IAU_EARTH", ets=ets)
+    for et, _res in zip(ets, res):
+        np.testing.assert_allclose(_res, sp.pxform("J2000", "IAU_EARTH", et) @ sta[0, :3])
+    assert frame_rotation("J2000", "IAU_EARTH", ets).shape == (3, 3, 3)
+    with pytest.raises(ValueError):
+        rotate(sta, "J2000", "IAU_EARTH")
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from spicetools.constants import AU2KM, R2D
+from spicetools.geometry import OBSERVABLE_FIELDS, observable_dtype, observables
+
+# Some arbitrary heliocentric states (km, km/s)
+TARG_STA = np.array([
+    [2.4e8, 1.8e8, 1.7e8, -10.0, 15.0, 3.0],
+    [-1.5e8, 3.0e8, -2.0e7, -12.0, -5.0, 1.0],
+    [0.0, 0.0, 4.0e8, 1.0, 2.0, 0.0],
+])
+OBS_STA = np.array([AU2KM, 0, 0, 0, 29.78, 0])
+
+
+def test_observable_dtype():
+    assert observable_dtype(np.float32).names == tuple(OBSERVABLE_FIELDS)
+    assert observable_dtype(np.float32)["ra"] == np.float32
+    with pytest.raises(TypeError):
+        observable_dtype(int)
+
+
+def test_observables_angles():
+    res = observables(TARG_STA, OBS_STA)
+    rel = TARG_STA - OBS_STA
+    for i, _rel in enumerate(rel):
+        rng, ra, dec = sp.recrad(_rel[:3])
+        np.testing.assert_allclose(res["delta"][i], rng)
+        np.testing.assert_allclose(res["ra"][i], ra*R2D)
+        np.testing.assert_allclose(res["dec"][i], dec*R2D)
+        np.testing.assert_allclose(res["r_hel"][i], np.linalg.norm(TARG_STA[i, :3]))
+        np.testing.assert_allclose(res["alpha"][i], sp.vsep(-TARG_STA[i, :3], -_rel[:3])*R2D)
+        np.testing.assert_allclose(res["elong"][i], sp.vsep(-OBS_STA[:3], _rel[:3])*R2D)
+
+
+def test_observables_rates():
+    dt = 1.0
+    res0 = observables(TARG_STA, OBS_STA)
+    sta1 = TARG_STA.copy()
+    sta1[:, :3] += TARG_STA[:, 3:]*dt
+    obs1 = OBS_STA.copy()
+    obs1[:3] += OBS_STA[3:]*dt
+    res1 = observables(sta1, obs1)
+    dra = ((res1["ra"] - res0["ra"] + 180) % 360 - 180)*3600/dt
+    ddec = (res1["dec"] - res0["dec"])*3600/dt
+    np.testing.assert_allclose(res0["dra_cosdec"], dra*np.cos(res0["dec"]/R2D), rtol=1e-4)
+    np.testing.assert_allclose(res0["ddec"], ddec, rtol=1e-4, atol=1e-9)
+
+
+def test_observables_chunk_dtype():
+    rng = np.random.default_rng(0)
+    targ = rng.normal(scale=3e8, size=(1001, 6))
+    obs = np.tile(OBS_STA, (1001, 1))
+    sun = rng.normal(scale=1e3, size=3)
+    res = observables(targ, OBS_STA, sun_pos=sun)
+    res_chunked = observables(targ, obs, sun_pos=sun, chunksize=100)
+    res32 = observables(targ, OBS_STA, sun_pos=sun, dtype=np.float32, chunksize=7)
+    for f in OBSERVABLE_FIELDS:
+        np.testing.assert_array_equal(res[f], res_chunked[f])
+        np.testing.assert_allclose(res32[f], res[f], rtol=1e-6, atol=1e-4)
+    assert res32.dtype == observable_dtype(np.float32)
+
+
+def test_observables_shape_error():
+    with pytest.raises(ValueError):
+        observables(TARG_STA[:, :3], OBS_STA)
+    with pytest.raises(ValueError):
+        observables(TARG_STA, np.zeros((2, 6)))
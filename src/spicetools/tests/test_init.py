@@ -0,0 +1,40 @@
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+import spicetools
+
+HEAVY = ["astropy", "pandas", "requests", "pyarrow"]
+
+
+def _run(code):
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+
+@pytest.mark.parametrize("stmt", ["import spicetools", "from spicetools.fastfunc import spkgps_batch",
+                                  "from spicetools.kernelutil import DEFAULT_KERNELS, make_meta"])
+def test_lazy_import(stmt):
+    out = _run(f"{stmt}\nimport sys\nprint(','.join(m for m in {HEAVY!r} if m in sys.modules))")
+    assert out.strip() == ""
+
+
+def test_lazy_sbdb_fields():
+    out = _run(
+        "import spicetools.queryutil as q\n"
+        "print(q._sbdb_fields.cache_info().currsize, len(q.SBDB_FIELDS['*']),"
+        " q._sbdb_fields.cache_info().currsize)"
+    )
+    assert out.split() == ["0", str(len(spicetools.queryutil._SBDB_FIELDS.query("~ignore"))), "1"]
+
+
+def test_all_names():
+    for mod, attrs in spicetools._SUBMODULE_ATTRS.items():
+        assert sorted(importlib.import_module(f"spicetools.{mod}").__all__) == sorted(attrs)
+    for name in spicetools.__all__:
+        assert getattr(spicetools, name) is not None
+    assert "spkgps" in dir(spicetools)
+    with pytest.raises(AttributeError):
+        spicetools.not_an_attribute
+
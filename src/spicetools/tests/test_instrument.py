@@ -0,0 +1,77 @@
+import json
+import shutil
+
+import numpy as np
+import pytest
+
+from spicetools.clut import compute_clut, write_clut
+from spicetools.instrument import INSTRUMENT, Instrumentation
+from spicetools.kernelutil import DEFAULT_KERNELS
+
+BSP_3200 = DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp"
+
+
+@pytest.fixture
+def instrument():
+    INSTRUMENT.reset()
+    INSTRUMENT.enable()
+    yield INSTRUMENT
+    INSTRUMENT.disable()
+    INSTRUMENT.reset()
+
+
+def test_disabled():
+    inst = Instrumentation()
+    with inst.timer("a"):
+        pass
+    inst.count("a")
+    inst.add_bytes("a", 10)
+    assert inst.timer("a") is inst.timer("b")  # shared no-op
+    assert inst.to_dict() == {}
+
+
+def test_records(tmp_path):
+    inst = Instrumentation(enabled=True)
+    for _ in range(3):
+        with inst.timer("a"):
+            pass
+    inst.count("a", 5)
+    inst.add_bytes("b", 100)
+
+    @inst.wrap("c")
+    def func(x):
+        return x + 1
+
+    assert func(1) == 2
+    stats = inst.to_dict()
+    assert set(stats) == {"a", "b", "c"}
+    assert stats["a"]["calls"] == 3
+    assert stats["a"]["count"] == 5
+    assert stats["a"]["p50_s"] <= stats["a"]["max_s"]
+    assert stats["b"]["calls"] == 0 and stats["b"]["total_s"] is None
+    assert stats["b"]["bytes"] == 100
+    assert stats["c"]["calls"] == 1
+
+    other = Instrumentation(enabled=True)
+    other.merge(json.loads(json.dumps(inst.snapshot())))
+    other.merge(inst.snapshot())
+    assert other.to_dict()["a"]["calls"] == 6
+    assert other.to_dict()["b"]["bytes"] == 200
+
+    inst.dump_json(tmp_path / "timing.json")
+    with open(tmp_path / "timing.json") as f:
+        assert json.load(f) == json.loads(json.dumps(stats))
+    assert list(inst.summary().index) == ["a", "b", "c"]
+
+
+def test_clut_stages(instrument, tmp_path):
+    shutil.copy(BSP_3200, tmp_path / "spk20003200.bsp")
+    ets = np.arange(5)*86400.0
+    spkids, pos, _, _ = compute_clut([20003200], ets, bsp_fmt=str(tmp_path / "spk{spkid}.bsp"),
+                                     obs=10)
+    write_clut(tmp_path / "clut.parq", spkids, pos)
+    stats = instrument.to_dict()
+    assert stats["kernel.load"]["calls"] == 1
+    assert stats["kernel.unload"]["calls"] == 1
+    assert stats["fastfunc.spkgps_c"]["count"] == len(ets)
+    assert stats["clut.write"]["bytes"] == (tmp_path / "clut.parq").stat().st_size
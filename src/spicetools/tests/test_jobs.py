@@ -0,0 +1,97 @@
+import base64
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from spicetools.clut import read_clut
+from spicetools.jobs import ShardRunner, atomic_path, clut_shard, decode_shard
+from spicetools.kernelutil import DEFAULT_KERNELS
+
+BSP_3200 = DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp"
+LSK = DEFAULT_KERNELS / "lsk" / "naif0012.tls"
+
+
+def _flaky(args, output):
+    """Fails at the first call for the shards with ``fail=True``."""
+    calls = Path(args["log"])
+    with open(calls, "a") as f:
+        f.write(f"{args['i']}\n")
+    if args["fail"] and calls.read_text().split().count(str(args["i"])) == 1:
+        raise RuntimeError("preempted")
+    Path(output).write_text(str(args["i"]**2))
+    return {"square": args["i"]**2}
+
+
+def test_atomic_path(tmp_path):
+    with pytest.raises(ValueError):
+        with atomic_path(tmp_path / "out.txt") as tmp:
+            tmp.write_text("partial")
+            raise ValueError
+    assert not list(tmp_path.iterdir())
+    with atomic_path(tmp_path / "out.txt") as tmp:
+        tmp.write_text("complete")
+    assert [p.name for p in tmp_path.iterdir()] == ["out.txt"]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_shard_runner(tmp_path, processes):
+    log = tmp_path / "calls.log"
+    shards = {f"s{i}": dict(i=i, fail=i == 2, log=str(log)) for i in range(4)}
+    n_kernels = sp.ktotal("ALL")
+    status = ShardRunner(tmp_path / "job").run(_flaky, shards, suffix=".txt", kernels=[LSK],
+                                               processes=processes)
+    assert sp.ktotal("ALL") == n_kernels  # the kernels of the serial run are unloaded
+    assert status.set_index("key")["status"].to_dict() == {"s0": "done", "s1": "done", "s2": "failed",
+                                                           "s3": "done"}
+    assert "preempted" in status.set_index("key").loc["s2", "error"]
+    assert not (tmp_path / "job" / "s2.txt").exists()
+
+    # A new runner (e.g., after a restart) runs only the failed shard:
+    (tmp_path / "job" / "s1.txt").unlink()  # done, but the output is lost
+    runner = ShardRunner(tmp_path / "job")
+    assert runner.todo(shards) == ["s1", "s2"]
+    status = runner.run(_flaky, shards, suffix=".txt", processes=processes)
+    assert (status["status"] == "done").all()
+    assert status.set_index("key").loc["s2", "attempts"] == 2
+    assert sorted(log.read_text().split()) == ["0", "1", "1", "2", "2", "3"]
+    assert runner.results()["s2"] == {"square": 4}
+    assert (tmp_path / "job" / "s2.txt").read_text() == "4"
+    assert json.loads((tmp_path / "job" / "_manifest.json").read_text())["shards"]["s2"]["status"] == "done"
+    assert runner.run(_flaky, shards, suffix=".txt").equals(status)  # nothing to do
+
+
+def test_max_attempts(tmp_path):
+    runner = ShardRunner(tmp_path, max_attempts=1)
+    runner.run(_flaky, {"a": dict(i=1, fail=True, log=str(tmp_path / "log"))})
+    assert runner.todo(["a"]) == []
+
+
+def test_clut_shard(tmp_path):
+    ets = np.arange(5)*86400.0
+    shards = {"chunk_000": dict(spkids=[20003200, 1], ets=ets, bsp_fmt=str(BSP_3200), obs=10)}
+    status = ShardRunner(tmp_path).run(clut_shard, shards, suffix=".parq")
+    assert status["status"].tolist() == ["done"]
+    spkids, pos = read_clut(tmp_path / "chunk_000.parq")
+    assert spkids.tolist() == [20003200]
+    assert pos.shape == (1, 5, 3)
+    # `1` is not in the file (SPICE error):
+    assert ShardRunner(tmp_path).results()["chunk_000"] == {"n_obj": 1, "no_spk_file": [],
+                                                            "error_file": [1]}
+
+
+def test_decode_shard(tmp_path):
+    b64 = base64.b64encode(BSP_3200.read_bytes()).decode()
+    (tmp_path / "ok.json").write_text(json.dumps({"spk": b64}))
+    (tmp_path / "truncated.txt").write_text("header\n" + b64[:1000])
+    (tmp_path / "error.txt").write_text("No ephemeris for target")
+    shards = {p.stem: str(p) for p in tmp_path.iterdir()}
+    runner = ShardRunner(tmp_path / "bsp")
+    status = runner.run(decode_shard, shards, suffix=".bsp").set_index("key")
+    assert status.loc["ok", "status"] == "done"
+    assert runner.results()["ok"] == {"spkids": [20003200]}
+    assert (tmp_path / "bsp" / "ok.bsp").read_bytes() == BSP_3200.read_bytes()
+    assert status.loc["truncated", "status"] == status.loc["error", "status"] == "failed"
+    assert sorted(p.name for p in (tmp_path / "bsp").iterdir()) == ["_manifest.json", "ok.bsp"]
@@ -1,4 +1,10 @@
-from spicetools.kernelutil import make_meta
+import os
+
+import pandas as pd
+import pytest
+import spiceypy as sp
+
+from spicetools.kernelutil import DEFAULT_KERNELS, iter_shards, make_meta, make_meta_shards, read_meta_shards
 
 
 def test_make_meta(tmp_path):
@@ -22,3 +28,31 @@ def test_make_meta(tmp_path):
 
     # Clean up is handled by pytest's tmp_path fixture
     # No need to manually remove files
+
+
+def test_make_meta_shards(tmp_path):
+    bsp = DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp"
+    for spkid in range(1, 8):  # stand-ins of per-object files (all with 20003200)
+        os.link(bsp, tmp_path / f"spk{spkid}.bsp")
+    coverage = pd.DataFrame({"spkid": [1, 2, 3, 4, 5, 6, 7, 7],
+                             "et_start": [5., 4., 3., 2., 1., 0., 0., 9.],
+                             "et_stop": [9., 9., 9., 9., 9., 9., 1., 10.]})
+    manifest = make_meta_shards([7, 6, 5, 4, 3, 2, 1, 99], tmp_path / "mk", coverage=coverage,
+                                bsp_fmt=str(tmp_path / "spk{spkid}.bsp"), max_files=3)
+    assert manifest["n_obj"].tolist() == [3, 3, 1]
+    assert [s.tolist() for s in manifest["spkids"]] == [[6, 7, 5], [4, 3, 2], [1]]
+    assert manifest[["et_start", "et_stop"]].to_numpy().tolist() == [[0, 10], [2, 9], [5, 9]]
+    pd.testing.assert_frame_equal(read_meta_shards(tmp_path / "mk"), manifest)
+
+    n0 = sp.ktotal("ALL")
+    loaded = []
+    for shard in iter_shards(manifest, et_stop=4.5):
+        assert sp.ktotal("ALL") == n0 + 1 + shard["n_obj"]  # meta-kernel + BSPs
+        loaded.append(shard["shard"])
+    assert loaded == [0, 1]  # shard 2 starts after 4.5
+    assert sp.ktotal("ALL") == n0
+
+    manifest = make_meta_shards([1, 2, 3], tmp_path / "mk2", bsp_fmt=str(tmp_path / "spk{spkid}.bsp"))
+    assert [s.tolist() for s in manifest["spkids"]] == [[1, 2, 3]]
+    with pytest.raises(ValueError):
+        make_meta_shards([1], tmp_path / "mk3", max_files=5000)
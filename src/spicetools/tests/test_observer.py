@@ -0,0 +1,97 @@
+import ctypes
+
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from spicetools.constants import AU2KM
+from spicetools.fastfunc import spkcvo, spkcvo_batch, spkgps, spkgps_batch
+from spicetools.geometry import observables
+from spicetools.kernelutil import make_meta
+from spicetools.observer import ObserverTrajectory
+
+ETS = np.array([0.0, 86400.0, 10*86400.0])
+TARGET = 20003200
+
+
+@pytest.fixture(scope="module")
+def setup_mkfile(tmp_path_factory):
+    """Load only the bundled kernels (heliocentric small body), no network."""
+    outmk = tmp_path_factory.mktemp("mk") / "test.mk"
+    make_meta(
+        "$KERNELS/lsk/naif0012.tls",
+        "$KERNELS/tests/spk3200_19991201-20010101_retrieved20240916.bsp",
+        output=outmk
+    )
+    sp.furnsh(str(outmk))
+    yield str(outmk)
+    sp.unload(str(outmk))
+
+
+def _obs_states():
+    return np.array([[AU2KM*np.cos(et*2e-7), AU2KM*np.sin(et*2e-7), 0.0, 0.0, 29.78, 0.0]
+                     for et in ETS])
+
+
+def test_spkgps_batch(setup_mkfile):
+    res = spkgps_batch([TARGET, TARGET], ETS, "ECLIPJ2000", 10)
+    assert res.shape == (2, len(ETS), 3)
+    fast_spkgps = spkgps("ECLIPJ2000", 10)
+    for j, et in enumerate(ETS):
+        np.testing.assert_allclose(res[0, j], fast_spkgps(ctypes.c_int(TARGET), ctypes.c_double(et)))
+    np.testing.assert_array_equal(res[0], res[1])
+
+    # Unknown target -> NaN, but the following targets are not affected
+    res = spkgps_batch([1234, TARGET], ETS, "ECLIPJ2000", 10)
+    assert np.all(np.isnan(res[0]))
+    np.testing.assert_allclose(res[1], spkgps_batch(TARGET, ETS, "ECLIPJ2000", 10)[0])
+
+    with pytest.raises(ValueError):
+        spkgps_batch(TARGET, ETS, "ECLIPJ2000", 10, out=np.empty((1, 2, 3)))
+
+
+def test_spkcvo_batch(setup_mkfile):
+    obsstas = _obs_states()
+    res = spkcvo_batch(TARGET, ETS, obsstas, "J2000", "OBSERVER", "NONE", "SUN", "J2000")
+    fast_spkcvo = spkcvo("J2000", "OBSERVER", "NONE", "SUN", "J2000")
+    for j, et in enumerate(ETS):
+        np.testing.assert_allclose(
+            res[0, j],
+            fast_spkcvo(sp.stypes.string_to_char_p(str(TARGET)),
+                        sp.stypes.to_double_vector(obsstas[j]), ctypes.c_double(et))
+        )
+
+
+def test_observer_trajectory(setup_mkfile):
+    obsstas = _obs_states()
+    traj = ObserverTrajectory.from_states(obsstas, ETS, center="SUN", ref="J2000")
+    assert len(traj) == len(ETS)
+    np.testing.assert_array_equal(traj.sun_pos, 0)
+
+    rel = traj.spkcvo([TARGET, "1234"])
+    assert rel.shape == (2, len(ETS), 6)
+    assert np.all(np.isnan(rel[1]))
+    np.testing.assert_allclose(
+        (rel[0] + obsstas)[:, :3], spkgps_batch(TARGET, ETS, "J2000", 10)[0], atol=1e-3, rtol=0
+    )
+
+    rel_ecl = traj.spkcvo(TARGET, outref="ECLIPJ2000")
+    np.testing.assert_allclose(
+        rel_ecl[0],
+        spkcvo_batch(TARGET, ETS, obsstas, "ECLIPJ2000", "OBSERVER", "NONE", "SUN", "J2000")[0],
+        rtol=1e-12, atol=1e-6
+    )
+
+    obs = traj.observables(rel[:1])
+    assert obs.shape == (1, len(ETS))
+    np.testing.assert_allclose(
+        obs["elong"][0], observables(rel[0] + obsstas, obsstas)["elong"]
+    )
+
+    # Sampled from SPICE: the Sun-centered target itself as an "observer"
+    traj = ObserverTrajectory(TARGET, ETS, center="SUN", ref="J2000")
+    rel = traj.spkcvo(TARGET)
+    np.testing.assert_allclose(rel, 0, atol=1e-6)
+
+    with pytest.raises(ValueError):
+        ObserverTrajectory.from_states(obsstas[:2], ETS)
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+import spiceypy as sp
+
+from spicetools.constants import R2D
+from spicetools.fastfunc import spkgps_batch
+from spicetools.instrument import INSTRUMENT
+from spicetools.kernelutil import make_meta
+from spicetools.plut import build_plut, read_plut, screen_pointings
+
+TARGET = 20003200
+CLUT_ETS = np.arange(0, 30)*86400.0
+
+
+@pytest.fixture(scope="module")
+def setup_mkfile(tmp_path_factory, fake_earth_bsp):
+    outmk = tmp_path_factory.mktemp("mk") / "test.mk"
+    make_meta(
+        "$KERNELS/lsk/naif0012.tls",
+        "$KERNELS/tests/spk3200_19991201-20010101_retrieved20240916.bsp",
+        fake_earth_bsp,
+        output=outmk
+    )
+    sp.furnsh(str(outmk))
+    yield str(outmk)
+    sp.unload(str(outmk))
+
+
+def _pointings():
+    ets = np.array([5.3*86400, 12.7*86400, 20.1*86400])
+    ras, decs = [], []
+    for et in ets:
+        _, ra, dec = sp.recrad(sp.spkpos(str(TARGET), et, "J2000", "LT+S", "399")[0])
+        ras.append(ra*R2D)
+        decs.append(dec*R2D)
+    ras[1] = (ras[1] + 180) % 360  # pointing away from the target
+    return pd.DataFrame({"pointing_id": [10, 11, 12], "et": ets, "ra": ras, "dec": decs,
+                         "radius": [0.5, 0.5, 0.5]})
+
+
+def test_screen_pointings(setup_mkfile):
+    pos = spkgps_batch([TARGET], CLUT_ETS, "ECLIPJ2000", 399).astype(np.float32)
+    candidates = screen_pointings(_pointings(), [TARGET], pos, CLUT_ETS, margin=0.1)
+    assert [len(c) for c in candidates] == [1, 0, 1]
+
+    # Per-object margins (e.g., orbit uncertainty), constant or at the CLUT epochs:
+    candidates = screen_pointings(_pointings(), [TARGET], pos, CLUT_ETS, margin=0.1, obj_margin=[180])
+    assert [len(c) for c in candidates] == [1, 1, 1]
+    obj_margin = np.where(CLUT_ETS > 10*86400, 180.0, 0.0)[None]
+    candidates = screen_pointings(_pointings(), [TARGET], pos, CLUT_ETS, margin=0.1, obj_margin=obj_margin)
+    assert [len(c) for c in candidates] == [1, 1, 1]
+    candidates = screen_pointings(_pointings(), [TARGET], pos, CLUT_ETS, margin=0.1,
+                                  obj_margin=0*obj_margin)
+    assert [len(c) for c in candidates] == [1, 0, 1]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_build_plut(setup_mkfile, tmp_path, processes):
+    pos = spkgps_batch([TARGET], CLUT_ETS, "ECLIPJ2000", 399).astype(np.float32)
+    pointings = _pointings()
+    n_loaded = sp.ktotal("ALL")
+    index = build_plut(
+        pointings, [TARGET], pos, CLUT_ETS, tmp_path, observer=399, kernels=[setup_mkfile],
+        offsets=[-60, 0, 60], pointings_per_task=2, processes=processes
+    )
+    assert sp.ktotal("ALL") == n_loaded  # the kernels furnished for the tasks are unloaded
+    assert index["pointing_id"].tolist() == [10, 11, 12]
+    assert index["n_rows"].tolist() == [3, 3, 3]
+
+    table = read_plut(tmp_path).to_pandas()
+    assert len(table) == 6
+    assert set(table["pointing_id"]) == {10, 12}
+
+    table = read_plut(tmp_path, pointing_ids=[12], spkids=[TARGET]).to_pandas()
+    row = table[table["et"] == pointings["et"][2]].iloc[0]
+    np.testing.assert_allclose([row["ra"], row["dec"]], pointings.loc[2, ["ra", "dec"]].to_numpy(dtype=float),
+                               atol=1e-6)
+    sta = sp.spkcvo(str(TARGET), row["et"], "J2000", "OBSERVER", "LT+S", np.zeros(6), row["et"],
+                    "399", "J2000")[0]
+    np.testing.assert_allclose(row[["x", "y", "z"]].to_numpy(dtype=float), sta[:3], rtol=1e-9)
+    assert len(read_plut(tmp_path, pointing_ids=[11])) == 0
+
+    # Per-object margins (e.g., a poorly constrained orbit) are screened with:
+    index = build_plut(
+        pointings, [TARGET], pos, CLUT_ETS, tmp_path / "margin", observer=399, kernels=[setup_mkfile],
+        offsets=[-60, 0, 60], pointings_per_task=2, processes=processes, obj_margin=[180]
+    )
+    assert index["n_rows"].tolist() == [6, 6, 3]
+    assert set(read_plut(tmp_path / "margin").to_pandas()["pointing_id"]) == {10, 11, 12}
+
+
+def test_build_plut_instrument(setup_mkfile, tmp_path):
+    pos = spkgps_batch([TARGET], CLUT_ETS, "ECLIPJ2000", 399).astype(np.float32)
+    INSTRUMENT.reset()
+    INSTRUMENT.enable()
+    try:
+        build_plut(_pointings(), [TARGET], pos, CLUT_ETS, tmp_path, observer=399,
+                   kernels=[setup_mkfile], pointings_per_task=2, processes=2)
+        stats = INSTRUMENT.to_dict()
+    finally:
+        INSTRUMENT.disable()
+        INSTRUMENT.reset()
+    # Records of the worker processes are merged into the parent:
+    assert stats["plut.write"]["calls"] == 2
+    assert stats["plut.write"]["bytes"] > 0
+    assert stats["fastfunc.spkcvo_c"]["count"] == 2
+
+
+def test_build_plut_resume(setup_mkfile, tmp_path):
+    pos = spkgps_batch([TARGET], CLUT_ETS, "ECLIPJ2000", 399).astype(np.float32)
+    kw = dict(observer=399, kernels=[setup_mkfile], offsets=[-60, 0, 60], pointings_per_task=1,
+              processes=1)
+    index = build_plut(_pointings(), [TARGET], pos, CLUT_ETS, tmp_path, **kw)
+    (tmp_path / "plut_00002.parquet").unlink()  # e.g., killed before this task
+    mtime = (tmp_path / "plut_00000.parquet").stat().st_mtime_ns
+    resumed = build_plut(_pointings(), [TARGET], pos, CLUT_ETS, tmp_path, resume=True, **kw)
+    pd.testing.assert_frame_equal(resumed, index)
+    assert (tmp_path / "plut_00000.parquet").stat().st_mtime_ns == mtime
+    assert len(read_plut(tmp_path, pointing_ids=[12])) == 3
+    assert not list(tmp_path.glob("*.tmp"))
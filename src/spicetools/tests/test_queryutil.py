@@ -1,6 +1,10 @@
+import base64
 from pathlib import Path
-from spicetools.queryutil import download_jpl_de, SBDBQuery, HorizonsSPKQuery
+from spicetools.kernelutil import DEFAULT_KERNELS
+from spicetools.queryutil import (download_jpl_de, SBDBQuery, HorizonsSPKQuery, sbdb_json2df,
+                                  decode_spk)
 
+import numpy as np
 import pytest
 
 
@@ -47,3 +51,25 @@ def test_HorizonsSPKQuery(tmp_path, command, start, stop, decode):
     spkq = HorizonsSPKQuery(command=command, start=start, stop=stop, output=output)
     spkq.query(decode=decode)
     assert output.exists()
+
+
+def test_sbdb_json2df():
+    data = {"signature": {"version": "1.0"}, "fields": ["spkid", "pdes", "H"],
+            "data": [["20000001", "1", "3.33"], ["20000002", "2", None]]}
+    df = sbdb_json2df(data)
+    assert df["spkid"].tolist() == [20000001, 20000002]
+    assert df["pdes"].tolist() == ["1", "2"]
+    assert df["H"].iloc[0] == 3.33 and np.isnan(df["H"].iloc[1])
+    with pytest.raises(ValueError):
+        sbdb_json2df({"signature": {"version": "2.0"}})
+
+
+def test_decode_spk():
+    bsp = (DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp").read_bytes()
+    b64 = base64.b64encode(bsp).decode()
+    assert decode_spk(b64) == bsp
+    assert decode_spk("Some header\n" + b64) == bsp
+    with pytest.raises(ValueError):
+        decode_spk("no SPK")
+    with pytest.raises(ValueError):
+        decode_spk(b64[:-3])
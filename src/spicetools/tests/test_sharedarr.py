@@ -0,0 +1,56 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spicetools.clut import write_clut
+from spicetools.sharedarr import SharedArrays, share_catalog, share_clut
+
+
+_SHARED = None
+
+
+def _init(shared):
+    global _SHARED
+    _SHARED = shared
+
+
+def _task(i):
+    pos = _SHARED["pos"]
+    return float(pos[i].sum())
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_share_clut(tmp_path, mmap):
+    rng = np.random.default_rng(0)
+    pos = rng.normal(size=(4, 5, 3)).astype(np.float32)
+    write_clut(tmp_path / "clut.parq", [11, 12, 13, 14], pos)
+    with share_clut(tmp_path / "clut.parq", mmap_path=tmp_path / "clut.bin" if mmap else None) as shared:
+        np.testing.assert_array_equal(shared["spkids"], [11, 12, 13, 14])
+        np.testing.assert_array_equal(shared["pos"], pos)
+        assert shared.nbytes == pos.nbytes + shared["spkids"].nbytes
+        with ProcessPoolExecutor(2, initializer=_init, initargs=(shared,)) as pool:
+            res = list(pool.map(_task, range(4)))
+        np.testing.assert_allclose(res, pos.sum(axis=(1, 2)), rtol=1e-6)
+
+
+def test_share_catalog():
+    df = pd.DataFrame({"spkid": [20000001, 20000002], "H": [3.3, np.nan], "G": [0.15, 0.15],
+                       "desig": ["1", "2"], "n_obs": pd.array([10, None], dtype="Int64")})
+    with share_catalog(df) as shared:
+        assert list(shared) == ["spkid", "H", "G", "n_obs"]
+        assert shared["spkid"].dtype == np.int64
+        np.testing.assert_array_equal(shared["n_obs"], [10, np.nan])
+
+        # Attached views (e.g., unpickled in a worker) are zero-copy & read-only:
+        attached = SharedArrays(pickle.loads(pickle.dumps(shared)).spec)
+        shared["G"][0] = 0.25
+        assert attached["G"][0] == 0.25
+        with pytest.raises(ValueError):
+            attached["G"][0] = 0.0
+        attached.close()
+
+    with pytest.raises(TypeError):
+        share_catalog(df, columns=["desig"])
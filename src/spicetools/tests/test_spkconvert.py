@@ -0,0 +1,80 @@
+import base64
+import zipfile
+
+import pandas as pd
+import pytest
+
+from spicetools.kernelutil import DEFAULT_KERNELS
+from spicetools.spkconvert import convert_spk_texts, find_spk_texts
+
+BSP_3200 = DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp"
+
+
+@pytest.fixture
+def spktxts(tmp_path):
+    src = tmp_path / "_spktxts"
+    (src / "a").mkdir(parents=True)
+    (src / "c").mkdir()
+    text = "API VERSION: 1.2\nAPI SOURCE: NASA/JPL Horizons API\n\n" + base64.b64encode(
+        BSP_3200.read_bytes()).decode()
+    (src / "a" / "spk20003200.txt").write_text(text)
+    with zipfile.ZipFile(src / "c" / "spk1000001.zip", "w") as z:  # zipped by the old notebook
+        z.writestr("spk1000001.txt", text)
+    (src / "a" / "spk20000002.txt").write_text("No matches found.")
+    (src / "a" / "spk20000003.txt").write_text(text[:1001])  # truncated download
+    return src
+
+
+@pytest.mark.parametrize("fmt", ["tar", "zip"])
+def test_convert_spk_texts(tmp_path, spktxts, fmt):
+    assert find_spk_texts(spktxts) == ["a/spk20000002.txt", "a/spk20000003.txt",
+                                       "a/spk20003200.txt", "c/spk1000001.zip"]
+    report = convert_spk_texts(spktxts, tmp_path / "spkbsp", archive_dir=tmp_path / "archive",
+                               fmt=fmt, batch_size=2, full_check=True, delete=True, processes=2)
+    report = report.set_index("source")
+    assert report["ok"].to_dict() == {"a/spk20000002.txt": False, "a/spk20000003.txt": False,
+                                      "a/spk20003200.txt": True, "c/spk1000001.zip": True}
+    assert "REFGL1NQ" in report.loc["a/spk20000002.txt", "error"]
+    for out in ["a/spk20003200.bsp", "c/spk1000001.bsp"]:
+        assert (tmp_path / "spkbsp" / out).read_bytes() == BSP_3200.read_bytes()
+    assert not (tmp_path / "spkbsp" / "a" / "spk20000003.bsp").exists()
+
+    bad = pd.read_csv(tmp_path / "archive" / "_bad_files.csv")
+    assert bad["source"].tolist() == ["a/spk20000002.txt", "a/spk20000003.txt"]
+    index = pd.read_parquet(tmp_path / "archive" / "_index.parquet")
+    assert index["source"].tolist() == ["a/spk20003200.txt", "c/spk1000001.zip"]
+    assert set(index["shard"]) == {f"sources_00000.{fmt}"}
+    if fmt == "tar":  # direct access by the offset
+        row = index.iloc[0]
+        with open(tmp_path / "archive" / row["shard"], "rb") as f:
+            f.seek(row["offset"])
+            assert f.read(row["size"]).startswith(b"API VERSION")
+    # Archived sources are deleted, the bad ones are kept for re-download:
+    assert find_spk_texts(spktxts) == ["a/spk20000002.txt", "a/spk20000003.txt"]
+
+    # Repeated call (e.g., after re-downloading): only the new shard & index rows
+    b64 = base64.b64encode(BSP_3200.read_bytes()).decode()
+    (spktxts / "a" / "spk20000002.txt").write_text(b64)
+    report = convert_spk_texts(spktxts, tmp_path / "spkbsp", archive_dir=tmp_path / "archive",
+                               fmt=fmt, processes=1)
+    assert report["ok"].tolist() == [True, False]
+    index = pd.read_parquet(tmp_path / "archive" / "_index.parquet")
+    assert index["shard"].tolist() == [f"sources_00000.{fmt}"]*2 + [f"sources_00001.{fmt}"]
+
+
+def test_convert_spk_texts_repeated(tmp_path, spktxts):
+    # Without deleting the sources, a repeated call must not archive them again
+    kw = dict(archive_dir=tmp_path / "archive", processes=1)
+    for _ in range(3):
+        convert_spk_texts(spktxts, tmp_path / "spkbsp", **kw)
+    index = pd.read_parquet(tmp_path / "archive" / "_index.parquet")
+    assert index["source"].tolist() == ["a/spk20003200.txt", "c/spk1000001.zip"]
+    assert [p.name for p in (tmp_path / "archive").glob("sources_*")] == ["sources_00000.tar"]
+
+    # Only a fixed download is archived (in a new shard):
+    b64 = base64.b64encode(BSP_3200.read_bytes()).decode()
+    (spktxts / "a" / "spk20000002.txt").write_text(b64)
+    convert_spk_texts(spktxts, tmp_path / "spkbsp", **kw)
+    index = pd.read_parquet(tmp_path / "archive" / "_index.parquet")
+    assert index["source"].tolist() == ["a/spk20003200.txt", "c/spk1000001.zip", "a/spk20000002.txt"]
+    assert index["shard"].tolist() == ["sources_00000.tar"]*2 + ["sources_00001.tar"]
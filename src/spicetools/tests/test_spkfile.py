@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from spicetools.fastfunc import spkgps_batch
+from spicetools.spkfile import spk_segments, spkgps_file
+
+ETS = np.linspace(0, 20*86400, 11)
+
+
+@pytest.fixture(scope="module")
+def multi_bsp(tmp_path_factory, fake_earth_bsp):
+    """Three objects around the Sun (one in two segments) & one around 399 in J2000."""
+    path = tmp_path_factory.mktemp("multi") / "multi.bsp"
+    ets = np.arange(-86400, 25*86400, 3600.0)
+    handle = sp.spkopn(str(path), "MULTI", 0)
+    for k, (spkid, center, frame) in enumerate([(2000001, 10, "ECLIPJ2000"), (2000002, 10, "ECLIPJ2000"),
+                                                (3000001, 399, "J2000")]):
+        r = 3e8 if center == 10 else 4e5
+        states = np.array([[r*np.cos(1e-7*et + k), r*np.sin(1e-7*et + k), 1e3*k, 0, 0, 0]
+                           for et in ets])
+        if spkid == 2000002:  # two segments; the latter has priority for overlapping epochs
+            sp.spkw09(handle, spkid, center, frame, ets[0], 10*86400, "SEG", 7, len(ets), states, ets)
+            sp.spkw09(handle, spkid, center, frame, 5*86400, ets[-1], "SEG", 7, len(ets),
+                      states + 1.0, ets)
+        else:
+            sp.spkw09(handle, spkid, center, frame, ets[0], ets[-1], "SEG", 7, len(ets), states, ets)
+    sp.spkcls(handle)
+    sp.furnsh(fake_earth_bsp)
+    yield str(path)
+    sp.unload(fake_earth_bsp)
+
+
+def test_spk_segments(multi_bsp):
+    segs = spk_segments(multi_bsp)
+    assert segs["spkid"].tolist() == [2000001, 2000002, 2000002, 3000001]
+    assert segs["center"].tolist() == [10, 10, 10, 399]
+    assert segs["type"].tolist() == [9]*4
+
+
+@pytest.mark.parametrize("obs, ref", [(399, "ECLIPJ2000"), (10, "J2000")])
+def test_spkgps_file(multi_bsp, obs, ref):
+    spkids, pos = spkgps_file(multi_bsp, ETS, ref=ref, obs=obs)
+    np.testing.assert_array_equal(spkids, [2000001, 2000002, 3000001])
+    sp.furnsh(multi_bsp)
+    try:
+        ans = spkgps_batch(spkids, ETS, ref, obs)
+    finally:
+        sp.unload(multi_bsp)
+    np.testing.assert_allclose(pos, ans, rtol=1e-12, atol=1e-6)
+
+
+def test_spkgps_file_subset(multi_bsp):
+    ets = np.array([0.0, 30*86400])  # the latter is out of coverage
+    spkids, pos = spkgps_file(multi_bsp, ets, obs=10, spkids=[3000001, 9999])
+    np.testing.assert_array_equal(spkids, [3000001, 9999])
+    assert np.all(np.isfinite(pos[0, 0]))
+    assert np.all(np.isnan(pos[0, 1])) and np.all(np.isnan(pos[1]))
+
+
+def test_spkgps_file_out(multi_bsp):
+    out = np.empty((2, len(ETS), 3))
+    spkids, pos = spkgps_file(multi_bsp, ETS, obs=10, spkids=[2000001, 2000002], out=out)
+    assert pos is out and np.all(np.isfinite(out))
+    for bad in [np.empty((2, len(ETS), 3), dtype=np.float32), np.empty((3, len(ETS), 2)).transpose(2, 1, 0),
+                np.empty((1, len(ETS), 3))]:
+        with pytest.raises(ValueError):
+            spkgps_file(multi_bsp, ETS, obs=10, spkids=[2000001, 2000002], out=bad)
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+import spiceypy as sp
+
+from spicetools.constants import R2D
+from spicetools.kernelutil import make_meta
+from spicetools.observer import ObserverTrajectory
+from spicetools.trails import TRAIL_FIELDS, _groups, predict_trails, trail_dtype
+
+TARGET = 20003200
+
+
+@pytest.fixture(scope="module")
+def setup_mkfile(tmp_path_factory, fake_earth_bsp):
+    outmk = tmp_path_factory.mktemp("mk") / "test.mk"
+    make_meta(
+        "$KERNELS/lsk/naif0012.tls",
+        "$KERNELS/tests/spk3200_19991201-20010101_retrieved20240916.bsp",
+        fake_earth_bsp,
+        output=outmk
+    )
+    sp.furnsh(str(outmk))
+    yield str(outmk)
+    sp.unload(str(outmk))
+
+
+def _exposures():
+    start = np.array([1.0, 5.3, 20.1])*86400
+    return pd.DataFrame({"start": start, "exptime": [30.0, 3600.0, 0.0],
+                         "ra": [10.0, 20.0, 30.0], "dec": [0.0, 5.0, -5.0]})
+
+
+def _radec(pos):
+    _, ra, dec = sp.recrad(pos)
+    return ra*R2D, dec*R2D
+
+
+def test_trail_dtype():
+    assert trail_dtype().names == tuple(TRAIL_FIELDS)
+    assert trail_dtype(np.float32)["ra"] == np.float32
+    with pytest.raises(TypeError):
+        trail_dtype(np.int32)
+
+
+def test_predict_trails(setup_mkfile):
+    exposures = _exposures()
+    trails = predict_trails(exposures, [TARGET])
+    assert trails.dtype.names == tuple(TRAIL_FIELDS)
+    assert trails["exposure"].tolist() == [0, 1, 2]
+    assert trails["spkid"].tolist() == [TARGET]*3
+
+    for row, exp in zip(trails, exposures.itertuples()):
+        p0 = sp.spkpos(str(TARGET), exp.start, "J2000", "LT+S", "399")[0]
+        p1 = sp.spkpos(str(TARGET), exp.start + exp.exptime, "J2000", "LT+S", "399")[0]
+        np.testing.assert_allclose(row["length"], sp.vsep(p0, p1)*R2D*3600, rtol=1e-6, atol=1e-6)
+        ra, dec = _radec(sp.vhat(p0) + sp.vhat(p1))
+        np.testing.assert_allclose([row["ra"], row["dec"]], [ra, dec], atol=1e-8)
+        if exp.exptime > 0:
+            ra0, dec0 = _radec(p0)
+            ra1, dec1 = _radec(p1)
+            # Small-angle displacement & position angle
+            d_east, d_north = (ra1 - ra0)*np.cos(dec*np.pi/180), dec1 - dec0
+            np.testing.assert_allclose(row["pa"], np.degrees(np.arctan2(d_east, d_north)) % 360, atol=0.1)
+            np.testing.assert_allclose([row["dra_cosdec"], row["ddec"]],
+                                       np.array([d_east, d_north])*3600/exp.exptime, rtol=1e-3)
+            np.testing.assert_allclose(np.hypot(row["dra_cosdec"], row["ddec"])*exp.exptime,
+                                       row["length"], rtol=1e-3)
+        else:
+            assert row["length"] == 0
+            assert row["dra_cosdec"] == row["ddec"] == 0
+    assert trails["length"][1] > trails["length"][0] > 0
+
+
+def test_predict_trails_candidates(setup_mkfile):
+    exposures = _exposures()
+    full = predict_trails(exposures, [TARGET])
+    # One array per exposure (e.g., from screen_pointings), unknown objects are nan:
+    trails = predict_trails(exposures, [[TARGET], [], [TARGET, 99999999]])
+    assert trails["exposure"].tolist() == [0, 2, 2]
+    assert trails["spkid"].tolist() == [TARGET, TARGET, 99999999]
+    np.testing.assert_array_equal(trails[:2], full[[0, 2]])
+    assert np.isnan(trails["ra"][2])
+
+    # Precomputed observer trajectory & one candidate per batched call:
+    ets = np.concatenate([exposures["start"], exposures["start"] + exposures["exptime"]])
+    traj = ObserverTrajectory(399, ets, center="SUN", ref="J2000")
+    trails = predict_trails(exposures, [[TARGET], [], [99999999, TARGET]], observer=traj, max_states=1)
+    np.testing.assert_allclose(trails["ra"][[0, 2]], full["ra"][[0, 2]])
+    with pytest.raises(ValueError):
+        predict_trails(exposures.iloc[:2], [TARGET], observer=traj)
+    with pytest.raises(ValueError):
+        predict_trails(exposures, [[TARGET]])
+
+
+@pytest.mark.parametrize("max_states", [1, 50, 400, 10**6])
+def test_groups(max_states):
+    # 100 candidates each in 3 of 200 exposures (start & end epochs)
+    rng = np.random.default_rng(0)
+    n_exp = 200
+    inv = np.repeat(np.arange(100), 3)
+    iexp = rng.integers(0, n_exp, size=len(inv))
+    inv2, cols = np.concatenate([inv, inv]), np.concatenate([iexp, n_exp + iexp])
+    group = _groups(inv2, cols, 2*n_exp, max_states)
+    for g in np.unique(group):
+        in_group = group[inv2] == g
+        n_cand = np.count_nonzero(group == g)
+        assert n_cand == 1 or n_cand*len(np.unique(cols[in_group])) <= max_states
+    if max_states == 10**6:
+        assert np.all(group == 0)
@@ -1,8 +1,11 @@
+import ctypes
+
 import numpy as np
 import pytest
 import spiceypy as sp
 
-from spicetools.typeutil import empty_double_vector, str2char_p
+from spicetools.typeutil import (as_c_array, box_doubles, box_ints, empty_double_vector,
+                                intern_char_p, str2char_p)
 
 
 @pytest.mark.parametrize(
@@ -25,3 +28,29 @@ def test_empty_double_vector(n, ans):
     result = empty_double_vector(n)
 
     np.testing.assert_array_almost_equal(result, ans)
+
+
+def test_intern_char_p():
+    assert intern_char_p(20003200).value == b"20003200"
+    assert intern_char_p(np.int64(20003200)) is intern_char_p("20003200")
+
+
+def test_box():
+    boxed = box_doubles(np.arange(3.0))
+    assert all(isinstance(v, ctypes.c_double) for v in boxed)
+    assert [v.value for v in boxed] == [0.0, 1.0, 2.0]
+    assert [v.value for v in box_ints(np.array([[1], [20003200]]))] == [1, 20003200]
+
+
+def test_as_c_array():
+    values = np.arange(4.0)
+    arr = as_c_array(values)
+    assert isinstance(arr, ctypes.Array) and len(arr) == 4
+    arr[0] = 10
+    assert values[0] == 10  # shares memory
+
+    arr = as_c_array([1, 2], ctypes.c_int)
+    assert list(arr) == [1, 2]
+    ro = np.arange(3.0)
+    ro.flags.writeable = False
+    assert list(as_c_array(ro)) == [0.0, 1.0, 2.0]
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+import spiceypy as sp
+
+from spicetools.constants import AU2KM, D2R
+from spicetools.uncertainty import (_GM_SUN, condition_code_sigma, sky_uncertainty,
+                                    twobody_positions)
+
+ETS = np.arange(0, 30)*86400.0
+_OMEGA = 2*np.pi/(365.25*86400)
+OBS_POS = np.stack([AU2KM*np.cos(_OMEGA*ETS), AU2KM*np.sin(_OMEGA*ETS), 0*ETS], axis=1)
+
+
+def _elements(scale=1.0):
+    return pd.DataFrame({
+        "e": [0.89, 0.2, 1.3], "q": [0.14, 2.2, 1.1], "i": [22.0, 5.0, 10.0],
+        "om": [265.0, 80.0, 10.0], "w": [322.0, 150.0, 0.0], "tp": [2451600.0, 2451500.0, 2451550.0],
+        "sigma_e": np.array([1e-8, 1e-6, 1e-5])*scale, "sigma_q": np.array([1e-8, 1e-6, 1e-5])*scale,
+        "sigma_i": np.array([1e-6, 1e-4, 1e-4])*scale, "sigma_om": np.array([1e-6, 1e-4, 1e-4])*scale,
+        "sigma_w": np.array([1e-6, 1e-4, 1e-4])*scale, "sigma_tp": np.array([1e-6, 1e-3, 1e-3])*scale,
+        "condition_code": ["0", "5", "7"],
+    })
+
+
+@pytest.mark.parametrize("e, q", [(0.1, 1.2), (0.95, 0.5), (1.0, 1.0), (1.001, 0.3), (3.0, 1.0)])
+def test_twobody_positions(e, q):
+    ets = np.linspace(-5e8, 5e8, 41)
+    pos = twobody_positions(e, q, 20.0, 100.0, 30.0, 2451600.5, ets)[0]
+    desired = np.array([sp.conics([q*AU2KM, e, 20*D2R, 100*D2R, 30*D2R, 0, 55.5*86400, _GM_SUN], et)[:3]
+                        for et in ets])
+    np.testing.assert_allclose(pos, desired, rtol=0, atol=1e-11*np.abs(desired).max())
+
+
+def test_condition_code_sigma():
+    sigma = condition_code_sigma(["0", "5", "9", "", 8])
+    np.testing.assert_allclose(sigma, [1/3600, 1692/3600, 180, 180, 146502/3600])
+
+
+def test_sky_uncertainty():
+    lin = sky_uncertainty(_elements(), ETS, OBS_POS)
+    assert lin.shape == (3, len(ETS))
+    assert np.all((lin > 0) & (lin < 1))
+    # Well-constrained object << poorly-constrained ones
+    assert lin[0].max() < lin[1].min()
+    # Linear in the sigmas:
+    np.testing.assert_allclose(sky_uncertainty(_elements(10), ETS, OBS_POS), 10*lin, rtol=1e-3)
+    # Chunks do not matter:
+    np.testing.assert_allclose(sky_uncertainty(_elements(), ETS, OBS_POS, chunksize=1), lin)
+
+    mc = sky_uncertainty(_elements(), ETS, OBS_POS, method="mc", n_clones=200, seed=0)
+    np.testing.assert_allclose(mc, lin, rtol=0.3)
+
+    with pytest.raises(ValueError):
+        sky_uncertainty(_elements(), ETS, OBS_POS, method="foo")
+
+
+def test_sky_uncertainty_fallback():
+    df = _elements()
+    df.loc[1, "sigma_tp"] = np.nan
+    sigma = sky_uncertainty(df, ETS, OBS_POS)
+    np.testing.assert_allclose(sigma[1], 1692/3600)
+    sigma = sky_uncertainty(df.drop(columns="condition_code"), ETS, OBS_POS)
+    np.testing.assert_allclose(sigma[1], 180)
+    # Never more than 180 degrees:
+    assert sky_uncertainty(_elements(1e8), ETS, OBS_POS).max() <= 180
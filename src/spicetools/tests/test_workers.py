@@ -0,0 +1,51 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+import spiceypy as sp
+
+from spicetools.fastfunc import spkgps_batch
+from spicetools.kernelutil import DEFAULT_KERNELS
+from spicetools.workers import PRELOAD_ENV, check_pool, loaded_kernels, warm_pool
+
+BSP_3200 = str(DEFAULT_KERNELS / "tests" / "spk3200_19991201-20010101_retrieved20240916.bsp")
+LSK = str(DEFAULT_KERNELS / "lsk" / "naif0012.tls")
+ETS = np.arange(0, 20)*86400.0
+
+
+def _positions(i):
+    return spkgps_batch([20003200], ETS[i:i + 5], "ECLIPJ2000", 10)
+
+
+@pytest.mark.parametrize("method", ["fork", "forkserver"])
+def test_warm_pool(method):
+    before = loaded_kernels()
+    try:
+        with warm_pool([LSK, BSP_3200], processes=2, method=method) as pool:
+            assert PRELOAD_ENV not in os.environ
+            assert pool.processes == 2
+            health = check_pool(pool)
+            assert health["ok"].all()
+            assert (health["n_kernels"] >= 2).all()
+            results = list(pool.map(_positions, range(0, 20, 5)))
+            assert not check_pool(pool, kernels=["not_loaded.bsp"])["ok"].any()
+        if method == "fork":  # furnished in this process
+            assert {LSK, BSP_3200} <= set(loaded_kernels())
+        sp.furnsh(BSP_3200)
+        np.testing.assert_allclose(np.concatenate(results, axis=1),
+                                   spkgps_batch([20003200], ETS, "ECLIPJ2000", 10))
+    finally:
+        for kernel in (LSK, BSP_3200):
+            while loaded_kernels().count(kernel) > before.count(kernel):
+                sp.unload(kernel)
+
+    with pytest.raises(ValueError):
+        warm_pool(method="spawn")
+
+
+def test_check_pool_n_tasks():
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        with pytest.raises(ValueError):
+            check_pool(pool)
+        assert len(check_pool(pool, kernels=[], n_tasks=2)) == 1
@@ -1,10 +1,15 @@
-import ctypes
-
 import numpy as np
 import spiceypy as sp
 from astropy.time import Time
 
+from .instrument import INSTRUMENT
+from .typeutil import box_doubles
+
+
+__all__ = ['times2et']
+
 
+@INSTRUMENT.wrap("timeutil.times2et")
 def times2et(times, return_c=False, **kwargs):
     """ Convert time to ET (in SPICE format).
 
@@ -32,13 +37,7 @@ def times2et(times, return_c=False, **kwargs):
         Returned only if `return_c` is `True`.
     """
     times = Time(np.atleast_1d(times), **kwargs)
+    ets = [sp.str2et(_t) for _t in times.iso]
     if return_c:
-        ets = []
-        ets_c = []
-        for _t in times.iso:
-            _et = sp.str2et(_t)
-            _etc = ctypes.c_double(_et)
-            ets.append(_et)
-            ets_c.append(_etc)
-        return times, ets, ets_c
-    return times, [sp.str2et(_t) for _t in times.iso]
+        return times, ets, box_doubles(ets)
+    return times, ets
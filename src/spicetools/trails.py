@@ -0,0 +1,196 @@
+import numpy as np
+
+from .constants import D2R, R2D
+from .fastfunc import spkcvo_batch
+from .geometry import _angle
+from .instrument import INSTRUMENT
+from .observer import ObserverTrajectory
+
+
+__all__ = ["TRAIL_FIELDS", "trail_dtype", "predict_trails"]
+
+
+# Fields of the structured array returned by `predict_trails` (one row per
+# (exposure, candidate) pair):
+#   exposure        : row index of the exposure
+#   spkid           : SPKID of the candidate
+#   ra, dec         : midpoint of the trail (J2000) [deg]
+#   length          : trail length (start -> end) [arcsec]
+#   pa              : position angle of the motion (north through east) [deg]
+#   dra_cosdec, ddec: mean sky-plane angular rates [arcsec/s]
+#   sep             : separation of the midpoint from the pointing [deg]
+TRAIL_FIELDS = ["exposure", "spkid", "ra", "dec", "length", "pa", "dra_cosdec", "ddec", "sep"]
+
+
+def trail_dtype(dtype=np.float64):
+    """Return the structured dtype used by `predict_trails`.
+
+    Parameters
+    ----------
+    dtype : dtype-like, optional
+        Float type of the float fields (``np.float32`` or ``np.float64``).
+        Default is ``np.float64``.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind != "f":
+        raise TypeError(f"`dtype` must be a float type, got {dtype}")
+    return np.dtype([("exposure", np.int64), ("spkid", np.int64)]
+                    + [(f, dtype) for f in TRAIL_FIELDS[2:]])
+
+
+def _pairs(n_exp, candidates):
+    """(exposure index, spkid) of all pairs."""
+    if not len(candidates) or np.ndim(candidates[0]) == 0:  # the same candidates for all exposures
+        spkids = np.asarray(candidates, dtype=np.int64)
+        return np.repeat(np.arange(n_exp), len(spkids)), np.tile(spkids, n_exp)
+    if len(candidates) != n_exp:
+        raise ValueError(f"`candidates` ({len(candidates)}) must have one array per exposure ({n_exp}).")
+    lens = [len(c) for c in candidates]
+    spkids = np.concatenate([np.asarray(c, dtype=np.int64) for c in candidates]) if n_exp else []
+    return np.repeat(np.arange(n_exp), lens), np.asarray(spkids, dtype=np.int64)
+
+
+def _groups(inv, cols, n_cols, max_states):
+    """Group the candidates so that (candidates x union of their epochs) of
+    each group is at most `max_states` (or a single candidate).
+
+    Returns the group of each candidate. The candidates are ordered by their
+    first epoch, so that a group shares most of its epochs.
+    """
+    n_cand = inv.max() + 1
+    order = np.argsort(inv, kind="stable")
+    cand_cols = np.split(cols[order], np.cumsum(np.bincount(inv, minlength=n_cand))[:-1])
+    first = np.array([c.min() for c in cand_cols])
+    group = np.empty(n_cand, dtype=np.int64)
+    mask = np.zeros(n_cols, dtype=bool)
+    g, n_in, n_union = 0, 0, 0
+    for k in np.argsort(first, kind="stable"):
+        _cols = cand_cols[k]
+        n_new = n_union + np.count_nonzero(~mask[_cols])
+        if n_in and (n_in + 1)*n_new > max_states:
+            g, n_in, n_union = g + 1, 0, 0
+            mask[:] = False
+            n_new = np.count_nonzero(~mask[_cols])
+        mask[_cols] = True
+        group[k] = g
+        n_in, n_union = n_in + 1, n_new
+    return group
+
+
+def predict_trails(exposures, candidates, observer=399, center="SUN", abcorr="LT+S", dtype=np.float64,
+                   max_states=1_000_000):
+    """Predict the trails of the candidates in many exposures at once.
+
+    The positions of all (exposure, candidate) pairs at the start and end of
+    the exposures are computed in one batched pass: the observer states are
+    sampled once at all the epochs, and each candidate is evaluated only at
+    the epochs of the exposures it is a candidate of (``covered`` of
+    `~spicetools.fastfunc.spkcvo_batch`, called for groups of candidates
+    with only the epochs of each group). The midpoint is the great-circle
+    midpoint of the start and end directions.
+
+    Parameters
+    ----------
+    exposures : pd.DataFrame
+        The exposures with the columns ``"start"`` (ET of the shutter open),
+        ``"exptime"`` (sec), ``"ra"``, and ``"dec"`` (J2000 pointing, deg),
+        e.g., a nightly exposure list.
+
+    candidates : array-like of int, or list of array-like of int
+        SPKIDs of the candidates of all exposures, or one array per exposure
+        (e.g., the output of `~spicetools.plut.screen_pointings`).
+
+    observer : int, str, or ObserverTrajectory, optional
+        The observer (SPKID or name, sampled from the loaded kernels) or its
+        trajectory sampled at ``start`` and ``start + exptime`` of all
+        exposures (in this order, i.e., ``np.concatenate([start, end])``)
+        in the J2000 frame. Default is ``399`` (geocenter).
+
+    center : str, optional
+        Center of the observer states (see
+        `~spicetools.observer.ObserverTrajectory`). Default is ``"SUN"``.
+
+    abcorr : str, optional
+        Aberration correction (see `~spicetools.fastfunc.spkcvo`). Default
+        is ``"LT+S"``.
+
+    dtype : dtype-like, optional
+        Float type of the output fields (see `trail_dtype`).
+
+    max_states : int, optional
+        Maximum number of (candidate, epoch) states of each batched call
+        (48 bytes each), unless a single candidate needs more. Default is
+        1,000,000 (48 MB).
+
+    Returns
+    -------
+    trails : np.ndarray
+        Structured array with the fields in `TRAIL_FIELDS`, one row per
+        (exposure, candidate) pair, sorted by exposure. The float fields are
+        `np.nan` if the candidate could not be computed (e.g., no kernel).
+    """
+    start = np.asarray(exposures["start"], dtype=np.float64)
+    exptime = np.asarray(exposures["exptime"], dtype=np.float64)
+    n_exp = len(start)
+    ets = np.concatenate([start, start + exptime])
+    if isinstance(observer, ObserverTrajectory):
+        traj = observer
+        if len(traj) != len(ets) or not np.allclose(traj.ets, ets, rtol=0, atol=1e-6):
+            raise ValueError("`observer` must be sampled at the start and end epochs of the exposures.")
+    else:
+        traj = ObserverTrajectory(observer, ets, center=center, ref="J2000")
+
+    iexp, spkids = _pairs(n_exp, candidates)
+    out = np.empty(len(iexp), dtype=trail_dtype(dtype))
+    out["exposure"] = iexp
+    out["spkid"] = spkids
+    if not len(iexp):
+        return out
+
+    # Unit vectors at the start (u0) and end (u1) of each pair
+    u0, u1 = np.empty((len(iexp), 3)), np.empty((len(iexp), 3))
+    uniq, inv = np.unique(spkids, return_inverse=True)
+    group = _groups(np.concatenate([inv, inv]), np.concatenate([iexp, n_exp + iexp]), 2*n_exp, max_states)
+    pair_order = np.argsort(group[inv], kind="stable")
+    pair_groups = np.split(pair_order, np.cumsum(np.bincount(group[inv]))[:-1])
+    with INSTRUMENT.timer("trails.positions"):
+        for sel in pair_groups:
+            cands, cand_idx = np.unique(inv[sel], return_inverse=True)
+            cols, col_idx = np.unique(np.concatenate([iexp[sel], n_exp + iexp[sel]]), return_inverse=True)
+            i0, i1 = col_idx[:len(sel)], col_idx[len(sel):]
+            covered = np.zeros((len(cands), len(cols)), dtype=bool)
+            covered[cand_idx, i0] = True
+            covered[cand_idx, i1] = True
+            sta = spkcvo_batch(uniq[cands], ets[cols], traj.states[cols], outref="J2000",
+                               refloc="OBSERVER", abcorr=abcorr, obsctr=traj.center,
+                               obsref=traj.ref, covered=covered)
+            u0[sel] = sta[cand_idx, i0, :3]
+            u1[sel] = sta[cand_idx, i1, :3]
+    INSTRUMENT.count("trails.pairs", len(iexp))
+    u0 /= np.linalg.norm(u0, axis=1, keepdims=True)
+    u1 /= np.linalg.norm(u1, axis=1, keepdims=True)
+
+    mid = u0 + u1
+    mid /= np.linalg.norm(mid, axis=1, keepdims=True)
+    ra, dec = np.arctan2(mid[:, 1], mid[:, 0]), np.arcsin(np.clip(mid[:, 2], -1, 1))
+    # Displacement on the tangent plane at the midpoint (rad):
+    east = np.stack([-np.sin(ra), np.cos(ra), np.zeros_like(ra)], axis=1)
+    north = np.stack([-np.sin(dec)*np.cos(ra), -np.sin(dec)*np.sin(ra), np.cos(dec)], axis=1)
+    d = u1 - u0
+    d_east, d_north = np.sum(d*east, axis=1), np.sum(d*north, axis=1)
+    _exptime = exptime[iexp]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate_scale = np.where(_exptime > 0, R2D*3600/_exptime, 0.0)
+    pointing_ra = np.asarray(exposures["ra"], dtype=np.float64)[iexp]*D2R
+    pointing_dec = np.asarray(exposures["dec"], dtype=np.float64)[iexp]*D2R
+    pointing = np.stack([np.cos(pointing_dec)*np.cos(pointing_ra), np.cos(pointing_dec)*np.sin(pointing_ra),
+                         np.sin(pointing_dec)], axis=1)
+
+    out["ra"] = (ra*R2D) % 360
+    out["dec"] = dec*R2D
+    out["length"] = _angle(u0, u1)*(R2D*3600)
+    out["pa"] = np.arctan2(d_east, d_north)*R2D % 360
+    out["dra_cosdec"] = d_east*rate_scale
+    out["ddec"] = d_north*rate_scale
+    out["sep"] = _angle(mid, pointing)*R2D
+    return out
@@ -1,7 +1,11 @@
 import ctypes
+from functools import lru_cache
 
+import numpy as np
 
-__all__ = ['empty_double_vector', 'str2char_p']
+
+__all__ = ['empty_double_vector', 'str2char_p', 'intern_char_p', 'box_doubles', 'box_ints',
+           'as_c_array']
 
 
 def str2char_p(spkid):
@@ -51,3 +55,55 @@ def empty_double_vector(n):
     '''
     return (ctypes.c_double * n)()
 
+
+@lru_cache(maxsize=1 << 16)
+def _intern_char_p(name):
+    return ctypes.c_char_p(name.encode(encoding="UTF-8"))
+
+
+def intern_char_p(name):
+    '''Cached `str2char_p` for names used repeatedly (frames, targets, ...).
+
+    The same ``ctypes.c_char_p`` object is returned for the same ``str(name)``
+    (up to 65536 most recently used names), so it must not be modified.
+    '''
+    return _intern_char_p(str(name))
+
+
+def box_doubles(values):
+    '''List of ``ctypes.c_double`` from array-like (flattened).
+
+    Boxing all the values at once (e.g., ETs reused for all targets) is
+    faster than ``ctypes.c_double(et)`` in the loop, and passing the boxed
+    objects to ``sp.libspice`` functions is faster than passing floats.
+    '''
+    return list(map(ctypes.c_double, np.asarray(values, dtype=np.float64).ravel().tolist()))
+
+
+def box_ints(values):
+    '''List of ``ctypes.c_int`` from array-like (flattened), e.g., SPKIDs.'''
+    return list(map(ctypes.c_int, np.asarray(values, dtype=np.int64).ravel().tolist()))
+
+
+def as_c_array(values, ctype=ctypes.c_double):
+    '''Contiguous ctypes array of `ctype` from array-like without per-element cost.
+
+    Parameters
+    ----------
+    values : array-like
+        Values to convert (flattened).
+
+    ctype : ctypes type, optional
+        ``ctypes.c_double`` (default) or ``ctypes.c_int``, etc.
+
+    Returns
+    -------
+    arr : ctypes.Array
+        The ``ctype * N`` array. It shares the memory with `values` if it is
+        already a writable C-contiguous array of the matching dtype (otherwise
+        with a converted copy, which is kept alive by the ctypes array).
+    '''
+    arr = np.ascontiguousarray(values, dtype=np.dtype(ctype)).ravel()
+    if not arr.flags.writeable:
+        arr = arr.copy()
+    return (ctype * arr.size).from_buffer(arr)
@@ -0,0 +1,268 @@
+import numpy as np
+
+from .constants import AU2KM, D2R, R2D
+
+
+__all__ = ["ELEMENT_FIELDS", "SIGMA_FIELDS", "twobody_positions", "condition_code_sigma",
+           "sky_uncertainty"]
+
+
+# The (SBDB) cometary elements used for the uncertainty and their sigmas:
+#   e: eccentricity, q: perihelion distance [au], i, om, w: inclination,
+#   longitude of the ascending node, argument of perihelion [deg] (ecliptic
+#   J2000), tp: time of perihelion passage [JD TDB].
+ELEMENT_FIELDS = ["e", "q", "i", "om", "w", "tp"]
+SIGMA_FIELDS = [f"sigma_{f}" for f in ELEMENT_FIELDS]
+
+# GM of the Sun [km^3/s^2] (DE440). Only the two-body approximation is used,
+# which is enough for the *differences* between nearby orbits.
+_GM_SUN = 1.32712440041279419e11
+
+# Upper limits of the in-orbit longitude runoff [arcsec/decade] of the MPC
+# uncertainty parameter U (the SBDB ``condition_code``) of 0 to 8; U=9 is
+# anything larger.
+_U_RUNOFF = np.array([1.0, 4.4, 19.6, 86.5, 382, 1692, 7488, 33121, 146502])
+
+_MAX_ITER = 50
+
+
+def _kepler_ellipse(M, e):
+    # Starting value good also for e -> 1 (Danby 1987):
+    E = M + 0.85*e*np.sign(np.sin(M))
+    for _ in range(_MAX_ITER):
+        dE = (E - e*np.sin(E) - M)/(1 - e*np.cos(E))
+        E -= dE
+        if np.all(np.abs(dE) < 1e-14):
+            break
+    return E
+
+
+def _kepler_hyperbola(M, e):
+    H = np.arcsinh(M/e)
+    for _ in range(_MAX_ITER):
+        dH = (e*np.sinh(H) - H - M)/(e*np.cosh(H) - 1)
+        H -= np.clip(dH, -1, 1)  # Newton overshoots for large |M|
+        if np.all(np.abs(dH) < 1e-14):
+            break
+    return H
+
+
+def _perifocal(e, q, tp, ets):
+    """In-plane coordinates (km) of ``(N, N_et)`` (x toward the perihelion)."""
+    q = q*AU2KM
+    dt = ets - (tp - 2451545.0)*86400.0
+    shape = np.broadcast(e, dt).shape
+    e, q, dt = np.broadcast_to(e, shape), np.broadcast_to(q, shape), np.broadcast_to(dt, shape)
+    ell = e < 1 - 1e-10
+    if ell.all():  # the usual case: no copies by the masks
+        return _perifocal_ellipse(e, q, dt)
+    x, y = np.empty(shape), np.empty(shape)
+    if ell.any():
+        x[ell], y[ell] = _perifocal_ellipse(e[ell], q[ell], dt[ell])
+    hyp = e > 1 + 1e-10
+    if hyp.any():
+        _e, a = e[hyp], q[hyp]/(e[hyp] - 1)
+        H = _kepler_hyperbola(np.sqrt(_GM_SUN/a**3)*dt[hyp], _e)
+        x[hyp] = a*(_e - np.cosh(H))
+        y[hyp] = a*np.sqrt(_e**2 - 1)*np.sinh(H)
+    par = ~(ell | hyp)
+    if par.any():  # Barker's equation: D + D^3/3 = sqrt(GM/2q^3) dt, D = tan(nu/2)
+        _q = q[par]
+        B = 1.5*np.sqrt(_GM_SUN/(2*_q**3))*dt[par]
+        s = np.cbrt(B + np.sqrt(B**2 + 1))
+        D = s - 1/s
+        x[par] = _q*(1 - D**2)
+        y[par] = 2*_q*D
+    return x, y
+
+
+def _perifocal_ellipse(e, q, dt):
+    a = q/(1 - e)
+    M = np.remainder(np.sqrt(_GM_SUN/a**3)*dt + np.pi, 2*np.pi) - np.pi
+    E = _kepler_ellipse(M, e)
+    return a*(np.cos(E) - e), a*np.sqrt(1 - e**2)*np.sin(E)
+
+
+def _orient(i, om, w, x, y):
+    """Perifocal -> ecliptic: Rz(om) Rx(i) Rz(w) of ``(N, 1)`` angles (deg)."""
+    ci, si = np.cos(i*D2R), np.sin(i*D2R)
+    co, so = np.cos(om*D2R), np.sin(om*D2R)
+    cw, sw = np.cos(w*D2R), np.sin(w*D2R)
+    px, py, pz = co*cw - so*sw*ci, so*cw + co*sw*ci, sw*si
+    qx, qy, qz = -co*sw - so*cw*ci, -so*sw + co*cw*ci, cw*si
+    return np.stack([px*x + qx*y, py*x + qy*y, pz*x + qz*y], axis=-1)
+
+
+def twobody_positions(e, q, i, om, w, tp, ets):
+    """Heliocentric two-body positions from cometary elements (vectorized).
+
+    Parameters
+    ----------
+    e, q, i, om, w, tp : array-like of float
+        The elements (see `ELEMENT_FIELDS`; ``q`` in au, angles in degrees,
+        ``tp`` in JD TDB) of ``N`` orbits (elliptic, parabolic, or
+        hyperbolic).
+
+    ets : array-like of float
+        Epochs in ET.
+
+    Returns
+    -------
+    pos : np.ndarray
+        Positions (km) of shape ``(N, N_et, 3)`` in the frame of the elements
+        (ECLIPJ2000 for SBDB).
+    """
+    e, q, i, om, w, tp = (np.asarray(x, dtype=np.float64).reshape(-1, 1) for x in (e, q, i, om, w, tp))
+    ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))[None, :]
+    return _orient(i, om, w, *_perifocal(e, q, tp, ets))
+
+
+def condition_code_sigma(condition_codes):
+    """Approximate 1-sigma sky-plane uncertainty (deg) from condition codes.
+
+    The upper limit of the in-orbit longitude runoff per decade of the MPC
+    uncertainty parameter ``U`` (SBDB ``condition_code``) is used as a crude
+    substitute where the element sigmas are not available. ``U=9`` and
+    invalid codes give 180 degrees (anywhere on the sky).
+
+    Parameters
+    ----------
+    condition_codes : array-like of str or int
+        The condition codes (``"0"`` to ``"9"``).
+
+    Returns
+    -------
+    sigma : np.ndarray
+        The uncertainty in degrees.
+    """
+    codes = np.asarray(condition_codes).astype(str)
+    sigma = np.full(codes.shape, 180.0)
+    for u, runoff in enumerate(_U_RUNOFF):
+        sigma[codes == str(u)] = runoff/3600
+    return sigma
+
+
+def _chunk_positions(elems, ets, xy=None):
+    e, q, i, om, w, tp = (elems[:, k:k + 1] for k in range(6))
+    if xy is None:
+        xy = _perifocal(np.abs(e), np.abs(q), tp, ets)  # e >= 0, q > 0 for large sigmas
+    return _orient(i, om, w, *xy)
+
+
+def _sky_sigma_chunk(elems, sigmas, ets, obs_pos, method, n_clones, rng):
+    """1-sigma sky-plane uncertainty (rad) of ``(n, N_et)``."""
+    ets = ets[None, :]
+    xy = _perifocal(elems[:, :1], elems[:, 1:2], elems[:, 5:], ets)
+    nominal = _chunk_positions(elems, ets, xy)
+    los = nominal - obs_pos[None]
+    dist = np.linalg.norm(los, axis=-1)
+    u = los/dist[..., None]
+
+    def _perp_angle2(dpos):  # squared angle of the sky-plane component
+        dperp = dpos - np.sum(dpos*u, axis=-1, keepdims=True)*u
+        return np.sum(dperp**2, axis=-1)/dist**2
+
+    var = np.zeros(dist.shape)
+    if method == "linear":
+        # Central differences of +-1 sigma (secant partials times sigma), each
+        # element independently (SBDB gives no correlations). The angles (i,
+        # om, w) do not change the in-plane motion, so Kepler's equation is
+        # solved again only for e, q, and tp.
+        for k in range(len(ELEMENT_FIELDS)):
+            step = np.zeros_like(elems)
+            step[:, k] = sigmas[:, k]
+            _xy = xy if ELEMENT_FIELDS[k] in ("i", "om", "w") else None
+            dpos = _chunk_positions(elems + step, ets, _xy) - _chunk_positions(elems - step, ets, _xy)
+            var += _perp_angle2(0.5*dpos)
+    else:
+        for _ in range(n_clones):
+            clone = elems + rng.standard_normal(elems.shape)*sigmas
+            var += _perp_angle2(_chunk_positions(clone, ets) - nominal)
+        var /= n_clones
+    return np.sqrt(var)
+
+
+def sky_uncertainty(elements, ets, obs_pos, method="linear", n_clones=32, seed=None, chunksize=100_000):
+    """Approximate 1-sigma sky-plane positional uncertainty of each object.
+
+    The element sigmas are mapped to the position uncertainty perpendicular
+    to the line of sight from the observer, by the two-body partials
+    (``"linear"``) or by Monte Carlo clones (``"mc"``). The result is the
+    root-sum-square of the sky-plane deviations, i.e., at least the
+    semi-major axis of the 1-sigma uncertainty ellipse, so that
+    ``nsigma*sigma`` can be used as a per-object search margin (e.g.,
+    ``obj_margin`` of `~spicetools.plut.screen_pointings`).
+
+    Parameters
+    ----------
+    elements : pd.DataFrame
+        The SBDB elements (`ELEMENT_FIELDS`) and sigmas (`SIGMA_FIELDS`) of
+        ``N`` objects. The objects without all sigmas use
+        `condition_code_sigma` of ``"condition_code"`` (if the column exists;
+        otherwise 180 degrees).
+
+    ets : array-like of float
+        Epochs in ET.
+
+    obs_pos : array-like of float
+        The ``(N_et, 3)`` or ``(3,)`` heliocentric positions (km) of the
+        observer in the frame of the elements (ECLIPJ2000), e.g., from
+        ``spkgps_batch([399], ets, "ECLIPJ2000", 10)[0]``.
+
+    method : {"linear", "mc"}, optional
+        ``"linear"`` (default): the partials are the central differences
+        over +-1 sigma of each element. ``"mc"``: the RMS deviation of
+        `n_clones` clones sampled from the (independent) normal
+        distributions, which captures the nonlinearity (e.g., the along-track
+        stretching of poorly constrained orbits) at a higher cost.
+
+    n_clones : int, optional
+        Number of clones per object for ``"mc"``.
+
+    seed : int, optional
+        Seed of the random number generator for ``"mc"``.
+
+    chunksize : int, optional
+        Maximum number of objects processed at once, to limit the size of
+        the temporary arrays. Default is 100,000.
+
+    Returns
+    -------
+    sigma : np.ndarray
+        The ``(N, N_et)`` uncertainty in degrees (at most 180).
+
+    Notes
+    -----
+    SBDB gives the sigmas but not the covariance, so the elements are
+    treated as independent. The strong correlations (e.g., between ``tp``
+    and ``q``) usually reduce the true uncertainty, so the result is an
+    overestimate rather than an underestimate for well-observed objects.
+    The nominal orbits are only used for the line of sight and the
+    partials; the positions themselves should come from the ephemerides.
+    """
+    if method not in ("linear", "mc"):
+        raise ValueError(f"`method` must be 'linear' or 'mc', not {method!r}.")
+    if chunksize < 1:
+        raise ValueError("`chunksize` must be positive.")
+    ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+    obs_pos = np.broadcast_to(np.asarray(obs_pos, dtype=np.float64), (len(ets), 3))
+    elems = elements[ELEMENT_FIELDS].to_numpy(dtype=np.float64)
+    sigmas = elements[SIGMA_FIELDS].to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(seed)
+
+    n = len(elems)
+    sigma = np.empty((n, len(ets)))
+    known = np.isfinite(sigmas).all(axis=1) & np.isfinite(elems).all(axis=1)
+    if "condition_code" in elements:
+        fallback = condition_code_sigma(elements["condition_code"].to_numpy())
+    else:
+        fallback = np.full(n, 180.0)
+    sigma[~known] = fallback[~known, None]
+
+    idx = np.flatnonzero(known)
+    with np.errstate(invalid="ignore", over="ignore"):  # nan (-> 180 deg) for the hopeless orbits
+        for i in range(0, len(idx), chunksize):
+            rows = idx[i:i + chunksize]
+            sigma[rows] = _sky_sigma_chunk(elems[rows], sigmas[rows], ets, obs_pos, method, n_clones,
+                                           rng)*R2D
+    return np.where(np.isnan(sigma), 180.0, np.minimum(sigma, 180.0))
@@ -0,0 +1,184 @@
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import spiceypy as sp
+
+
+__all__ = ["loaded_kernels", "warm_pool", "check_pool"]
+
+
+# Kernel types (of ``kdata``) of the binary (DAF/DAS) kernels, which are read
+# from the files on demand (text kernels are fully in the kernel pool):
+_BINARY_KINDS = "SPK CK PCK DSK EK"
+
+# Kernels furnished by the forkserver process (see ``_forkserver_preload.py``):
+PRELOAD_ENV = "SPICETOOLS_PRELOAD_KERNELS"
+
+
+def loaded_kernels(kind="ALL"):
+    """Paths of the loaded kernels (in the load order).
+
+    Parameters
+    ----------
+    kind : str, optional
+        Kernel types as in ``kdata`` (e.g., ``"SPK"``, ``"TEXT"``,
+        ``"META"``, or space-separated ones). Default is ``"ALL"``.
+
+    Returns
+    -------
+    files : list of str
+        Paths of the kernels as they were furnished (the kernels listed in a
+        meta-kernel are included, as well as the meta-kernel itself).
+    """
+    return [sp.kdata(i, kind)[0] for i in range(sp.ktotal(kind))]
+
+
+def _reopen_binary_kernels():
+    """Reload the binary kernels inherited by a forked process.
+
+    The file descriptors (and thus the file offsets) of the DAF files opened
+    before the fork are shared with the parent and the other workers, so
+    concurrent reads would interfere. Unloading and furnishing them again (in
+    the same order, i.e., the same precedence) is cheap: only the file record
+    is read. The text kernels are kept in the inherited kernel pool.
+    """
+    files = loaded_kernels(_BINARY_KINDS)
+    for fpath in files:
+        sp.unload(fpath)
+    for fpath in files:
+        sp.furnsh(fpath)
+
+
+def _init_warm_worker(kernels, initializer, initargs):
+    loaded = set(loaded_kernels())
+    _reopen_binary_kernels()
+    for kernel in kernels:  # e.g., the forkserver was started with other kernels
+        if kernel not in loaded:
+            sp.furnsh(kernel)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def warm_pool(kernels=(), processes=None, method="fork", initializer=None, initargs=()):
+    """Process pool whose workers start with the kernels already furnished.
+
+    The kernels are furnished only once, in this process (``"fork"``) or the
+    forkserver process (``"forkserver"``), and the workers inherit the
+    parsed kernel pool (copy-on-write) instead of furnishing the kernels
+    again, so that starting many workers is (almost) instantaneous.
+
+    Parameters
+    ----------
+    kernels : list of str, path-like, optional
+        Kernels (or meta-kernels) common to all the workers (e.g., LSK, PCK,
+        DE). Those not loaded yet in this process are furnished here (for
+        ``"fork"``).
+
+    processes : int, optional
+        Number of worker processes. Default is `None` (number of CPUs).
+
+    method : {"fork", "forkserver"}, optional
+        The start method. With ``"fork"`` (default), the workers are forked
+        from this process. With ``"forkserver"``, the forkserver process
+        imports spicetools and furnishes `kernels` once (only if the
+        forkserver is not running yet, i.e., the first forkserver pool of
+        this process), and the workers are forked from it, which is safer if
+        this process has threads.
+
+    initializer : callable, optional
+        Additional initializer of each worker (called with `initargs`).
+
+    initargs : tuple, optional
+        Arguments of `initializer`.
+
+    Returns
+    -------
+    pool : ProcessPoolExecutor
+        The pool. ``pool.kernels`` is the list of `kernels` and
+        ``pool.processes`` is the number of workers (see `check_pool`).
+
+    Notes
+    -----
+    CSPICE is not thread-safe; use the pool from one thread only. In each
+    worker, the binary kernels (SPK, CK, ...) are reloaded since the
+    inherited file descriptors are shared between the processes.
+    """
+    kernels = [str(k) for k in kernels]
+    if method == "fork":
+        loaded = set(loaded_kernels())
+        for kernel in kernels:
+            if kernel not in loaded:
+                sp.furnsh(kernel)
+    elif method == "forkserver":
+        from multiprocessing import forkserver
+
+        # The forkserver inherits the environment when it starts, so start it
+        # now and keep the variable out of this process:
+        previous = os.environ.get(PRELOAD_ENV)
+        os.environ[PRELOAD_ENV] = os.pathsep.join(kernels)
+        try:
+            mp.set_forkserver_preload(["spicetools._forkserver_preload"])
+            forkserver.ensure_running()
+        finally:
+            if previous is None:
+                del os.environ[PRELOAD_ENV]
+            else:
+                os.environ[PRELOAD_ENV] = previous
+    else:
+        raise ValueError(f"`method` must be 'fork' or 'forkserver', not {method!r}.")
+    if processes is None:
+        processes = os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=processes, mp_context=mp.get_context(method),
+                               initializer=_init_warm_worker,
+                               initargs=(kernels, initializer, initargs))
+    pool.kernels = kernels
+    pool.processes = processes
+    return pool
+
+
+def _kernel_report(delay):
+    time.sleep(delay)  # so that the tasks are spread over the workers
+    return os.getpid(), loaded_kernels()
+
+
+def check_pool(pool, kernels=None, n_tasks=None, delay=0.05):
+    """Check the kernels loaded in the workers of a pool.
+
+    Parameters
+    ----------
+    pool : ProcessPoolExecutor
+        The pool (e.g., from `warm_pool`).
+
+    kernels : list of str, path-like, optional
+        Kernels that must be loaded in every worker. Default is
+        ``pool.kernels`` (set by `warm_pool`).
+
+    n_tasks : int, optional
+        Number of check tasks. The tasks are distributed by the pool, so a
+        worker is checked only if it gets any of them. Default is 4 times
+        ``pool.processes`` (set by `warm_pool`); required for other pools.
+
+    delay : float, optional
+        Duration (sec) of each check task, to spread them over the workers.
+
+    Returns
+    -------
+    health : pd.DataFrame
+        One row per checked worker with the columns ``"pid"``,
+        ``"n_kernels"`` (number of loaded files), ``"missing"`` (list of
+        `kernels` not loaded), and ``"ok"``.
+    """
+    kernels = [str(k) for k in (getattr(pool, "kernels", []) if kernels is None else kernels)]
+    if n_tasks is None:
+        if not hasattr(pool, "processes"):
+            raise ValueError("`n_tasks` is required for a pool not created by `warm_pool`.")
+        n_tasks = 4*pool.processes
+    reports = dict(pool.map(_kernel_report, [delay]*n_tasks))
+    rows = []
+    for pid, files in sorted(reports.items()):
+        missing = [k for k in kernels if k not in files]
+        rows.append((pid, len(files), missing, not missing))
+    return pd.DataFrame(rows, columns=["pid", "n_kernels", "missing", "ok"])